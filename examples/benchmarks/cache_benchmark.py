@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Encode time per frame of looping animations with and without the cache of encoded frames, the
+cached transitions are replayed and the encoder only takes the frame as displayed (sync)
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from termgfx import RGB_BLACK
+from termgfx.encoder import FrameEncoder
+from termgfx.fingerprint import line_hashes, frame_fingerprint, changed_lines
+from termgfx.framecache import EncodedFrameCache
+from game_frames import game1_room, game2_terrain
+
+COLUMNS, LINES = 160, 50
+FRAMES = 240
+
+def idle_sprite(frames: int):
+    """A 12x16 character bobbing over the game2 terrain in a 6 state loop"""
+    background = game2_terrain(COLUMNS, LINES * 2)
+    for i in range(frames):
+        frame = background.copy()
+        y = 40 + (0, 1, 2, 3, 2, 1)[i % 6] * 2
+        frame[y:y + 16, 70:82] = (220, 60, 60)
+        frame[y + 3:y + 5, 73:79] = (255, 255, 255)
+        yield frame
+
+def blinking_room(frames: int):
+    """The game1 room with a flickering flashlight, two states"""
+    states = (game1_room(COLUMNS, LINES * 2, 0), game1_room(COLUMNS, LINES * 2, 1))
+    for i in range(frames):
+        yield states[(i // 3) % 2].copy()
+
+def run(scene, cache: EncodedFrameCache = None) -> float:
+    encoder = FrameEncoder(RGB_BLACK, optimizeGlyphs=True)
+    previousHashes = displayed = None
+    elapsed = 0.0
+    for frame in scene(FRAMES):
+        start = time.perf_counter()
+        hashes = line_hashes(frame)
+        fingerprint = frame_fingerprint(frame, hashes)
+        lines = changed_lines(previousHashes, hashes)
+        cached = cache.get((displayed, fingerprint)) if cache is not None and displayed is not None else None
+        if cached is not None:
+            encoder.sync(frame, lines=lines)
+        else:
+            output = encoder.encode(frame, lines=lines)
+            if cache is not None and displayed is not None:
+                cache.put((displayed, fingerprint), output)
+        previousHashes, displayed = hashes, fingerprint
+        elapsed += time.perf_counter() - start
+    return elapsed / FRAMES * 1000
+
+if __name__ == "__main__":
+    print(f"{COLUMNS}x{LINES}, {FRAMES} frames")
+    print(f"{'scene':>14} {'ms/frame':>9} {'cached ms':>10} {'hit rate':>9} {'cache bytes':>12}")
+    for name, scene in (("idle sprite", idle_sprite), ("blinking room", blinking_room)):
+        cache = EncodedFrameCache()
+        plain, cachedTime = run(scene), run(scene, cache)
+        print(f"{name:>14} {plain:>9.3f} {cachedTime:>10.3f} {cache.hitRate:>9.1%} {cache.stats['bytes']:>12}")
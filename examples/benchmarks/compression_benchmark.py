@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Bytes per full frame with the run compression, with and without the REP sequence
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from termgfx import RGB_BLACK
+from termgfx.encoder import FrameEncoder
+
+COLUMNS, LINES = 200, 60
+
+def flat_background(width: int, height: int) -> np.ndarray:
+    """Like termgfx/examples/basic_demo.py: a flat fill with a small square and a line"""
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:, :] = (50, 50, 100)
+    frame[5:15, 5:15] = (255, 0, 0)
+    frame[20, 10:30] = (0, 255, 0)
+    return frame
+
+def sky_and_water(width: int, height: int) -> np.ndarray:
+    """Sky over an island in the sea, like the terrain of examples/game2"""
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:height // 3] = (120, 180, 250)
+    frame[height // 3:] = (40, 90, 200)
+    frame[height // 2:height // 2 + 9, width // 3:width // 2] = (210, 180, 140)
+    return frame
+
+if __name__ == "__main__":
+    print(f"{COLUMNS}x{LINES}")
+    print(f"{'scene':>14} {'spaces bytes':>13} {'saved':>8} {'+REP bytes':>11} {'saved':>8}")
+    for name, scene in (("flat fill", flat_background), ("sky and water", sky_and_water)):
+        frame = scene(COLUMNS, LINES * 2)
+        results = []
+        for repeat in (False, True):
+            encoder = FrameEncoder(RGB_BLACK, repeat=repeat)
+            output = encoder.encode(frame)
+            results.append((len(output), encoder.bytesSaved))
+        print(f"{name:>14} {results[0][0]:>13} {results[0][1]:>8} {results[1][0]:>11} {results[1][1]:>8}")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Bytes written per frame with and without damage tracking for a HUD over a still map
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from termgfx import RGB_BLACK
+from termgfx.encoder import FrameEncoder, encode_frame
+
+COLUMNS, LINES = 200, 60
+FRAMES = 60
+
+def make_map(width: int, height: int) -> np.ndarray:
+    """A still tile map of 4x4 pixel tiles"""
+    rng = np.random.default_rng(0)
+    palette = np.array([(60, 140, 50), (40, 90, 200), (200, 190, 120), (120, 120, 120)], dtype=np.uint8)
+    tiles = rng.integers(0, len(palette), (height // 4 + 1, width // 4 + 1))
+    return palette[tiles.repeat(4, 0).repeat(4, 1)[:height, :width]]
+
+def draw_hud(frame: np.ndarray, tick: int):
+    """A small counter bar in the top left corner"""
+    frame[0:4, 0:24] = (20, 20, 20)
+    frame[1:3, 1:1 + tick % 22] = (250, 200, 40)
+
+if __name__ == "__main__":
+    background = make_map(COLUMNS, LINES * 2)
+    encoder = FrameEncoder(RGB_BLACK)
+    encoder.encode(background)  # the first frame is always a full repaint
+    fullBytes = damageBytes = 0
+    for tick in range(FRAMES):
+        frame = background.copy()
+        draw_hud(frame, tick)
+        fullBytes += len(encode_frame(frame, RGB_BLACK))
+        damageBytes += len(encoder.encode(frame))
+
+    print(f"{COLUMNS}x{LINES}, {FRAMES} frames")
+    print(f"full repaint:    {fullBytes / FRAMES:>10.0f} bytes/frame")
+    print(f"damage tracking: {damageBytes / FRAMES:>10.0f} bytes/frame")
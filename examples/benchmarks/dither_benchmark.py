@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Per-frame cost of the dithering options of the palette color modes, against the bytes they
+produce and how far the colors seen from a distance (4x4 pixel averages) are from the source
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from termgfx import RGB_BLACK
+from termgfx.encoder import FrameEncoder
+from termgfx.palette import quantize, palette_colors, palette_lut
+from sgr_benchmark import gradient, shaded_sphere
+
+COLUMNS, LINES = 200, 60
+REPEATS = 20
+
+def box_error(frame: np.ndarray, shown: np.ndarray, size: int = 4) -> float:
+    """Mean absolute difference of the size x size pixel averages, a rough measure of visible banding"""
+    height, width = (frame.shape[0] // size) * size, (frame.shape[1] // size) * size
+    def blocks(pixels):
+        pixels = pixels[:height, :width].astype(np.float32)
+        return pixels.reshape(height // size, size, width // size, size, 3).mean(axis=(1, 3))
+    return float(np.abs(blocks(frame) - blocks(shown)).mean())
+
+def quantize_time(frame: np.ndarray, mode: str, dither: str) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        quantize(frame, mode, dither=dither)
+    return (time.perf_counter() - start) / REPEATS
+
+if __name__ == "__main__":
+    palette_lut("256")
+    palette_lut("16")
+    print(f"{COLUMNS}x{LINES}")
+    print(f"{'scene':>14} {'mode':>5} {'dither':>10} {'ms/frame':>9} {'bytes':>8} {'box error':>10}")
+    for name, scene in (("gradient", gradient), ("shaded sphere", shaded_sphere)):
+        frame = scene(COLUMNS, LINES * 2)
+        for mode in ("256", "16"):
+            for dither in ("none", "bayer", "diffusion"):
+                shown = palette_colors(mode)[quantize(frame, mode, dither=dither)]
+                size = len(FrameEncoder(RGB_BLACK, colorMode=mode, dither=dither).encode(frame))
+                print(f"{name:>14} {mode:>5} {dither:>10} {quantize_time(frame, mode, dither) * 1000:>9.2f} "
+                      f"{size:>8} {box_error(frame, shown):>10.2f}")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Compare the vectorized frame encoder against the per-cell Color loop it replaced
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from termgfx import Color, RGB_BLACK
+from termgfx.encoder import encode_frame
+
+# terminal sizes in cells (columns, lines)
+SIZES = [(80, 24), (200, 60), (400, 120)]
+REPEATS = 20
+
+def legacy_encode(pixel_data, bg: Color) -> bytes:
+    """The per-cell loop used by the display threads before the vectorized encoder"""
+    height = len(pixel_data)
+    width = len(pixel_data[0])
+    lines = []
+    for y in range(0, height, 2):
+        line_parts = []
+        prev_colors = None
+        for x in range(width):
+            top_color = pixel_data[y][x]
+            bottom_color = pixel_data[y + 1][x] if y + 1 < height else bg
+            if prev_colors is None or prev_colors[0] != top_color:
+                line_parts.append(f"\033[38;2;{top_color.r};{top_color.g};{top_color.b}m")
+            if prev_colors is None or prev_colors[1] != bottom_color:
+                line_parts.append(f"\033[48;2;{bottom_color.r};{bottom_color.g};{bottom_color.b}m")
+            line_parts.append("\u2580")
+            prev_colors = (top_color, bottom_color)
+        lines.append(f"\033[{(y // 2) + 1};1H" + "".join(line_parts) + "\033[0m")
+    return "".join(lines).encode("utf-8")
+
+def make_scene(width: int, height: int) -> np.ndarray:
+    """A sky gradient over flat ground with a few solid blocks"""
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    horizon = height // 2
+    shade = np.linspace(80, 230, horizon, dtype=np.uint8)
+    frame[:horizon, :, 0] = 40
+    frame[:horizon, :, 1] = shade[:, None] // 2
+    frame[:horizon, :, 2] = shade[:, None]
+    frame[horizon:] = (60, 140, 50)
+    for i in range(8):
+        x = (i * width) // 8
+        frame[horizon - 6:horizon, x:x + 4] = (120, 90, 60)
+    return frame
+
+def time_call(func, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func(*args)
+    return (time.perf_counter() - start) / REPEATS
+
+if __name__ == "__main__":
+    print(f"{'size':>10} {'legacy ms':>10} {'numpy ms':>10} {'speedup':>8}")
+    for columns, lines in SIZES:
+        frame = make_scene(columns, lines * 2)
+        colors = [[Color("RGB", list(px)) for px in row] for row in frame.tolist()]
+
+        legacy = time_call(legacy_encode, colors, RGB_BLACK)
+        vectorized = time_call(encode_frame, frame, RGB_BLACK)
+        print(f"{columns:>5}x{lines:<4} {legacy * 1000:>10.2f} {vectorized * 1000:>10.2f} {legacy / vectorized:>7.1f}x")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Time per frame of comparing whole frames against skipping the unchanged lines found by the line
+hashes, for a static game screen with a small animated spinner and for frames that don't change
+at all (which the renderer skips from the fingerprint alone)
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from termgfx import RGB_BLACK
+from termgfx.encoder import FrameEncoder
+from termgfx.fingerprint import line_hashes, frame_fingerprint, changed_lines
+from game_frames import game2_terrain
+
+COLUMNS, LINES = 160, 50
+FRAMES = 100
+
+def spinner(frames: int):
+    """The game2 terrain with a 6x6 spinner turning in a corner"""
+    background = game2_terrain(COLUMNS, LINES * 2)
+    for i in range(frames):
+        frame = background.copy()
+        frame[4:10, 4:10] = 40
+        y, x = ((0, 0), (0, 4), (4, 4), (4, 0))[i % 4]
+        frame[4 + y:6 + y, 4 + x:6 + x] = (250, 220, 60)
+        yield frame
+
+def still(frames: int):
+    """The same game2 terrain frame over and over"""
+    background = game2_terrain(COLUMNS, LINES * 2)
+    for _ in range(frames):
+        yield background.copy()
+
+def per_frame_ms(scene, useLines: bool) -> float:
+    encoder = FrameEncoder(RGB_BLACK, optimizeGlyphs=True)
+    previous = None
+    elapsed = 0.0
+    for frame in scene(FRAMES):
+        start = time.perf_counter()
+        hashes = line_hashes(frame)
+        encoder.encode(frame, lines=changed_lines(previous, hashes) if useLines else None)
+        previous = hashes
+        elapsed += time.perf_counter() - start
+    return elapsed / FRAMES * 1000
+
+def fingerprint_ms(scene) -> float:
+    start = time.perf_counter()
+    for frame in scene(FRAMES):
+        frame_fingerprint(frame)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+if __name__ == "__main__":
+    print(f"{COLUMNS}x{LINES}, ms per frame")
+    print(f"{'scene':>8} {'whole frame':>12} {'changed lines':>14} {'fingerprint':>12}")
+    for name, scene in (("spinner", spinner), ("still", still)):
+        print(f"{name:>8} {per_frame_ms(scene, False):>12.3f} {per_frame_ms(scene, True):>14.3f} {fingerprint_ms(scene):>12.3f}")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Frames rebuilt from the example games with array operations, for the benchmarks: the lit room
+of examples/game1 and the terrain view of examples/game2 (whose own tick needs keyboard, noise
+and lmdb)
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+
+ROOMS = os.path.join(os.path.dirname(__file__), '..', 'game1', 'rooms')
+
+def game1_room(width: int, height: int, frame: int = 0, room: str = "0_0") -> np.ndarray:
+    """The walls of a game1 room on its (1, 1, 1) background, lit by the player's flashlight cone"""
+    data = json.load(open(os.path.join(ROOMS, f"{room}.json")))
+    pixels = np.full((height, width, 3), 1, dtype=np.float32)
+    for wall in (o for o in data["objects"] if o["type"] == "wall"):
+        (ax, ay), (bx, by) = wall["A"], wall["B"]
+        pixels[min(ay, by):max(ay, by) + 1, min(ax, bx):max(ax, bx) + 1] = wall["color"]
+
+    # the flashlight of tick(): a 50 degree cone of radius 13 turning with the player
+    px, py = data["init"]["playerPos"]
+    px += frame % 20
+    angle = math.radians(40 + 10 * frame)
+    y, x = np.mgrid[0:height, 0:width]
+    dx, dy = x - px, y - py
+    distance = np.sqrt(dx ** 2 + dy ** 2)
+    direction = (np.degrees(np.arctan2(dy, dx) - angle) + 180) % 360 - 180
+    intensity = np.clip(1 - distance / 13, 0, 1) * (np.abs(direction) <= 25)
+    pixels = pixels * (1 - intensity[..., None]) + np.array([255, 255, 210]) * intensity[..., None]
+    return pixels.astype(np.uint8)
+
+def _smooth_noise(width: int, height: int, offset: int, seed: int = 0) -> np.ndarray:
+    """Octaves of bilinearly interpolated value noise in 0..1, standing in for noise.pnoise2"""
+    rng = np.random.default_rng(seed)
+    total = np.zeros((height, width))
+    amplitude, scale, norm = 1.0, 48.0, 0.0
+    for _ in range(5):
+        grid = rng.random((int((height + offset) / scale) + 2, int((width + offset) / scale) + 2))
+        y, x = np.mgrid[0:height, 0:width]
+        fy, fx = (y + offset) / scale, (x + offset) / scale
+        iy, ix = fy.astype(int), fx.astype(int)
+        ty, tx = fy - iy, fx - ix
+        top = grid[iy, ix] * (1 - tx) + grid[iy, ix + 1] * tx
+        bottom = grid[iy + 1, ix] * (1 - tx) + grid[iy + 1, ix + 1] * tx
+        total += (top * (1 - ty) + bottom * ty) * amplitude
+        norm += amplitude
+        amplitude *= 0.5
+        scale /= 2
+    return total / norm
+
+def game2_terrain(width: int, height: int, frame: int = 0) -> np.ndarray:
+    """The biome colors of height_to_rgb, the player marker and the inventory bar of game2"""
+    h = _smooth_noise(width, height, frame)
+    # (upper height, start color, end color) of water, sand, grass, rock, snow and snow tops
+    biomes = [(0.4, (10, 20, 100), (70, 140, 220)), (0.45, (180, 160, 100), (220, 200, 140)),
+              (0.7, (40, 100, 30), (120, 200, 80)), (0.85, (100, 90, 80), (120, 110, 90)),
+              (0.93, (140, 140, 140), (200, 200, 255)), (1.0, (220, 220, 230), (255, 255, 255))]
+    pixels = np.zeros((height, width, 3), dtype=np.float32)
+    lower = 0.0
+    for upper, start, end in biomes:
+        mask = (h >= lower) & (h < upper) if upper < 1.0 else h >= lower
+        t = ((h - lower) / (upper - lower))[..., None]
+        pixels[mask] = (np.array(start) + t * (np.array(end) - np.array(start)))[mask]
+        lower = upper
+    pixels = pixels.astype(np.uint8)
+    pixels[height // 2 - 1:height // 2 + 1, width // 2] = (255, 0, 0)
+
+    # showInventory: a dark bar with slot borders, the first slot highlighted
+    pixels[height - 4:] = (40, 40, 40)
+    slot = width // 9
+    for i in range(9):
+        pixels[height - 4:, i * slot] = (100, 100, 100)
+        pixels[height - 4:, (i + 1) * slot - 1] = (100, 100, 100)
+    pixels[height - 4:, 1:slot - 1] = (80, 80, 80)
+    return pixels
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Bytes and encode time of full frames from the example games with and without the glyph choice
+(upper / lower half block, space or full block) that reuses the terminal's current colors
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from termgfx import RGB_BLACK
+from termgfx.encoder import FrameEncoder
+from game_frames import game1_room, game2_terrain
+from sgr_benchmark import tile_map
+
+COLUMNS, LINES = 120, 40
+REPEATS = 20
+
+def encode_time(encoder: FrameEncoder, frame) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        encoder.reset()
+        encoder.encode(frame)
+    return (time.perf_counter() - start) / REPEATS
+
+if __name__ == "__main__":
+    print(f"{COLUMNS}x{LINES}")
+    print(f"{'scene':>14} {'mode':>10} {'bytes':>8} {'optimized':>10} {'reduction':>10} {'ms':>6} {'ms opt':>7}")
+    scenes = (("game1 room", game1_room(COLUMNS, LINES * 2)), ("game2 terrain", game2_terrain(COLUMNS, LINES * 2)),
+              ("tile map", tile_map(COLUMNS, LINES * 2)))
+    for name, frame in scenes:
+        for mode in ("truecolor", "256"):
+            plain = FrameEncoder(RGB_BLACK, colorMode=mode)
+            optimized = FrameEncoder(RGB_BLACK, colorMode=mode, optimizeGlyphs=True)
+            size, optimizedSize = len(plain.encode(frame)), len(optimized.encode(frame))
+            print(f"{name:>14} {mode:>10} {size:>8} {optimizedSize:>10} {1 - optimizedSize / size:>10.1%} "
+                  f"{encode_time(plain, frame) * 1000:>6.2f} {encode_time(optimized, frame) * 1000:>7.2f}")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Throughput of the whole renderer pipeline (tick -> sample -> encode -> write) without a terminal,
+on the headless backend. Runs in CI containers, pass --json to get the reports for tracking
+regressions. The processes runs include starting the worker processes
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from termgfx import HeadlessRenderer, Vector2
+from game_frames import game1_room, game2_terrain
+
+COLUMNS, LINES = 160, 50
+FRAMES = 120
+
+def walking_terrain():
+    """A viewport walking over the game2 terrain, one pixel to the right every frame"""
+    world = game2_terrain(COLUMNS + FRAMES, LINES * 2)
+    def tick(size, deltaTime):
+        tick.frame += 1
+        x = tick.frame % FRAMES
+        return world[:, x:x + COLUMNS]
+    tick.frame = 0
+    return tick
+
+def flashlight_room():
+    """The game1 room with the flashlight sweeping over it"""
+    frames = [game1_room(COLUMNS, LINES * 2, frame) for frame in range(8)]
+    def tick(size, deltaTime):
+        tick.frame += 1
+        return frames[tick.frame % len(frames)]
+    tick.frame = 0
+    return tick
+
+def noise():
+    """Random pixels, the worst case for every stage after the tick"""
+    rng = np.random.default_rng(0)
+    def tick(size, deltaTime):
+        return rng.integers(0, 256, (LINES * 2, COLUMNS, 3), dtype=np.uint8)
+    return tick
+
+if __name__ == "__main__":
+    reports = {}
+    for name, scene in (("walking terrain", walking_terrain), ("flashlight room", flashlight_room), ("noise", noise)):
+        for strategy in ("threads", "processes"):
+            renderer = HeadlessRenderer(scene(), Vector2(COLUMNS, LINES * 2), encodeStrategy=strategy, threadCount=4)
+            reports[f"{name}/{strategy}"] = renderer.run(FRAMES)
+    if "--json" in sys.argv:
+        print(json.dumps(reports, indent=2))
+        sys.exit()
+    print(f"{COLUMNS}x{LINES}, {FRAMES} frames, ms per frame")
+    print(f"{'scene':>27} {'fps':>7} {'KB/frame':>9} {'cached':>7} {'tick':>6} {'sample':>7} {'encode':>7} {'write':>6}")
+    for name, report in reports.items():
+        stages = report["stages"]
+        print(f"{name:>27} {report['fps']:>7.0f} {report['bytesPerFrame'] / 1024:>9.1f} {report['cachedFrames']:>7} "
+              f"{stages['tick']['meanMs']:>6.2f} {stages['sample']['meanMs']:>7.2f} {stages['encode']['meanMs']:>7.2f} "
+              f"{stages['write']['meanMs']:>6.2f}")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Bytes per frame against the displayed error of the lossy damage tracking, on a sphere lit by a
+slowly rotating light like examples/3d
+"""
+
+import sys
+import os
+import math
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from termgfx import RGB_BLACK
+from termgfx.encoder import FrameEncoder
+
+COLUMNS, LINES = 120, 40
+FRAMES = 120
+
+def lit_sphere(width: int, height: int, frame: int) -> np.ndarray:
+    """A lambert shaded sphere, the light turns like update() in examples/3d/main.py"""
+    light = np.array([math.cos(frame / 10 * 0.7), -1.0, math.sin(frame / 10 * 0.7)])
+    light /= np.linalg.norm(light)
+    y, x = np.mgrid[0:height, 0:width]
+    radius = min(width, height) / 2
+    nx = (x - width / 2) / radius
+    ny = (y - height / 2) / radius
+    nz = np.sqrt(np.clip(1 - nx ** 2 - ny ** 2, 0, 1))
+    shade = np.clip(nx * light[0] + ny * light[1] + nz * light[2], 0, 1) * (nz > 0)
+    return np.repeat((shade * 255).astype(np.uint8)[..., None], 3, axis=-1)
+
+if __name__ == "__main__":
+    frames = [lit_sphere(COLUMNS, LINES * 2, i) for i in range(FRAMES)]
+    cells = COLUMNS * LINES
+    print(f"{COLUMNS}x{LINES}, {FRAMES} frames")
+    print(f"{'threshold':>9} {'bytes/frame':>12} {'changed/frame':>14} {'mean error':>11}")
+    for threshold in (0, 2, 4, 8, 16):
+        encoder = FrameEncoder(RGB_BLACK, threshold=threshold)
+        encoder.encode(frames[0])
+        size = changed = error = 0
+        for frame in frames[1:]:
+            size += len(encoder.encode(frame))
+            changed += encoder.changedCells
+            error += encoder.displayError / cells
+        count = len(frames) - 1
+        print(f"{threshold:>9} {size / count:>12.0f} {changed / count:>14.0f} {error / count:>11.3f}")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Bytes of damage-only frames with absolute CUP jumps against the cheapest cursor moves, the
+screens are checked in tests/test_encoder_properties.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from termgfx import RGB_BLACK
+from termgfx.encoder import FrameEncoder
+from game_frames import game2_terrain
+
+COLUMNS, LINES = 120, 40
+FRAMES = 60
+
+def moving_sprites(frames: int):
+    """Small sprites walking over the game2 terrain"""
+    background = game2_terrain(COLUMNS, LINES * 2)
+    rng = np.random.default_rng(0)
+    positions = rng.integers(0, (LINES * 2 - 6, COLUMNS - 6), (12, 2))
+    steps = rng.integers(-1, 2, (12, 2))
+    for _ in range(frames):
+        frame = background.copy()
+        positions = np.clip(positions + steps, 0, (LINES * 2 - 6, COLUMNS - 6))
+        for i, (y, x) in enumerate(positions):
+            frame[y:y + 5, x:x + 5] = (255, 40 * (i % 6), 0)
+            frame[y + 1:y + 4, x + 2] = (20, 20, 20)
+        yield frame
+
+def sparse_noise(frames: int):
+    """Scattered single cell changes, like particles or twinkling stars"""
+    rng = np.random.default_rng(1)
+    frame = np.zeros((LINES * 2, COLUMNS, 3), dtype=np.uint8)
+    for _ in range(frames):
+        frame = frame.copy()
+        ys, xs = rng.integers(0, LINES * 2, 150), rng.integers(0, COLUMNS, 150)
+        frame[ys, xs] = rng.integers(0, 256, (150, 3))
+        yield frame
+
+def replay(scene, **options) -> int:
+    """Encode every frame of a scene and return the total bytes"""
+    encoder = FrameEncoder(RGB_BLACK, **options)
+    return sum(len(encoder.encode(frame)) for frame in scene(FRAMES))
+
+if __name__ == "__main__":
+    print(f"{COLUMNS}x{LINES}, {FRAMES} frames")
+    print(f"{'scene':>15} {'options':>22} {'CUP bytes':>10} {'moves bytes':>12} {'saved':>7}")
+    for name, scene in (("moving sprites", moving_sprites), ("sparse noise", sparse_noise)):
+        for options in ({}, {"optimizeGlyphs": True, "repeat": True}):
+            absolute = replay(scene, optimizeMoves=False, **options)
+            relative = replay(scene, optimizeMoves=True, **options)
+            label = ",".join(options) or "-"
+            print(f"{name:>15} {label:>22} {absolute:>10} {relative:>12} {1 - relative / absolute:>7.1%}")
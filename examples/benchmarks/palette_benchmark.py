@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Bytes per full frame and encode time in the truecolor, 256 color and 16 color output modes
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from termgfx import RGB_BLACK
+from termgfx.encoder import FrameEncoder
+from termgfx.palette import palette_lut
+from sgr_benchmark import gradient, shaded_sphere, tile_map
+
+COLUMNS, LINES = 200, 60
+REPEATS = 20
+
+def encode_time(encoder: FrameEncoder, frame) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        encoder.reset()
+        encoder.encode(frame)
+    return (time.perf_counter() - start) / REPEATS
+
+if __name__ == "__main__":
+    # building the lookup tables is a one time cost, keep it out of the frame timings
+    for mode in ("256", "16"):
+        start = time.perf_counter()
+        palette_lut(mode)
+        print(f"{mode:>3} color lookup table built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(f"{COLUMNS}x{LINES}")
+    print(f"{'scene':>14} {'mode':>10} {'bytes':>9} {'ms/frame':>9}")
+    for name, scene in (("gradient", gradient), ("shaded sphere", shaded_sphere), ("tile map", tile_map)):
+        frame = scene(COLUMNS, LINES * 2)
+        for mode in ("truecolor", "256", "16"):
+            encoder = FrameEncoder(RGB_BLACK, colorMode=mode)
+            size = len(encoder.encode(frame))
+            print(f"{name:>14} {mode:>10} {size:>9} {encode_time(encoder, frame) * 1000:>9.2f}")
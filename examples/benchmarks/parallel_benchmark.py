@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Encode time per frame of a 4K wide terminal with one encoder and with the parallel band encoders,
+scaling with the number of bands up to the core count. Run it on both a regular and a
+free-threaded (python3.13t) build to compare the thread and process strategies.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from termgfx import RGB_BLACK
+from termgfx.encoder import FrameEncoder
+from termgfx.parallel import ThreadBandEncoder, ProcessBandEncoder, gil_enabled
+
+# a 3840px wide tmux pane with an 8px font
+COLUMNS, LINES = 480, 135
+FRAMES = 30
+
+def moving_gradient(width: int, height: int, tick: int) -> np.ndarray:
+    """A scrolling diagonal gradient, every cell changes on every frame"""
+    y, x = np.mgrid[0:height, 0:width]
+    return np.stack(((x + tick) * 255 // width, y * 255 // height, (x + y + 2 * tick) % 256), axis=-1).astype(np.uint8)
+
+def time_encoder(encode, frames) -> float:
+    encode(frames[-1])  # warm up, the first frame is a full repaint either way
+    start = time.perf_counter()
+    for frame in frames:
+        encode(frame)
+    return (time.perf_counter() - start) / len(frames)
+
+if __name__ == "__main__":
+    frames = [moving_gradient(COLUMNS, LINES * 2, tick) for tick in range(FRAMES)]
+    cpus = os.cpu_count() or 1
+    counts = sorted({1 << i for i in range(cpus.bit_length()) if 1 << i <= cpus} | {cpus})
+    print(f"{COLUMNS}x{LINES}, {cpus} cpus, python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled() else 'disabled'}")
+
+    single = time_encoder(FrameEncoder(RGB_BLACK).encode, frames)
+    print(f"{'single':>10} {single * 1000:>10.2f} ms")
+    print(f"{'bands':>10} {'threads ms':>13} {'processes ms':>13}")
+    for count in counts:
+        results = []
+        for encoderType in (ThreadBandEncoder, ProcessBandEncoder):
+            encoder = encoderType(RGB_BLACK, count)
+            try:
+                elapsed = time_encoder(encoder.encode, frames)
+            finally:
+                encoder.close()
+            results.append(f"{elapsed * 1000:>7.2f} {single / elapsed:>4.1f}x")
+        print(f"{count:>10} {results[0]:>13} {results[1]:>13}")
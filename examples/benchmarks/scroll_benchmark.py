@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Bytes per frame while walking across a map, repainting the changed cells against scrolling the
+terminal (scroll region with SU / SD, ICH / DCH) and repainting the exposed strips, the screens
+are checked in tests/test_encoder_properties.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from termgfx import RGB_BLACK
+from termgfx.encoder import FrameEncoder, pack_colors
+from termgfx.scroll import detect_shift, scroll_sequence
+from game_frames import game2_terrain
+from sgr_benchmark import tile_map
+
+COLUMNS, LINES = 120, 40
+# (dx, dy) the view moves by every frame, in pixels
+WALK = [(0, 2)] * 10 + [(1, 0)] * 10 + [(-1, -2)] * 10
+
+def viewports(world: np.ndarray, hud: bool):
+    """Frames of a camera walking over a world image, optionally with game2's inventory bar on top"""
+    x, y = COLUMNS, LINES * 2
+    for dx, dy in WALK:
+        x, y = x + dx, y + dy
+        frame = world[y:y + LINES * 2, x:x + COLUMNS].copy()
+        if hud:
+            frame[-4:] = (40, 40, 40)
+        yield frame
+
+def replay(frames, scroll: bool) -> int:
+    """Encode the frames and return the bytes after the first frame"""
+    encoder = FrameEncoder(RGB_BLACK)
+    previous = None
+    total = 0
+    for frame in frames:
+        pixels = pack_colors(frame)
+        output = b""
+        if scroll and previous is not None:
+            dx, dy = detect_shift(previous, pixels)
+            if dx or dy:
+                output = scroll_sequence(dx, dy // 2, LINES)
+                encoder.shift(dx, dy // 2)
+        output += encoder.encode(frame)
+        if previous is not None:
+            total += len(output)
+        previous = pixels
+    return total
+
+if __name__ == "__main__":
+    worlds = (("game2 terrain", game2_terrain(COLUMNS * 3, LINES * 6)), ("tile map", tile_map(COLUMNS * 3, LINES * 6)))
+    print(f"{COLUMNS}x{LINES}, {len(WALK) - 1} moving frames")
+    print(f"{'world':>14} {'hud':>5} {'repaint bytes/frame':>20} {'scroll bytes/frame':>19}")
+    for name, world in worlds:
+        for hud in (False, True):
+            repaint = replay(viewports(world, hud), False) / (len(WALK) - 1)
+            scrolled = replay(viewports(world, hud), True) / (len(WALK) - 1)
+            print(f"{name:>14} {str(hud):>5} {repaint:>20.0f} {scrolled:>19.0f}")
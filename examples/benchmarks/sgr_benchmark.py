@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compare formatting SGR sequences per color change against the precomputed lookup tables,
+with and without the per-frame color dictionary
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from termgfx import RGB_BLACK
+from termgfx.encoder import pack_cells, encode_cells
+
+COLUMNS, LINES = 200, 60
+REPEATS = 20
+
+def formatted_encode(top: np.ndarray, bottom: np.ndarray) -> bytes:
+    """The encoder loop formatting every sequence with f-strings, as before the lookup tables"""
+    rows, cols = top.shape
+    runStart = np.ones((rows, cols), dtype=bool)
+    runStart[:, 1:] = (top[:, 1:] != top[:, :-1]) | (bottom[:, 1:] != bottom[:, :-1])
+    runRows, runCols = np.nonzero(runStart)
+    lengths = np.diff(runRows * cols + runCols, append=rows * cols)
+    parts = []
+    fg = bg = None
+    for row, col, length, runFg, runBg in zip(runRows.tolist(), runCols.tolist(), lengths.tolist(),
+                                             top[runRows, runCols].tolist(), bottom[runRows, runCols].tolist()):
+        if col == 0:
+            parts.append(f"\033[{row + 1};1H")
+        if runFg != fg:
+            parts.append(f"\033[38;2;{runFg >> 16};{(runFg >> 8) & 255};{runFg & 255}m")
+            fg = runFg
+        if runBg != bg:
+            parts.append(f"\033[48;2;{runBg >> 16};{(runBg >> 8) & 255};{runBg & 255}m")
+            bg = runBg
+        parts.append("\u2580" * length)
+    parts.append("\033[0m")
+    return "".join(parts).encode("utf-8")
+
+def gradient(width: int, height: int) -> np.ndarray:
+    """A diagonal RGB gradient, almost every cell has its own colors"""
+    y, x = np.mgrid[0:height, 0:width]
+    return np.stack((x * 255 // width, y * 255 // height, (x + y) * 255 // (width + height)), axis=-1).astype(np.uint8)
+
+def shaded_sphere(width: int, height: int) -> np.ndarray:
+    """A lambert shaded sphere like examples/3d"""
+    y, x = np.mgrid[0:height, 0:width]
+    nx = (x - width / 2) / (min(width, height) / 2)
+    ny = (y - height / 2) / (min(width, height) / 2)
+    nz = np.sqrt(np.clip(1 - nx ** 2 - ny ** 2, 0, 1))
+    light = np.clip(nx * 0.5 - ny * 0.5 + nz * 0.7, 0, 1) * (nz > 0)
+    return np.repeat((light * 255).astype(np.uint8)[..., None], 3, axis=-1)
+
+def tile_map(width: int, height: int) -> np.ndarray:
+    """4x4 pixel tiles from a 4 color palette"""
+    rng = np.random.default_rng(0)
+    palette = np.array([(60, 140, 50), (40, 90, 200), (200, 190, 120), (120, 120, 120)], dtype=np.uint8)
+    tiles = rng.integers(0, len(palette), (height // 4 + 1, width // 4 + 1))
+    return palette[tiles.repeat(4, 0).repeat(4, 1)[:height, :width]]
+
+def time_call(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func(*args, **kwargs)
+    return (time.perf_counter() - start) / REPEATS
+
+if __name__ == "__main__":
+    print(f"{COLUMNS}x{LINES}")
+    print(f"{'scene':>14} {'formatted ms':>13} {'lut ms':>8} {'lut+dict ms':>12} {'auto ms':>8}")
+    for name, scene in (("gradient", gradient), ("shaded sphere", shaded_sphere), ("tile map", tile_map)):
+        top, bottom = pack_cells(scene(COLUMNS, LINES * 2), RGB_BLACK)
+        formatted = time_call(formatted_encode, top, bottom)
+        lut = time_call(encode_cells, top, bottom, colorCache=False)
+        cached = time_call(encode_cells, top, bottom, colorCache=True)
+        auto = time_call(encode_cells, top, bottom)
+        print(f"{name:>14} {formatted * 1000:>13.2f} {lut * 1000:>8.2f} {cached * 1000:>12.2f} {auto * 1000:>8.2f}")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Rolling render stats of the headless renderer: p50/p95/p99 of the frame and stage times, bytes
+and changed cells, read from renderer.stats, and the cost of recording them (the statsCallback
+hook counts the frames it saw)
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from termgfx import HeadlessRenderer, Vector2
+from termgfx.stats import RenderStats
+from game_frames import game2_terrain
+
+COLUMNS, LINES = 160, 50
+FRAMES = 240
+
+def walking_terrain():
+    world = game2_terrain(COLUMNS + FRAMES, LINES * 2)
+    def tick(size, deltaTime):
+        tick.frame += 1
+        x = tick.frame % FRAMES
+        return world[:, x:x + COLUMNS]
+    tick.frame = 0
+    return tick
+
+def recording_cost(frames: int = 100000) -> float:
+    """Microseconds per record_start + record_frame"""
+    stats = RenderStats()
+    frame = {"tickTime": 1e-4, "sampleTime": 3e-4, "encodeTime": 4e-3, "writeTime": 3e-5, "bytesWritten": 6000, "changedCells": 900}
+    start = time.perf_counter()
+    for i in range(frames):
+        stats.record_start(i / 60)
+        stats.record_frame(frame)
+    return (time.perf_counter() - start) / frames * 1e6
+
+if __name__ == "__main__":
+    seen = []
+    renderer = HeadlessRenderer(walking_terrain(), Vector2(COLUMNS, LINES * 2), threadCount=4, statsCallback=seen.append)
+    renderer.run(FRAMES, paced=True)
+    summary = renderer.stats.summary()
+    print(f"{COLUMNS}x{LINES}, {FRAMES} frames paced at 60 fps, window of {renderer.stats.window} frames")
+    print(f"fps {summary['fps']:.1f}, written {summary['frames']} (callback saw {len(seen)}), skipped {summary['skippedFrames']}, "
+          f"dropped {summary['droppedFrames']}")
+    print(f"{'metric':>13} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for metric in ("frameTime", "tickTime", "sampleTime", "encodeTime", "writeTime"):
+        p = summary[metric]
+        print(f"{metric:>13} {p['p50'] * 1000:>7.2f}ms {p['p95'] * 1000:>7.2f}ms {p['p99'] * 1000:>7.2f}ms")
+    for metric in ("bytesWritten", "changedCells"):
+        p = summary[metric]
+        print(f"{metric:>13} {p['p50']:>9.0f} {p['p95']:>9.0f} {p['p99']:>9.0f}")
+    print(f"recording: {recording_cost():.2f} us per frame")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Capture a Chrome trace of the render pipeline: the walking terrain scene runs paced on the
+headless renderer with a FrameTracer, and the timeline of the tick, sample, encode (and band
+workers), write and wait spans is dumped to a JSON file (default render_trace.json) to open in
+chrome://tracing or https://ui.perfetto.dev. Also compares the run time with and without the tracer
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from termgfx import HeadlessRenderer, FrameTracer, Vector2
+from game_frames import game2_terrain
+
+COLUMNS, LINES = 160, 50
+FRAMES = 240
+
+def walking_terrain():
+    world = game2_terrain(COLUMNS + FRAMES, LINES * 2)
+    def tick(size, deltaTime):
+        tick.frame += 1
+        x = tick.frame % FRAMES
+        return world[:, x:x + COLUMNS]
+    tick.frame = 0
+    return tick
+
+def run_seconds(tracer, paced: bool) -> float:
+    renderer = HeadlessRenderer(walking_terrain(), Vector2(COLUMNS, LINES * 2), threadCount=4, encodeStrategy="threads",
+                                tracer=tracer)
+    start = time.perf_counter()
+    renderer.run(FRAMES, paced=paced)
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "render_trace.json"
+    tracer = FrameTracer()
+    run_seconds(tracer, paced=True)
+    tracer.dump(path)
+    print(f"{len(tracer)} events written to {path}")
+    plain = min(run_seconds(None, paced=False) for _ in range(3))
+    traced = min(run_seconds(FrameTracer(), paced=False) for _ in range(3))
+    print(f"unpaced run of {FRAMES} frames: {plain * 1000:.0f} ms without the tracer, {traced * 1000:.0f} ms with it")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+True per-frame wire cost of every output mode: scenes run through the headless renderer and the
+output is interpreted by the virtual terminal, which counts the bytes, printed cells and escape
+sequences and checks the screen ends on the last frame
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import numpy as np
+from termgfx import HeadlessRenderer, Vector2, RGB_BLACK
+from termgfx.encoder import pack_cells, color_distance
+from termgfx.parallel import row_bands
+from termgfx.vterm import VirtualTerminal
+from game_frames import game1_room, game2_terrain
+
+COLUMNS, LINES = 120, 40
+FRAMES = 60
+THREADS = 4
+
+# (name, HeadlessRenderer options), from the plain encoder to every optimization
+MODES = (
+    ("plain", {"optimizeMoves": False, "detectScroll": False}),
+    ("moves", {"detectScroll": False}),
+    ("moves+glyphs", {"optimizeGlyphs": True, "detectScroll": False}),
+    ("moves+glyphs+rep", {"optimizeGlyphs": True, "repeatSequence": True, "detectScroll": False}),
+    ("all (scroll)", {"optimizeGlyphs": True, "repeatSequence": True}),
+    ("all, sync output", {"optimizeGlyphs": True, "repeatSequence": True, "syncOutput": True}),
+    ("all, lossy 6", {"optimizeGlyphs": True, "repeatSequence": True, "colorThreshold": 6.0}),
+    ("all, 256 colors", {"optimizeGlyphs": True, "repeatSequence": True, "colorMode": "256"}),
+    ("all, 16 colors", {"optimizeGlyphs": True, "repeatSequence": True, "colorMode": "16"}),
+)
+
+def walking_terrain():
+    world = game2_terrain(COLUMNS + FRAMES, LINES * 2 + FRAMES * 2)
+    return [world[2 * i:2 * i + LINES * 2, i // 2:i // 2 + COLUMNS] for i in range(FRAMES)]
+
+def flashlight_room():
+    return [game1_room(COLUMNS, LINES * 2, i) for i in range(FRAMES)]
+
+def moving_sprites():
+    background = game2_terrain(COLUMNS, LINES * 2)
+    frames = []
+    for i in range(FRAMES):
+        frame = background.copy()
+        for k in range(6):
+            y, x = (7 * k + i) % (LINES * 2 - 6), (23 * k + 2 * i) % (COLUMNS - 6)
+            frame[y:y + 6, x:x + 6] = (240, 50 + 30 * k, 40)
+        frames.append(frame)
+    return frames
+
+def wire_cost(frames, options: dict) -> dict:
+    sequence = list(frames)
+    renderer = HeadlessRenderer(lambda size: sequence.pop(0), Vector2(COLUMNS, LINES * 2), threadCount=THREADS, **options)
+    report = renderer.run(len(frames))
+    terminal = VirtualTerminal(COLUMNS, LINES)
+    terminal.feed(renderer.output)
+    mode = options.get("colorMode", "truecolor")
+    packed = [pack_cells(frames[-1][start:end], RGB_BLACK, mode) for start, end in row_bands(LINES * 2, THREADS)]
+    top, bottom = np.concatenate([t for t, _ in packed]), np.concatenate([b for _, b in packed])
+    shownTop, shownBottom = terminal.cell_colors()
+    error = np.maximum(color_distance(shownTop.astype(np.uint32), top, mode), color_distance(shownBottom.astype(np.uint32), bottom, mode))
+    assert (error <= options.get("colorThreshold", 0) + 1e-3).all(), f"screen differs with {options}"
+    return {"bytes": terminal.bytesFed / len(frames), "cells": terminal.printedCells / len(frames),
+            "sequences": terminal.escapeSequences / len(frames), "skipped": report["skippedFrames"]}
+
+if __name__ == "__main__":
+    print(f"{COLUMNS}x{LINES}, {FRAMES} frames, per frame, screens checked on the virtual terminal")
+    print(f"{'scene':>16} {'mode':>18} {'bytes':>8} {'cells':>7} {'sequences':>10}")
+    for name, scene in (("walking terrain", walking_terrain), ("flashlight room", flashlight_room), ("moving sprites", moving_sprites)):
+        frames = scene()
+        for mode, options in MODES:
+            cost = wire_cost(frames, options)
+            print(f"{name:>16} {mode:>18} {cost['bytes']:>8.0f} {cost['cells']:>7.0f} {cost['sequences']:>10.0f}")
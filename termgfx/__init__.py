@@ -6,6 +6,9 @@ from .vectors import Vector2
 from .colors import Color, RGB_RED, RGB_GREEN, RGB_BLUE, RGB_WHITE, RGB_BLACK
 from .textures import Image, Texture, REPEAT_MODE
 from .renderer import ConsoleRenderer
+from .headless import HeadlessRenderer
+from .trace import FrameTracer
+from .hud import PerfHud
 
 # Define what gets imported with "from console_gfx import *"
 __all__ = [
@@ -15,5 +18,8 @@ __all__ = [
     'Image',
     'Texture',
     'REPEAT_MODE',
-    'ConsoleRenderer'
+    'ConsoleRenderer',
+    'HeadlessRenderer',
+    'FrameTracer',
+    'PerfHud'
 ]
\ No newline at end of file
@@ -132,6 +132,12 @@ class Color:
     def alpha(self):
         return self._a
 
+    # lowercase aliases used by the textures and the renderer
+    r = R
+    g = G
+    b = B
+    a = alpha
+
 RGB_RED = Color("RGB", [255, 0, 0])
 RGB_GREEN = Color("RGB", [0, 255, 0])
 RGB_BLUE = Color("RGB", [0, 0, 255])
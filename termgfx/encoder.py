@@ -0,0 +1,526 @@
+import numpy as np
+from typing import List, Optional, Tuple
+from .colors import *
+from .vectors import *
+from .palette import _ColorMode, _DitherMode, PALETTE_256_FLAG, PALETTE_16_FLAG, palette_colors, palette_flag, quantize
+
+UPPER_HALF_BLOCK = "\u2580"
+LOWER_HALF_BLOCK = "\u2584"
+FULL_BLOCK = "\u2588"
+RESET_SGR = "\033[0m"
+
+UPPER_HALF_BLOCK_BYTES = UPPER_HALF_BLOCK.encode("utf-8")
+LOWER_HALF_BLOCK_BYTES = LOWER_HALF_BLOCK.encode("utf-8")
+FULL_BLOCK_BYTES = FULL_BLOCK.encode("utf-8")
+RESET_SGR_BYTES = RESET_SGR.encode("ascii")
+# cells with equal halves are drawn as spaces on their background color
+SPACE_BYTES = b" "
+
+# glyph of a run: the upper half block (fg on top), a space (bg only), the lower half block
+# (fg at the bottom, the colors swapped) or a full block (fg only)
+_GLYPH_BYTES = (UPPER_HALF_BLOCK_BYTES, SPACE_BYTES, LOWER_HALF_BLOCK_BYTES, FULL_BLOCK_BYTES)
+_UPPER, _SPACE, _LOWER, _FULL = range(4)
+
+# decimal digits of every color component and of the usual cursor positions,
+# so escape sequences are joined from cached bytes instead of formatted per cell
+_NUMBER_BYTES = [str(i).encode("ascii") for i in range(1024)]
+# SGR fragments per color component: "\033[38;2;R;" (or 48 for the background), "G;" and "Bm"
+_FG_RED_BYTES = [b"\033[38;2;" + digits + b";" for digits in _NUMBER_BYTES[:256]]
+_BG_RED_BYTES = [b"\033[48;2;" + digits + b";" for digits in _NUMBER_BYTES[:256]]
+_GREEN_BYTES = [digits + b";" for digits in _NUMBER_BYTES[:256]]
+_BLUE_BYTES = [digits + b"m" for digits in _NUMBER_BYTES[:256]]
+# SGR sequences of the palette modes per index, keyed by the mode flag shifted down from above the 24 color bits:
+# "\033[38;5;Nm" for the 256 color palette, 30-37 / 90-97 (40-47 / 100-107) for the 16 ANSI colors
+_PALETTE_FG_BYTES = {
+    PALETTE_256_FLAG >> 24: [b"\033[38;5;" + digits + b"m" for digits in _NUMBER_BYTES[:256]],
+    PALETTE_16_FLAG >> 24: [b"\033[" + _NUMBER_BYTES[30 + i if i < 8 else 82 + i] + b"m" for i in range(16)],
+}
+_PALETTE_BG_BYTES = {
+    PALETTE_256_FLAG >> 24: [b"\033[48;5;" + digits + b"m" for digits in _NUMBER_BYTES[:256]],
+    PALETTE_16_FLAG >> 24: [b"\033[" + _NUMBER_BYTES[40 + i if i < 8 else 92 + i] + b"m" for i in range(16)],
+}
+_PALETTE_FG_LENGTHS = {mode: np.array([len(sgr) for sgr in table]) for mode, table in _PALETTE_FG_BYTES.items()}
+
+def number_bytes(value: int) -> bytes:
+    """Decimal digits of a non negative integer as bytes"""
+    if value < 1024:
+        return _NUMBER_BYTES[value]
+    return str(value).encode("ascii")
+
+def fg_sgr(color: int) -> bytes:
+    """SGR sequence setting the foreground to a packed 24-bit color or palette index"""
+    if color >> 24:
+        return _PALETTE_FG_BYTES[color >> 24][color & 255]
+    return _FG_RED_BYTES[color >> 16] + _GREEN_BYTES[(color >> 8) & 255] + _BLUE_BYTES[color & 255]
+
+def bg_sgr(color: int) -> bytes:
+    """SGR sequence setting the background to a packed 24-bit color or palette index"""
+    if color >> 24:
+        return _PALETTE_BG_BYTES[color >> 24][color & 255]
+    return _BG_RED_BYTES[color >> 16] + _GREEN_BYTES[(color >> 8) & 255] + _BLUE_BYTES[color & 255]
+
+def sgr_sequences(colors: np.ndarray, background: bool = False) -> List[bytes]:
+    """SGR sequences for an array of packed colors, all of them 24-bit colors or all palette indices of one mode"""
+    mode = int(colors[0]) >> 24 if len(colors) else 0
+    if mode:
+        table = (_PALETTE_BG_BYTES if background else _PALETTE_FG_BYTES)[mode]
+        return [table[index] for index in (colors & 255).tolist()]
+    red = _BG_RED_BYTES if background else _FG_RED_BYTES
+    return [red[r] + _GREEN_BYTES[g] + _BLUE_BYTES[b]
+            for r, g, b in zip((colors >> 16).tolist(), ((colors >> 8) & 255).tolist(), (colors & 255).tolist())]
+
+def cursor_position(row: int, col: int) -> bytes:
+    """CUP sequence moving the cursor to a 0 based cell"""
+    return b"\033[" + number_bytes(row + 1) + b";" + number_bytes(col + 1) + b"H"
+
+def _cursor_forward(count: int) -> bytes:
+    if count == 0:
+        return b""
+    return b"\033[C" if count == 1 else b"\033[" + number_bytes(count) + b"C"
+
+def cursor_move(fromRow: int, fromCol: int, toRow: int, toCol: int, wrapPending: bool = False) -> bytes:
+    """Shortest sequence moving the cursor between 0 based cells of the screen.
+
+    Candidates are an absolute CUP, a CUF on the same line, and CR followed by line feeds
+    (or a CUD) and a CUF. A cursor left in the deferred wrap state after writing the last
+    column only takes the CR based move, since its column depends on the terminal.
+    Moves only go right or down, the way the encoder walks the screen.
+    """
+    best = cursor_position(toRow, toCol)
+    if toRow == fromRow and toCol > fromCol and not wrapPending:
+        move = _cursor_forward(toCol - fromCol)
+    elif toRow > fromRow:
+        down = toRow - fromRow
+        lineFeeds = b"\n" * down if down < 5 else b""
+        cursorDown = b"\033[B" if down == 1 else b"\033[" + number_bytes(down) + b"B"
+        move = b"\r" + (lineFeeds if lineFeeds and len(lineFeeds) <= len(cursorDown) else cursorDown) + _cursor_forward(toCol)
+    else:
+        return best
+    return move if len(move) < len(best) else best
+
+def repeat_sequence(count: int) -> bytes:
+    """REP sequence repeating the previous character count more times"""
+    return b"\033[" + number_bytes(count) + b"b"
+
+def _digit_counts(values: np.ndarray) -> np.ndarray:
+    return 1 + (values >= 10).astype(np.int64) + (values >= 100)
+
+def _sgr_lengths(colors: np.ndarray) -> np.ndarray:
+    mode = int(colors[0]) >> 24 if len(colors) else 0
+    if mode:
+        return _PALETTE_FG_LENGTHS[mode][colors & 255]
+    # "\033[38;2;" + r + ";" + g + ";" + b + "m"
+    return 10 + _digit_counts(colors >> 16) + _digit_counts((colors >> 8) & 255) + _digit_counts(colors & 255)
+
+def _object_array(items: list) -> np.ndarray:
+    # assigning into an object array keeps the bytes objects as they are
+    array = np.empty(len(items), dtype=object)
+    array[:] = items
+    return array
+
+# runs sampled to guess if a frame repeats its colors enough for the color cache to pay off
+_CACHE_SAMPLE = 256
+
+def _repeats_colors(colors: np.ndarray) -> bool:
+    """Guess from an evenly spaced sample if the runs reuse their colors, so the color cache pays off"""
+    sample = colors[::max(1, len(colors) // _CACHE_SAMPLE)]
+    # a few repeats in the sample mean many in the whole frame, only (nearly) all distinct colors skip the cache
+    return len(np.unique(sample)) * 10 < len(sample) * 9
+
+def _color_sequences(colors: np.ndarray, background: bool, colorCache: Optional[bool]) -> np.ndarray:
+    if colorCache is None:
+        colorCache = _repeats_colors(colors)
+    if colorCache:
+        # build the sequence of each distinct color of the frame once and gather them
+        unique, inverse = np.unique(colors, return_inverse=True)
+        return _object_array(sgr_sequences(unique, background))[inverse.reshape(-1)]
+    return _object_array(sgr_sequences(colors, background))
+
+def _glyph_run(glyph: bytes, length: int, repeat: bool) -> bytes:
+    run = glyph * length
+    if repeat and length > 1:
+        repeated = glyph + repeat_sequence(length - 1)
+        if len(repeated) < len(run):
+            run = repeated
+    return run
+
+def _glyph_runs(lengths: np.ndarray, glyphs: np.ndarray, repeat: bool) -> np.ndarray:
+    # runs of the same glyph and length share their bytes
+    unique, inverse = np.unique(lengths * 4 + glyphs, return_inverse=True)
+    glyphRuns = [_glyph_run(_GLYPH_BYTES[key & 3], key >> 2, repeat) for key in unique.tolist()]
+    return _object_array(glyphRuns)[inverse.reshape(-1)]
+
+def _choose_glyphs(fgColors: np.ndarray, bgColors: np.ndarray, lengths: np.ndarray, repeat: bool) -> np.ndarray:
+    # one greedy pass over the runs, following the SGR state the stream leaves the terminal in:
+    # a two color run takes the half block whose colors need the fewest SGR changes, and a one
+    # color run already set as the fg is drawn with full blocks when that's cheaper than a bg change
+    glyphs = np.where(fgColors == bgColors, _SPACE, _UPPER)
+    sgrLengths = _sgr_lengths(bgColors).tolist()
+    fg = bg = -1
+    for i, (top, bottom, length) in enumerate(zip(fgColors.tolist(), bgColors.tolist(), lengths.tolist())):
+        if top == bottom:
+            if top == fg and top != bg and (len(_glyph_run(FULL_BLOCK_BYTES, length, repeat))
+                                            < len(_glyph_run(SPACE_BYTES, length, repeat)) + sgrLengths[i]):
+                glyphs[i] = _FULL
+            else:
+                bg = top
+        elif (bottom != fg) + (top != bg) < (top != fg) + (bottom != bg):
+            glyphs[i] = _LOWER
+            fg, bg = bottom, top
+        else:
+            fg, bg = top, bottom
+    return glyphs
+
+def _fill_gaps(top: np.ndarray, bottom: np.ndarray, changed: np.ndarray) -> np.ndarray:
+    # short gaps of unchanged cells between two changed cells of a row are rewritten instead of
+    # jumped over when they continue the colors of a neighbouring run (so they need no SGR) and
+    # their glyphs take fewer bytes than the CUF moving past them
+    rows, cols = changed.shape
+    unchanged = ~changed
+    gapStart = unchanged.copy()
+    gapStart[:, 1:] &= changed[:, :-1]
+    gapEnd = unchanged.copy()
+    gapEnd[:, :-1] &= changed[:, 1:]
+    startCols = np.nonzero(gapStart)[1]
+    endCols = np.nonzero(gapEnd)[1]
+    if len(startCols) == 0:
+        return changed
+    lengths = endCols - startCols + 1
+    inside = (startCols > 0) & (endCols < cols - 1)
+
+    cells = unchanged.ravel()
+    gapIds = (np.cumsum(gapStart.ravel()) - 1)[cells]
+    sameColors = np.zeros((rows, cols + 1), dtype=bool)
+    sameColors[:, 1:-1] = (top[:, 1:] == top[:, :-1]) & (bottom[:, 1:] == bottom[:, :-1])
+    # a gap continues its left run when every cell equals the one before it, its right run when every cell equals the next
+    differsLeft = np.bincount(gapIds, weights=~sameColors[:, :-1].ravel()[cells], minlength=len(lengths))
+    differsRight = np.bincount(gapIds, weights=~sameColors[:, 1:].ravel()[cells], minlength=len(lengths))
+    glyphBytes = np.where(top == bottom, len(SPACE_BYTES), len(UPPER_HALF_BLOCK_BYTES)).ravel()[cells]
+    fillBytes = np.bincount(gapIds, weights=glyphBytes, minlength=len(lengths))
+    moveBytes = np.where(lengths == 1, 3, 3 + _digit_counts(lengths))
+    fill = inside & ((differsLeft == 0) | (differsRight == 0)) & (fillBytes < moveBytes)
+    if not fill.any():
+        return changed
+    filled = changed.copy().ravel()
+    filled[cells] |= fill[gapIds]
+    return filled.reshape(rows, cols)
+
+def _changes(colors: np.ndarray) -> np.ndarray:
+    change = np.ones(len(colors), dtype=bool)
+    change[1:] = colors[1:] != colors[:-1]
+    return change
+
+# damage state of cells whose content is unknown (e.g. exposed by a scroll), never equal to a packed color
+UNKNOWN_CELL = 0xFFFFFFFF
+
+def shift_cells(cells: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    """Move packed (rows, cols) cells by dx columns and dy rows, the exposed cells become UNKNOWN_CELL"""
+    rows, cols = cells.shape
+    shifted = np.full_like(cells, UNKNOWN_CELL)
+    if abs(dx) < cols and abs(dy) < rows:
+        shifted[max(dy, 0):rows + min(dy, 0), max(dx, 0):cols + min(dx, 0)] = \
+            cells[max(-dy, 0):rows - max(dy, 0), max(-dx, 0):cols - max(dx, 0)]
+    return shifted
+
+def pack_colors(pixels: np.ndarray) -> np.ndarray:
+    """Pack an (..., 3) uint8 RGB array into 24-bit integers (0xRRGGBB)"""
+    pixels = pixels.astype(np.uint32)
+    return (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+
+def pack_color(color: Color, colorMode: _ColorMode = "truecolor") -> int:
+    """Pack a single Color into a 24-bit integer (0xRRGGBB), or into its flagged palette index for the palette modes"""
+    if colorMode != "truecolor":
+        pixel = np.array([[[color.r, color.g, color.b]]], dtype=np.uint8)
+        return int(quantize(pixel, colorMode)[0, 0]) | palette_flag(colorMode)
+    return (int(color.r) << 16) | (int(color.g) << 8) | int(color.b)
+
+def pack_palette(pixels: np.ndarray, colorMode: _ColorMode, dither: _DitherMode = "none", rowOffset: int = 0) -> np.ndarray:
+    """Quantize an (H, W, 3) uint8 RGB frame to the palette of a color mode, packing the indices with the mode's flag"""
+    if colorMode == "truecolor":
+        return pack_colors(pixels)
+    return quantize(pixels, colorMode, dither=dither, rowOffset=rowOffset).astype(np.uint32) | palette_flag(colorMode)
+
+def unpack_colors(packed: np.ndarray, colorMode: _ColorMode = "truecolor") -> np.ndarray:
+    """RGB components of packed colors (or palette indices), as an (..., 3) int32 array"""
+    if colorMode != "truecolor":
+        return palette_colors(colorMode)[packed & 255].astype(np.int32)
+    packed = packed.astype(np.int32)
+    return np.stack(((packed >> 16) & 255, (packed >> 8) & 255, packed & 255), axis=-1)
+
+def color_distance(a: np.ndarray, b: np.ndarray, colorMode: _ColorMode = "truecolor") -> np.ndarray:
+    """Perceptual distance between packed colors, a weighted RGB distance on the scale of one channel level"""
+    delta = (unpack_colors(a, colorMode) - unpack_colors(b, colorMode)).astype(np.float32)
+    return np.sqrt((delta ** 2 * np.array([2.0, 4.0, 3.0], dtype=np.float32)).sum(axis=-1) / 9)
+
+def pack_cells(frame: np.ndarray, bg: Color, colorMode: _ColorMode = "truecolor", dither: _DitherMode = "none",
+               rowOffset: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Pair the pixel rows of a frame into terminal cells.
+
+    Args:
+        frame (np.ndarray): (H, W, 3) uint8 RGB frame.
+        bg (Color): color used for the bottom half of the last cell row when H is odd.
+        colorMode (_ColorMode, optional): "truecolor" packs 24-bit colors, "256" and "16" quantize the frame
+            to the palette of the mode. Defaults to "truecolor".
+        dither (_DitherMode, optional): dithering applied before quantizing to a palette, see palette.quantize. Defaults to "none".
+        rowOffset (int, optional): screen pixel row of the frame's first row, aligns the ordered dither pattern. Defaults to 0.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: the packed top and bottom colors, both of shape (ceil(H / 2), W).
+    """
+    packed = pack_palette(frame, colorMode, dither, rowOffset)
+    top = packed[0::2]
+    bottom = packed[1::2]
+    if bottom.shape[0] < top.shape[0]:
+        pad = np.full((1, packed.shape[1]), pack_color(bg, colorMode), dtype=np.uint32)
+        bottom = np.concatenate((bottom, pad))
+    return top, bottom
+
+def encode_cells(top: np.ndarray, bottom: np.ndarray, origin: Optional[Vector2] = None,
+                 changed: Optional[np.ndarray] = None, colorCache: Optional[bool] = None, repeat: bool = False,
+                 optimizeGlyphs: bool = False, optimizeMoves: bool = True) -> bytes:
+    """Encode packed cell colors into an ANSI escape stream.
+
+    Cells are grouped into runs of equal (fg, bg) colors with array operations. The escape
+    sequences are joined from precomputed byte fragments, and the cursor moves, color changes
+    and glyph runs are interleaved as a token array, so no Python code runs per cell.
+    Runs of cells with equal halves are drawn as spaces on their background color, which
+    needs no foreground color and a single byte per cell. With optimizeGlyphs a pass over the
+    runs picks between the upper and lower half blocks (swapping fg and bg), spaces and full
+    blocks to keep reusing the colors the terminal is already set to.
+
+    Args:
+        top (np.ndarray): packed foreground (top pixel) colors of shape (rows, cols).
+        bottom (np.ndarray): packed background (bottom pixel) colors of shape (rows, cols).
+        origin (Vector2, optional): terminal cell of the top left corner (0 based). Defaults to (0, 0).
+        changed (np.ndarray, optional): boolean mask of the cells to emit, the cursor jumps over
+            the others. Defaults to None (every cell).
+        colorCache (bool, optional): build the SGR sequence of each distinct color of the frame once
+            and reuse it for every run of that color, which only pays off when the colors repeat.
+            Defaults to None (picked per frame from a sample of the runs' colors).
+        repeat (bool, optional): compress long runs with the REP sequence (CSI n b), only for terminals
+            supporting it. Defaults to False.
+        optimizeGlyphs (bool, optional): choose the glyph of every run to minimize the SGR changes. Defaults to False.
+        optimizeMoves (bool, optional): move the cursor between runs with the shortest of CUP, CUF and CR / LF
+            (see cursor_move), and rewrite short gaps of unchanged cells when that's shorter than moving past
+            them. Otherwise every jump is an absolute CUP. Defaults to True.
+
+    Returns:
+        bytes: the encoded escape stream ending with an SGR reset, or b"" if no cell is emitted.
+    """
+    return _encode_runs(top, bottom, origin, changed, colorCache, repeat, optimizeGlyphs, optimizeMoves)[0]
+
+def _encode_runs(top: np.ndarray, bottom: np.ndarray, origin: Optional[Vector2], changed: Optional[np.ndarray],
+                 colorCache: Optional[bool], repeat: bool, optimizeGlyphs: bool = False, optimizeMoves: bool = True) -> Tuple[bytes, int]:
+    # encode_cells, also returning the bytes saved by the run compression and glyph choice
+    rows, cols = top.shape
+    if rows == 0 or cols == 0:
+        return b"", 0
+    if changed is None:
+        changed = np.ones((rows, cols), dtype=bool)
+    elif not changed.any():
+        return b"", 0
+    elif optimizeMoves:
+        changed = _fill_gaps(top, bottom, changed)
+    originX = int(origin.x) if origin is not None else 0
+    originY = int(origin.y) if origin is not None else 0
+
+    colorChange = (top[:, 1:] != top[:, :-1]) | (bottom[:, 1:] != bottom[:, :-1])
+    # the cursor has to be moved wherever a run doesn't directly follow an emitted cell
+    jump = changed.copy()
+    jump[:, 1:] &= ~changed[:, :-1]
+    # a run starts after a jump or wherever the fg or bg color changes
+    runStart = jump.copy()
+    runStart[:, 1:] |= changed[:, 1:] & colorChange
+    runEnd = changed.copy()
+    runEnd[:, :-1] &= ~changed[:, 1:] | colorChange
+    runRows, runCols = np.nonzero(runStart)
+    lengths = np.nonzero(runEnd)[1] - runCols + 1
+
+    runs = len(runCols)
+    fgColors = top[runRows, runCols]
+    bgColors = bottom[runRows, runCols]
+    if optimizeGlyphs:
+        glyphs = _choose_glyphs(fgColors, bgColors, lengths, repeat)
+    else:
+        glyphs = np.where(fgColors == bgColors, _SPACE, _UPPER)
+    # the colors the terminal is set to for every run, swapped for lower half blocks
+    lower = glyphs == _LOWER
+    fgSet = np.where(lower, bgColors, fgColors)
+    bgSet = np.where(lower, fgColors, bgColors)
+    # the SGR state carries over cursor moves, so a color is only set when it differs from the
+    # previous run that needed one, spaces don't need a foreground color and full blocks no background
+    fgRuns = np.nonzero(glyphs != _SPACE)[0]
+    fgRuns = fgRuns[_changes(fgSet[fgRuns])]
+    bgRuns = np.nonzero(glyphs != _FULL)[0]
+    bgRuns = bgRuns[_changes(bgSet[bgRuns])]
+
+    # one row of tokens per run: cursor move, fg SGR, bg SGR, glyphs
+    tokens = np.empty((runs, 4), dtype=object)
+    tokens.fill(b"")
+    jumpRuns = np.nonzero(jump[runRows, runCols])[0]
+    if optimizeMoves:
+        # the first run starts from an unknown cursor, the others from the end of the run before them
+        previous = np.maximum(jumpRuns - 1, 0)
+        ends = runCols[previous] + lengths[previous]
+        moves = [cursor_move(originY + fromRow, originX + fromCol, originY + row, originX + col, fromCol == cols)
+                 if run > 0 else cursor_position(originY + row, originX + col)
+                 for run, fromRow, fromCol, row, col in zip(jumpRuns.tolist(), runRows[previous].tolist(), ends.tolist(),
+                                                            runRows[jumpRuns].tolist(), runCols[jumpRuns].tolist())]
+    else:
+        moves = [cursor_position(originY + row, originX + col) for row, col in
+                 zip(runRows[jumpRuns].tolist(), runCols[jumpRuns].tolist())]
+    tokens[jumpRuns, 0] = _object_array(moves)
+    tokens[fgRuns, 1] = _color_sequences(fgSet[fgRuns], False, colorCache)
+    tokens[bgRuns, 2] = _color_sequences(bgSet[bgRuns], True, colorCache)
+    glyphRuns = _glyph_runs(lengths, glyphs, repeat)
+    tokens[:, 3] = glyphRuns
+
+    # compared to upper half blocks for every cell, with the colors set on every run change
+    sgrBytes = (int(_sgr_lengths(fgColors[_changes(fgColors)]).sum()) + int(_sgr_lengths(bgColors[_changes(bgColors)]).sum())
+                - int(_sgr_lengths(fgSet[fgRuns]).sum()) - int(_sgr_lengths(bgSet[bgRuns]).sum()))
+    glyphBytes = len(UPPER_HALF_BLOCK_BYTES) * int(lengths.sum()) - sum(map(len, glyphRuns.tolist()))
+    return b"".join(tokens.ravel().tolist()) + RESET_SGR_BYTES, sgrBytes + glyphBytes
+
+def encode_frame(frame: np.ndarray, bg: Color, origin: Optional[Vector2] = None, repeat: bool = False,
+                 colorMode: _ColorMode = "truecolor") -> bytes:
+    """Encode an (H, W, 3) uint8 RGB frame into an ANSI escape stream using half block cells"""
+    top, bottom = pack_cells(frame, bg, colorMode)
+    return encode_cells(top, bottom, origin, repeat=repeat)
+
+class FrameEncoder:
+    """Encode consecutive frames, emitting only the cells that changed since the previous frame.
+
+    The packed cells of the last encoded frame are kept so the changed-cell mask can be
+    computed with NumPy, unchanged cells are skipped with cursor positioning escapes.
+    With a threshold the encoder is lossy: cells whose colors moved less than the threshold
+    from what the terminal shows are left alone. The kept cells stay in the displayed state
+    the next frame is compared to, so small changes add up until they are repainted.
+    changedCells, bytesSaved and displayError (the distance between the displayed cells and
+    the frame, summed over the cells) hold the counters of the last encoded frame.
+    """
+    def __init__(self, bg: Color, repeat: bool = False, colorMode: _ColorMode = "truecolor", dither: _DitherMode = "none",
+                 threshold: float = 0.0, optimizeGlyphs: bool = False, optimizeMoves: bool = True,
+                 colorCache: Optional[bool] = None):
+        """
+        Args:
+            bg (Color): color used for the bottom half of the last cell row when the frame height is odd.
+            repeat (bool, optional): compress long runs with the REP sequence. Defaults to False.
+            colorMode (_ColorMode, optional): "truecolor", or "256" / "16" to quantize frames to a palette. Defaults to "truecolor".
+            dither (_DitherMode, optional): "bayer" or "diffusion" dithering for the palette modes. Defaults to "none".
+            threshold (float, optional): perceptual distance (see color_distance) a cell has to move from the displayed
+                colors to be repainted, 0 repaints every change. Defaults to 0.
+            colorCache (bool, optional): build the SGR sequence of each distinct color once per frame, see
+                encode_cells. Defaults to None (picked per frame).
+        """
+        self.__bg__ = bg
+        self.repeat = repeat
+        self.colorMode = colorMode
+        self.dither = dither
+        self.threshold = threshold
+        self.optimizeGlyphs = optimizeGlyphs
+        self.optimizeMoves = optimizeMoves
+        self.colorCache = colorCache
+        self.__prevTop__: Optional[np.ndarray] = None
+        self.__prevBottom__: Optional[np.ndarray] = None
+        self.changedCells = 0
+        self.bytesSaved = 0
+        self.displayError = 0.0
+
+    def reset(self):
+        """Forget the previous frame so the next one is fully repainted (e.g. after the screen was cleared)"""
+        self.__prevTop__ = None
+        self.__prevBottom__ = None
+
+    def displayed(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """The packed (top, bottom) cells the terminal shows, None before the first frame"""
+        if self.__prevTop__ is None:
+            return None
+        return self.__prevTop__, self.__prevBottom__
+
+    def assume(self, top: Optional[np.ndarray], bottom: Optional[np.ndarray]):
+        """Replace the cells the next frame is compared to, e.g. after the screen content was scrolled"""
+        self.__prevTop__ = top
+        self.__prevBottom__ = bottom
+
+    def shift(self, dx: int, dy: int):
+        """Follow a scroll of the terminal by dx columns and dy lines, the exposed cells are repainted by the next frame"""
+        if self.__prevTop__ is not None:
+            self.assume(shift_cells(self.__prevTop__, dx, dy), shift_cells(self.__prevBottom__, dx, dy))
+
+    def encode(self, frame: np.ndarray, origin: Optional[Vector2] = None, lines: Optional[np.ndarray] = None) -> bytes:
+        """Encode the cells of an (H, W, 3) uint8 frame that differ from the previously encoded frame
+
+        Args:
+            frame (np.ndarray): (H, W, 3) uint8 frame.
+            origin (Vector2, optional): terminal cell of the frame's top left corner (0 based). Defaults to (0, 0).
+            lines (np.ndarray, optional): boolean mask of the terminal lines that changed since the previous frame
+                (see fingerprint.changed_lines), only the span between the first and last changed line is packed
+                and compared. Defaults to None (compare every line).
+        """
+        self.displayError = 0.0
+        packed = self.__pack__(frame, origin, lines)
+        if packed is None:
+            self.changedCells = self.bytesSaved = 0
+            return b""
+        top, bottom, prevTop, prevBottom, origin, span = packed
+        changed = None
+        if prevTop is not None:
+            changed = (top != prevTop) | (bottom != prevBottom)
+            if self.threshold > 0:
+                self.__drop_small_changes__(top, bottom, prevTop, prevBottom, changed)
+            self.changedCells = int(np.count_nonzero(changed))
+        else:
+            self.changedCells = top.size
+        self.__store__(top, bottom, prevTop, prevBottom, span)
+        output, self.bytesSaved = _encode_runs(top, bottom, origin, changed, self.colorCache, self.repeat, self.optimizeGlyphs, self.optimizeMoves)
+        return output
+
+    def sync(self, frame: np.ndarray, origin: Optional[Vector2] = None, lines: Optional[np.ndarray] = None):
+        """Take a frame as displayed without encoding it, when its bytes reached the terminal some other way
+        (e.g. replayed from a cache of encoded frames). The arguments are the ones of encode."""
+        packed = self.__pack__(frame, origin, lines)
+        if packed is not None:
+            top, bottom, prevTop, prevBottom, _, span = packed
+            self.__store__(top, bottom, prevTop, prevBottom, span)
+
+    def __pack__(self, frame: np.ndarray, origin: Optional[Vector2], lines: Optional[np.ndarray]) -> Optional[Tuple]:
+        # packs the span of changed lines when lines allows it, the whole frame otherwise, returns
+        # (top, bottom, prevTop, prevBottom, origin, span) with the displayed cells to compare to, None if no line changed
+        rowOffset = 2 * int(origin.y) if origin is not None else 0
+        cellShape = ((frame.shape[0] + 1) // 2, frame.shape[1])
+        known = self.__prevTop__ is not None and self.__prevTop__.shape == cellShape
+        # diffused errors flow down from the lines above, so that mode always packs whole frames
+        if known and lines is not None and len(lines) == cellShape[0] and self.dither != "diffusion":
+            changedLines = np.flatnonzero(lines)
+            if len(changedLines) == 0:
+                return None
+            first, last = int(changedLines[0]), int(changedLines[-1]) + 1
+            top, bottom = pack_cells(frame[2 * first:2 * last], self.__bg__, self.colorMode, self.dither, rowOffset + 2 * first)
+            origin = Vector2(int(origin.x) if origin is not None else 0, rowOffset // 2 + first)
+            return top, bottom, self.__prevTop__[first:last], self.__prevBottom__[first:last], origin, True
+        top, bottom = pack_cells(frame, self.__bg__, self.colorMode, self.dither, rowOffset)
+        if not known:
+            return top, bottom, None, None, origin, False
+        return top, bottom, self.__prevTop__, self.__prevBottom__, origin, False
+
+    def __store__(self, top: np.ndarray, bottom: np.ndarray, prevTop: Optional[np.ndarray], prevBottom: Optional[np.ndarray], span: bool):
+        # a span is written into the displayed cells (prevTop / prevBottom are views of them), whole frames replace them
+        if span:
+            prevTop[...], prevBottom[...] = top, bottom
+        else:
+            self.__prevTop__, self.__prevBottom__ = top, bottom
+
+    def __drop_small_changes__(self, top: np.ndarray, bottom: np.ndarray, prevTop: np.ndarray, prevBottom: np.ndarray,
+                               changed: np.ndarray):
+        # cells that stay below the threshold are unmarked and keep their displayed colors,
+        # cells of unknown content (exposed by a scroll) are always repainted
+        rows, cols = np.nonzero(changed & (prevTop != UNKNOWN_CELL))
+        prevTopCells = prevTop[rows, cols]
+        prevBottomCells = prevBottom[rows, cols]
+        distance = np.maximum(color_distance(top[rows, cols], prevTopCells, self.colorMode),
+                              color_distance(bottom[rows, cols], prevBottomCells, self.colorMode))
+        kept = distance <= self.threshold
+        changed[rows[kept], cols[kept]] = False
+        top[rows[kept], cols[kept]] = prevTopCells[kept]
+        bottom[rows[kept], cols[kept]] = prevBottomCells[kept]
+        self.displayError = float(distance[kept].sum())
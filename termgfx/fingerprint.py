@@ -0,0 +1,29 @@
+import numpy as np
+from typing import Optional
+
+def line_hashes(frame: np.ndarray) -> np.ndarray:
+    """Hash the pixels of every terminal line (pair of pixel rows) of an (H, W, 3) uint8 frame.
+
+    Returns:
+        np.ndarray: int64 hash per terminal line, (H + 1) // 2 of them.
+    """
+    height = frame.shape[0]
+    return np.fromiter((hash(frame[y:y + 2].tobytes()) for y in range(0, height, 2)), dtype=np.int64,
+                       count=(height + 1) // 2)
+
+def frame_fingerprint(frame: np.ndarray, lineHashes: Optional[np.ndarray] = None) -> int:
+    """Fingerprint of a frame's content, frames of different shapes never match
+
+    Args:
+        frame (np.ndarray): (H, W, 3) uint8 frame.
+        lineHashes (np.ndarray, optional): the frame's line_hashes, computed when not given. Defaults to None.
+    """
+    if lineHashes is None:
+        lineHashes = line_hashes(frame)
+    return hash((frame.shape, lineHashes.tobytes()))
+
+def changed_lines(previous: Optional[np.ndarray], current: np.ndarray) -> Optional[np.ndarray]:
+    """Boolean mask of the terminal lines whose hashes differ, None when the frames can't be compared"""
+    if previous is None or previous.shape != current.shape:
+        return None
+    return previous != current
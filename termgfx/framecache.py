@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+class EncodedFrameCache:
+    """LRU cache of encoded frames within a byte budget.
+
+    An encoded frame only turns one screen into another, so entries are keyed by the
+    fingerprints of both: the frame the terminal shows and the frame to show. Scenes that
+    cycle through a fixed set of states (idle animations, blinking cursors, spinners) replay
+    the cached bytes instead of encoding the same transition again.
+    """
+    def __init__(self, maxBytes: int = 4 * 1024 * 1024):
+        """
+        Args:
+            maxBytes (int, optional): budget for the cached byte streams, least recently used ones are evicted past it.
+                Defaults to 4 MiB.
+        """
+        self.maxBytes = maxBytes
+        self.__entries__: OrderedDict = OrderedDict()
+        self.__bytes__ = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, dict]]:
+        """The (output, stats) cached for a key, None (counted as a miss) if there is none"""
+        entry = self.__entries__.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.__entries__.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, output: bytes, stats: Optional[dict] = None):
+        """Cache the output (and its encoder stats) for a key, outputs larger than the budget are not kept"""
+        if len(output) > self.maxBytes:
+            return
+        previous = self.__entries__.pop(key, None)
+        if previous is not None:
+            self.__bytes__ -= len(previous[0])
+        self.__entries__[key] = (output, dict(stats or {}))
+        self.__bytes__ += len(output)
+        while self.__bytes__ > self.maxBytes:
+            _, (evicted, _) = self.__entries__.popitem(last=False)
+            self.__bytes__ -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry, the hit and miss counters are kept"""
+        self.__entries__.clear()
+        self.__bytes__ = 0
+
+    @property
+    def hitRate(self) -> float:
+        """Fraction of lookups that hit, 0 before the first one"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def stats(self) -> dict:
+        """hits, misses, hitRate, evictions, entries and bytes (the size of the cached outputs)"""
+        return {"hits": self.hits, "misses": self.misses, "hitRate": self.hitRate, "evictions": self.evictions,
+                "entries": len(self.__entries__), "bytes": self.__bytes__}
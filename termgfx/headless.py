@@ -0,0 +1,106 @@
+import io
+import time
+import types
+from typing import BinaryIO, Optional
+from .textures import *
+from .vectors import *
+from .output import FrameWriter
+from .scheduler import FrameScheduler
+from .renderer import ConsoleRenderer, _accepts_delta_time
+
+_STAGES = ("tick", "sample", "encode", "write")
+
+class HeadlessRenderer(ConsoleRenderer):
+    """ConsoleRenderer without a terminal, for benchmarks and regression tests (e.g. in CI containers).
+
+    Frames go through the same tick -> sample -> encode -> write pipeline, but the screen has
+    a fixed virtual resolution and the output lands in an in-memory sink (or any binary stream).
+    run() renders a given number of frames and reports the bytes and the time spent in every
+    stage (from stats). sys.stdout and the terminal size are never touched.
+    """
+    def __init__(self, tick: Optional[types.FunctionType] = None, resolution: Vector2 = Vector2(120, 80),
+                 sink: Optional[BinaryIO] = None, syncOutput: bool = False, repeatSequence: bool = False, **options):
+        """
+        Args:
+            tick (types.FunctionType, optional): the frame callback, as for ConsoleRenderer. Defaults to None.
+            resolution (Vector2, optional): virtual screen resolution in pixels (width, height). Defaults to (120, 80).
+            sink (BinaryIO, optional): binary stream the frames are written to. Defaults to an io.BytesIO (see output).
+            syncOutput (bool, optional): wrap frames in synchronized update sequences. Defaults to False.
+            repeatSequence (bool, optional): compress long runs with REP. Defaults to False.
+            options: the other ConsoleRenderer options (bg, threadCount, encodeStrategy, colorMode, ...).
+        """
+        super().__init__(tick, syncOutput=syncOutput, repeatSequence=repeatSequence, **options)
+        self.resolution = Vector2(int(resolution.x), int(resolution.y))
+        self.sink = sink if sink is not None else io.BytesIO()
+        self.__writer__ = FrameWriter(self.sink, synchronized=syncOutput)
+
+    @property
+    def screenResolution(self) -> Vector2:
+        """The fixed virtual resolution in pixels (width, height)"""
+        return self.resolution
+
+    @property
+    def output(self) -> bytes:
+        """Everything written to the default in-memory sink"""
+        return self.sink.getvalue()
+
+    def run(self, frames: int, fps: int = 60, paced: bool = False) -> dict:
+        """Render frames through the pipeline and report what it cost
+
+        Args:
+            frames (int): number of frames to tick, fewer if the tick calls stop().
+            fps (int, optional): frame rate, ticks get a delta time of 1 / fps unless paced. Defaults to 60.
+            paced (bool, optional): pace the frames on the clock like ConsoleRenderer.run, instead of
+                rendering as fast as the pipeline goes with a fixed delta time. Defaults to False.
+
+        Returns:
+            dict: frames (ticked), writtenFrames, skippedFrames, cachedFrames, bytes, bytesPerFrame (of the written
+                frames), seconds and fps (wall clock of the whole run), and stages: the total seconds, mean and p95
+                milliseconds per written frame of the tick, sample, encode and write stages (from stats).
+        """
+        size = self.screenResolution
+        self.__running__ = True
+        self.__stats__.reset()
+        self.__tickTakesDelta__ = _accepts_delta_time(self.onTick)
+        self.__scheduler__ = FrameScheduler(fps) if paced else None
+        ticked = 0
+        start = time.perf_counter()
+        self.__startThreads__(size)
+        if paced:
+            self.__scheduler__.start()
+        try:
+            while self.__running__ and ticked < frames:
+                deltaTime = self.__scheduler__.begin_frame() if paced else 1 / fps
+                tickStart = time.perf_counter()
+                self.__stats__.record_start(tickStart)
+                out = self.__call_tick__(size, deltaTime)
+                tickEnd = time.perf_counter()
+                if self.tracer is not None:
+                    self.tracer.span("tick", tickStart, tickEnd)
+                self.__submit_frame__(out, tickEnd - tickStart)
+                ticked += 1
+                if paced:
+                    waitStart = time.perf_counter()
+                    self.__scheduler__.wait()
+                    if self.tracer is not None:
+                        self.tracer.span("wait", waitStart, time.perf_counter())
+                    self.__stats__.droppedFrames = self.__scheduler__.skippedFrames
+        finally:
+            try:
+                self.__stopThreads__()
+            finally:
+                if self.__bandEncoder__ is not None:
+                    self.__bandEncoder__.close()
+                    self.__bandEncoder__ = None
+        seconds = time.perf_counter() - start
+        return self.__report__(ticked, seconds)
+
+    def __report__(self, ticked: int, seconds: float) -> dict:
+        stats = self.__stats__
+        written = stats.frames
+        stages = {name: {"seconds": stats.totals[f"{name}Time"], "meanMs": stats.mean(f"{name}Time") * 1000,
+                         "p95Ms": stats.percentiles(f"{name}Time")["p95"] * 1000} for name in _STAGES}
+        total = int(stats.totals["bytesWritten"])
+        return {"frames": ticked, "writtenFrames": written, "skippedFrames": stats.skippedFrames,
+                "cachedFrames": stats.cachedFrames, "bytes": total, "bytesPerFrame": total / written if written else 0.0,
+                "seconds": seconds, "fps": ticked / seconds if seconds > 0 else 0.0, "stages": stages}
@@ -0,0 +1,116 @@
+import time
+import numpy as np
+from typing import Literal, Optional
+from .colors import *
+from .stats import RenderStats
+
+# 3x5 pixel glyphs, one string of 3 bits per row
+_FONT = {
+    "0": ("111", "101", "101", "101", "111"), "1": ("010", "110", "010", "010", "111"),
+    "2": ("111", "001", "111", "100", "111"), "3": ("111", "001", "111", "001", "111"),
+    "4": ("101", "101", "111", "001", "001"), "5": ("111", "100", "111", "001", "111"),
+    "6": ("111", "100", "111", "101", "111"), "7": ("111", "001", "001", "001", "001"),
+    "8": ("111", "101", "111", "101", "111"), "9": ("111", "101", "111", "001", "111"),
+    ".": ("000", "000", "000", "000", "010"), "%": ("101", "001", "010", "100", "101"),
+    "K": ("101", "101", "110", "101", "101"), "M": ("101", "111", "111", "101", "101"),
+    "B": ("110", "101", "110", "101", "110"), "F": ("111", "100", "110", "100", "100"),
+    "P": ("110", "101", "110", "100", "100"), "S": ("011", "100", "010", "001", "110"),
+    " ": ("000", "000", "000", "000", "000"),
+}
+_GLYPHS = {char: np.array([[bit == "1" for bit in row] for row in rows]) for char, rows in _FONT.items()}
+
+_CHARS = 9  # widest line, "1.2M 100%"
+_WIDTH = 2 + _CHARS * 4 - 1
+_SPARK_HEIGHT = 6
+# padding, text, gap, sparkline, gap, text, padding: 20 pixel rows, whole terminal lines
+_HEIGHT = 1 + 5 + 1 + _SPARK_HEIGHT + 1 + 5 + 1
+# frame times drawn at full sparkline height, and the limits of the green and yellow bars
+_SPARK_SCALE = 0.05
+_SPARK_LIMITS = (1 / 60 + 0.001, 1 / 30 + 0.001)
+_SPARK_COLORS = np.array([(80, 220, 100), (230, 200, 60), (235, 70, 60)], dtype=np.uint8)
+
+def _format_bytes(count: float) -> str:
+    if count < 1000:
+        return f"{count:.0f}B"
+    if count < 10000:
+        return f"{count / 1000:.1f}K"
+    if count < 1000000:
+        return f"{count / 1000:.0f}K"
+    return f"{count / 1000000:.1f}M"
+
+class PerfHud:
+    """Small performance overlay composited into a corner of the frames.
+
+    Shows the fps, a sparkline of the recent frame times (green within 60 fps, yellow within
+    30 fps, red above), and the bytes written and share of the cells changed per frame. The
+    overlay is rendered into a small patch every interval seconds and copied into each frame
+    in between, so it costs a slice assignment per frame. It only changes on refreshes and
+    covers a few terminal lines, the line damage tracking repaints just its changed cells then
+    and unchanged frames are still skipped.
+    """
+    def __init__(self, corner: Literal["top-left", "top-right", "bottom-left", "bottom-right"] = "top-right",
+                 interval: float = 0.25, fg: Color = RGB_WHITE, bg: Color = RGB_BLACK):
+        """
+        Args:
+            corner (Literal["top-left", "top-right", "bottom-left", "bottom-right"], optional): corner of the frame the
+                overlay is drawn in. Defaults to "top-right".
+            interval (float, optional): seconds between refreshes of the overlay's content. Defaults to 0.25.
+            fg (Color, optional): text color. Defaults to RGB_WHITE.
+            bg (Color, optional): background color of the overlay. Defaults to RGB_BLACK.
+        """
+        self.corner = corner
+        self.interval = interval
+        self.__fg__ = np.array([fg.r, fg.g, fg.b], dtype=np.uint8)
+        self.__bg__ = np.array([bg.r, bg.g, bg.b], dtype=np.uint8)
+        self.__patch__: Optional[np.ndarray] = None
+        self.__refreshed__ = 0.0
+
+    @property
+    def size(self) -> tuple:
+        """(width, height) of the overlay in pixels"""
+        return _WIDTH, _HEIGHT
+
+    def draw(self, frame: np.ndarray, stats: RenderStats):
+        """Composite the overlay into a (H, W, 3) uint8 frame, refreshing its content from stats when due
+
+        Args:
+            frame (np.ndarray): the frame to draw into, the overlay is cropped to it.
+            stats (RenderStats): the renderer's stats.
+        """
+        height, width = frame.shape[:2]
+        now = time.perf_counter()
+        if self.__patch__ is None or now - self.__refreshed__ >= self.interval:
+            self.__patch__ = self.__render__(stats, max(1, ((height + 1) // 2) * width))
+            self.__refreshed__ = now
+        h, w = min(_HEIGHT, height), min(_WIDTH, width)
+        y = 0 if self.corner.startswith("top") else height - h
+        # keep the overlay on whole terminal lines at the bottom of odd height frames
+        y -= y % 2
+        x = 0 if self.corner.endswith("left") else width - w
+        frame[y:y + h, x:x + w] = self.__patch__[:h, :w]
+
+    def __render__(self, stats: RenderStats, cells: int) -> np.ndarray:
+        patch = np.empty((_HEIGHT, _WIDTH, 3), dtype=np.uint8)
+        patch[:, :] = self.__bg__
+        recent = slice(-(_WIDTH - 2), None)
+        self.__text__(patch, 1, f"{stats.fps:.0f} FPS")
+        frameTimes = stats.values("frameTime")[recent]
+        if len(frameTimes):
+            bars = np.minimum(np.ceil(frameTimes / _SPARK_SCALE * _SPARK_HEIGHT), _SPARK_HEIGHT).astype(np.int64)
+            rows = np.arange(_SPARK_HEIGHT)[:, None]
+            mask = rows >= _SPARK_HEIGHT - bars[None, :]
+            colors = _SPARK_COLORS[np.searchsorted(_SPARK_LIMITS, frameTimes)]
+            spark = patch[7:7 + _SPARK_HEIGHT, _WIDTH - 1 - len(frameTimes):_WIDTH - 1]
+            spark[mask] = np.broadcast_to(colors[None, :, :], spark.shape)[mask]
+        written = stats.values("bytesWritten")[recent]
+        changed = stats.values("changedCells")[recent]
+        if len(written):
+            self.__text__(patch, 8 + _SPARK_HEIGHT, f"{_format_bytes(written.mean())} {min(100.0, changed.mean() / cells * 100):.0f}%")
+        return patch
+
+    def __text__(self, patch: np.ndarray, y: int, text: str):
+        x = 1
+        for char in text[:_CHARS]:
+            glyph = _GLYPHS.get(char, _GLYPHS[" "])
+            patch[y:y + 5, x:x + 3][glyph] = self.__fg__
+            x += 4
@@ -0,0 +1,149 @@
+import io
+import os
+import select
+import sys
+import time
+from typing import BinaryIO, Mapping, Optional, TextIO, Union
+
+# DEC private mode 2026: the terminal holds off repainting until the end sequence
+SYNC_BEGIN = b"\033[?2026h"
+SYNC_END = b"\033[?2026l"
+
+# TERM / TERM_PROGRAM values of terminals known to support synchronized output
+_SYNC_TERMS = ("kitty", "foot", "wezterm", "contour", "alacritty", "ghostty", "rio")
+_SYNC_TERM_PROGRAMS = ("wezterm", "iterm.app", "ghostty", "contour", "rio", "tabby")
+
+def supports_synchronized_output(environ: Optional[Mapping[str, str]] = None) -> bool:
+    """Guess from the environment if the terminal supports synchronized output (mode 2026)
+
+    Args:
+        environ (Mapping[str, str], optional): environment variables. Defaults to os.environ.
+    """
+    environ = os.environ if environ is None else environ
+    if environ.get("KITTY_WINDOW_ID") or environ.get("WEZTERM_EXECUTABLE") or environ.get("WT_SESSION"):
+        return True
+    term = environ.get("TERM", "").lower()
+    termProgram = environ.get("TERM_PROGRAM", "").lower()
+    return any(name in term for name in _SYNC_TERMS) or termProgram in _SYNC_TERM_PROGRAMS
+
+def supports_repeat(environ: Optional[Mapping[str, str]] = None) -> bool:
+    """Guess from the environment if the terminal supports the REP sequence (CSI n b)
+
+    Args:
+        environ (Mapping[str, str], optional): environment variables. Defaults to os.environ.
+    """
+    environ = os.environ if environ is None else environ
+    # XTERM_VERSION is only set by xterm itself, not by the many terminals claiming TERM=xterm
+    if environ.get("XTERM_VERSION") or environ.get("KITTY_WINDOW_ID") or environ.get("WEZTERM_EXECUTABLE") or environ.get("WT_SESSION"):
+        return True
+    term = environ.get("TERM", "").lower()
+    return any(name in term for name in ("kitty", "foot", "wezterm", "ghostty"))
+
+class FrameWriter:
+    """Single writer that pushes whole frames to the terminal's raw file descriptor.
+
+    Every frame is assembled into one preallocated bytearray and written with os.write,
+    bypassing the text layer of sys.stdout, so a frame normally costs a single write syscall.
+    Partial writes and EAGAIN (non-blocking terminals) are retried until the frame is out.
+    On a Windows console the frame goes through the buffer of sys.stdout instead (still one
+    write), os.write would skip the console layer that decodes UTF-8 and garble the glyphs.
+    With synchronized output every frame is wrapped in begin/end synchronized update
+    sequences, so the terminal renders it once instead of repainting while it arrives.
+    """
+    def __init__(self, stream: Optional[Union[TextIO, BinaryIO]] = None, capacity: int = 1 << 20, synchronized: Optional[bool] = None):
+        """
+        Args:
+            stream (TextIO | BinaryIO, optional): the terminal stream, or a binary stream frames are written to. Defaults to sys.stdout.
+            capacity (int, optional): initial size of the frame buffer in bytes, it grows when a frame doesn't fit. Defaults to 1 MiB.
+            synchronized (bool, optional): wrap frames in synchronized update sequences (DEC mode 2026). Defaults to None (detect from the environment).
+        """
+        self.synchronized = supports_synchronized_output() if synchronized is None else synchronized
+        self.__stream__ = stream if stream is not None else sys.stdout
+        try:
+            self.__fd__ = self.__stream__.fileno()
+        except (AttributeError, io.UnsupportedOperation, ValueError):
+            # e.g. a replaced sys.stdout in an IDE, fall back to the stream itself
+            self.__fd__ = None
+        if self.__fd__ is not None and sys.platform.startswith('win') and os.isatty(self.__fd__):
+            # the console would decode raw UTF-8 bytes in its OEM code page
+            self.__fd__ = None
+        self.__buffer__ = bytearray(capacity)
+        self.__view__ = memoryview(self.__buffer__)
+        self.__length__ = 0
+        self.__frameStart__ = 0
+
+    def begin(self):
+        """Start assembling a new frame, dropping anything that wasn't flushed"""
+        self.__length__ = 0
+        if self.synchronized:
+            self.append(SYNC_BEGIN)
+        self.__frameStart__ = self.__length__
+
+    def append(self, data: bytes):
+        """Append encoded bytes to the frame being assembled"""
+        end = self.__length__ + len(data)
+        if end > len(self.__buffer__):
+            self.__view__.release()
+            self.__buffer__.extend(bytes(max(end, 2 * len(self.__buffer__)) - len(self.__buffer__)))
+            self.__view__ = memoryview(self.__buffer__)
+        self.__view__[self.__length__:end] = data
+        self.__length__ = end
+
+    def flush(self) -> int:
+        """Write the assembled frame and start a new one.
+
+        Returns:
+            int: the number of bytes written.
+        """
+        if self.__length__ == self.__frameStart__:
+            # nothing to show, don't bother the terminal with an empty update
+            self.__length__ = self.__frameStart__ = 0
+            return 0
+        if self.__frameStart__ > 0:
+            self.append(SYNC_END)
+        length = self.__length__
+        self.__length__ = self.__frameStart__ = 0
+        if self.__fd__ is None:
+            stream = getattr(self.__stream__, "buffer", None)
+            if stream is not None:
+                # text still waiting in the text layer goes out before the frame
+                self.__stream__.flush()
+            elif isinstance(self.__stream__, (io.RawIOBase, io.BufferedIOBase)):
+                # binary streams (e.g. an io.BytesIO sink) take the bytes as they are
+                stream = self.__stream__
+            if stream is not None:
+                stream.write(self.__view__[:length])
+            else:
+                self.__stream__.write(self.__view__[:length].tobytes().decode("utf-8"))
+            self.__stream__.flush()
+            return length
+
+        # anything still in the text layer has to reach the terminal before the frame
+        self.__stream__.flush()
+        written = 0
+        while written < length:
+            try:
+                written += os.write(self.__fd__, self.__view__[written:length])
+            except InterruptedError:
+                continue
+            except BlockingIOError:
+                # EAGAIN / EWOULDBLOCK on a non-blocking terminal
+                self.__wait_writable__()
+        return length
+
+    def write(self, data: bytes) -> int:
+        """Write data as a frame of its own"""
+        self.begin()
+        self.append(data)
+        return self.flush()
+
+    def __wait_writable__(self):
+        if sys.platform.startswith('win'):
+            time.sleep(0.001)
+        else:
+            select.select([], [self.__fd__], [], 0.1)
+
+    @property
+    def fd(self) -> Optional[int]:
+        """The raw file descriptor frames are written to, None when writing through the stream"""
+        return self.__fd__
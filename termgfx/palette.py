@@ -0,0 +1,132 @@
+import numpy as np
+from functools import lru_cache
+from typing import Literal
+
+_ColorMode = Literal["truecolor", "256", "16"]
+_DitherMode = Literal["none", "bayer", "diffusion"]
+
+# packed palette colors carry their mode above the 24 color bits, so they never equal a packed RGB color
+PALETTE_256_FLAG = 1 << 24
+PALETTE_16_FLAG = 2 << 24
+
+# xterm's default colors for the 16 ANSI colors (SGR 30-37 and 90-97)
+ANSI_16_PALETTE = np.array([
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+], dtype=np.uint8)
+
+def _xterm_256_palette() -> np.ndarray:
+    levels = np.array([0, 95, 135, 175, 215, 255], dtype=np.uint8)
+    cube = np.stack(np.meshgrid(levels, levels, levels, indexing="ij"), axis=-1).reshape(-1, 3)
+    grays = np.repeat(np.arange(8, 248, 10, dtype=np.uint8)[:, None], 3, axis=1)
+    return np.concatenate((ANSI_16_PALETTE, cube, grays))
+
+XTERM_256_PALETTE = _xterm_256_palette()
+
+# (palette, first usable index) per mode, the 16 system colors of the 256 color mode
+# depend on the terminal's theme so the 256 color mode only quantizes to the cube and grays
+_PALETTES = {
+    "256": (XTERM_256_PALETTE, 16),
+    "16": (ANSI_16_PALETTE, 0),
+}
+
+def palette_flag(mode: _ColorMode) -> int:
+    """Flag packed above the palette index of a mode, 0 for truecolor"""
+    return {"truecolor": 0, "256": PALETTE_256_FLAG, "16": PALETTE_16_FLAG}[mode]
+
+def palette_colors(mode: _ColorMode) -> np.ndarray:
+    """(N, 3) uint8 RGB colors of a palette mode"""
+    return _PALETTES[mode][0]
+
+def nearest_palette_index(colors: np.ndarray, mode: _ColorMode) -> np.ndarray:
+    """Index of the closest palette color of every (..., 3) RGB color, with an exact (weighted) distance search"""
+    palette, first = _PALETTES[mode]
+    candidates = palette[first:].astype(np.float32)
+    # squared channel weights of a cheap perceptual distance, the eye is most sensitive to green
+    weights = np.array([2.0, 4.0, 3.0], dtype=np.float32)
+    flat = colors.reshape(-1, 3).astype(np.float32)
+    # |c - p|^2 expanded, the |c|^2 term is the same for every candidate and drops out of the argmin
+    distances = ((candidates ** 2) * weights).sum(axis=1) - 2 * flat @ (candidates * weights).T
+    return (distances.argmin(axis=1) + first).astype(np.uint8).reshape(colors.shape[:-1])
+
+@lru_cache(maxsize=None)
+def palette_lut(mode: _ColorMode, bits: int = 5) -> np.ndarray:
+    """Precomputed quantization lookup table of a palette mode.
+
+    Args:
+        mode (_ColorMode): "256" or "16".
+        bits (int, optional): top bits of every component used as the index. Defaults to 5 (a 32x32x32 cube).
+
+    Returns:
+        np.ndarray: (2**bits, 2**bits, 2**bits) uint8 palette indices, indexed by the top bits of r, g and b.
+    """
+    size = 1 << bits
+    shift = 8 - bits
+    # every cell of the cube is represented by its center color
+    centers = (np.arange(size, dtype=np.int32) << shift) + ((1 << shift) >> 1)
+    grid = np.stack(np.meshgrid(centers, centers, centers, indexing="ij"), axis=-1)
+    return nearest_palette_index(grid, mode)
+
+# the range the ordered dither spreads a pixel over, about half the distance between neighbouring palette colors:
+# the 256 color cube steps by about 40 but its gray ramp by 10, so a wider spread pushes grays and shades
+# to other colors and shows more banding than no dithering
+_DITHER_SPREAD = {"256": 16.0, "16": 128.0}
+
+@lru_cache(maxsize=None)
+def bayer_matrix(order: int = 2) -> np.ndarray:
+    """(2**order, 2**order) ordered dither thresholds in (0, 1), each one used once"""
+    matrix = np.zeros((1, 1))
+    for _ in range(order):
+        matrix = np.block([[4 * matrix, 4 * matrix + 2], [4 * matrix + 3, 4 * matrix + 1]])
+    return (matrix + 0.5) / matrix.size
+
+def _lookup(pixels: np.ndarray, lut: np.ndarray, shift: int) -> np.ndarray:
+    return lut[pixels[..., 0] >> shift, pixels[..., 1] >> shift, pixels[..., 2] >> shift]
+
+def _bayer_dither(frame: np.ndarray, mode: _ColorMode, lut: np.ndarray, shift: int, rowOffset: int) -> np.ndarray:
+    matrix = bayer_matrix()
+    size = matrix.shape[0]
+    height, width = frame.shape[:2]
+    # the pattern is anchored to the screen, so bands of a frame line up at their seams
+    thresholds = matrix[(np.arange(height) + rowOffset) % size][:, np.arange(width) % size]
+    offsets = ((thresholds - 0.5) * _DITHER_SPREAD[mode]).astype(np.float32)
+    pixels = np.clip(frame + offsets[..., None], 0, 255).astype(np.uint8)
+    return _lookup(pixels, lut, shift)
+
+def _diffusion_dither(frame: np.ndarray, mode: _ColorMode, lut: np.ndarray, shift: int) -> np.ndarray:
+    palette = palette_colors(mode).astype(np.float32)
+    height, width = frame.shape[:2]
+    indices = np.empty((height, width), dtype=np.uint8)
+    error = np.zeros((width, 3), dtype=np.float32)
+    # a whole row is quantized at once and its error is pushed to the row below
+    # (1/4 down left, 1/2 down, 1/4 down right), so the loop runs per row instead of per pixel
+    for y in range(height):
+        row = np.clip(frame[y] + error, 0, 255)
+        rowIndices = _lookup(row.astype(np.uint8), lut, shift)
+        indices[y] = rowIndices
+        residual = row - palette[rowIndices]
+        error = residual * 0.5
+        error[1:] += residual[:-1] * 0.25
+        error[:-1] += residual[1:] * 0.25
+    return indices
+
+def quantize(frame: np.ndarray, mode: _ColorMode, bits: int = 5, dither: _DitherMode = "none", rowOffset: int = 0) -> np.ndarray:
+    """Map an (H, W, 3) uint8 RGB frame to palette indices of shape (H, W) with the lookup table of the mode.
+
+    Args:
+        frame (np.ndarray): (H, W, 3) uint8 RGB frame.
+        mode (_ColorMode): "256" or "16".
+        bits (int, optional): top bits of every component indexing the lookup table. Defaults to 5.
+        dither (_DitherMode, optional): "bayer" adds a 4x4 ordered dither pattern before the lookup, "diffusion"
+            spreads the quantization error of every row over the next one. Defaults to "none".
+        rowOffset (int, optional): screen row of the first frame row, aligns the ordered dither pattern. Defaults to 0.
+    """
+    shift = 8 - bits
+    lut = palette_lut(mode, bits)
+    if dither == "bayer":
+        return _bayer_dither(frame, mode, lut, shift, rowOffset)
+    if dither == "diffusion":
+        return _diffusion_dither(frame, mode, lut, shift)
+    return _lookup(frame, lut, shift)
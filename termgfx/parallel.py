@@ -0,0 +1,403 @@
+import multiprocessing
+from multiprocessing import shared_memory
+import pickle
+import queue
+import signal
+import sys
+import threading
+import time
+import numpy as np
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+from .colors import *
+from .vectors import *
+from .encoder import FrameEncoder, shift_cells
+
+# per frame counters of the band encoders, summed over the bands
+_COUNTERS = ("changedCells", "bytesSaved", "displayError")
+
+_EncodeStrategy = Literal["auto", "threads", "processes"]
+
+# commands the band worker threads reply to on the outbox
+_REPLIES = ("state", "sync", "encode")
+
+def _reset_counters(target):
+    for name in _COUNTERS:
+        setattr(target, name, 0)
+
+def _read_counters(encoder: FrameEncoder) -> Tuple:
+    return tuple(getattr(encoder, name) for name in _COUNTERS)
+
+def _add_counters(target, counters: Tuple):
+    for name, value in zip(_COUNTERS, counters):
+        setattr(target, name, getattr(target, name) + value)
+
+def _shift_band_cells(states: List[Optional[Tuple[np.ndarray, np.ndarray]]], dx: int, dy: int) -> Optional[List]:
+    """Scroll the damage state of all bands together, so cells moving across a band seam stay known.
+    None when the state of a band is unknown."""
+    if any(state is None for state in states):
+        return None
+    tops = [top for top, _ in states if len(top)]
+    bottoms = [bottom for _, bottom in states if len(bottom)]
+    if not tops:
+        return None
+    top = shift_cells(np.concatenate(tops), dx, dy)
+    bottom = shift_cells(np.concatenate(bottoms), dx, dy)
+    bounds = np.cumsum([0] + [len(state[0]) for state in states])
+    return [(top[start:end], bottom[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+
+def _band_state(encoder: FrameEncoder, start: int, end: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    # an empty band has no cells, not an unknown state
+    if start >= end:
+        return np.empty((0, 0), dtype=np.uint32), np.empty((0, 0), dtype=np.uint32)
+    return encoder.displayed()
+
+def row_bands(height: int, count: int) -> List[Tuple[int, int]]:
+    """Split the pixel rows of a frame into horizontal bands of whole terminal cells.
+
+    Args:
+        height (int): frame height in pixels.
+        count (int): number of bands.
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) pixel rows of every band, starts are always even.
+    """
+    cellRows = (height + 1) // 2
+    bounds = [min(height, 2 * ((cellRows * i) // count)) for i in range(count + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _band_lines(lines: Optional[np.ndarray], start: int, end: int) -> Optional[np.ndarray]:
+    # the slice of the changed-lines mask covering the pixel rows start:end of a band
+    return None if lines is None else lines[start // 2:(end + 1) // 2]
+
+def gil_enabled() -> bool:
+    """Check if the GIL is enabled at runtime, always True before Python 3.13"""
+    isEnabled = getattr(sys, "_is_gil_enabled", None)
+    return True if isEnabled is None else bool(isEnabled())
+
+class ThreadBandEncoder:
+    """Encode frames in parallel on worker threads, one per horizontal row band.
+
+    Safe on free-threaded (no-GIL) builds: a worker only reads the frame it was handed,
+    never the renderer's state, and owns its damage state and output chunk. On builds
+    with the GIL only the NumPy parts of the bands overlap.
+    changedCells, bytesSaved and displayError hold the counters of the last frame, summed over the bands.
+    With a tracer (FrameTracer) set, the workers record a span for every band they encode.
+    """
+    def __init__(self, bg: Color, threadCount: int, encoderOptions: Optional[Dict[str, Any]] = None):
+        self.__bg__ = bg
+        self.__encoderOptions__ = encoderOptions or {}
+        self.tracer = None
+        _reset_counters(self)
+        self.__inboxes__: List[queue.Queue] = []
+        self.__outbox__ = queue.Queue()
+        self.__threads__: List[threading.Thread] = []
+        for index in range(max(1, threadCount)):
+            inbox = queue.Queue()
+            thread = threading.Thread(target=self.__workerThreadFunc__, args=(index, inbox), name=f"band-{index}", daemon=True)
+            self.__inboxes__.append(inbox)
+            self.__threads__.append(thread)
+            thread.start()
+        self.__shape__: Optional[Tuple[int, int, int]] = None
+        self.__bands__: List[Tuple[int, int]] = []
+
+    def __workerThreadFunc__(self, index: int, inbox: queue.Queue):
+        encoder = FrameEncoder(self.__bg__, **self.__encoderOptions__)
+        start = end = 0
+        # an error of a command without a reply (bands, assume) is reported with the next reply
+        failure: Optional[BaseException] = None
+        while True:
+            message = inbox.get()
+            if message is None:
+                return
+            try:
+                if failure is not None and message[0] in _REPLIES:
+                    raise failure
+                if message[0] == "bands":  # ("bands", start, end)
+                    _, start, end = message
+                    encoder.reset()
+                elif message[0] == "state":
+                    self.__outbox__.put((index, _band_state(encoder, start, end)))
+                elif message[0] == "assume":  # ("assume", top, bottom)
+                    if start < end:
+                        encoder.assume(message[1], message[2])
+                elif message[0] == "sync":  # ("sync", frame, lines)
+                    if start < end:
+                        encoder.sync(message[1][start:end], Vector2(0, start // 2), _band_lines(message[2], start, end))
+                    self.__outbox__.put((index, b"", (0,) * len(_COUNTERS)))
+                else:  # ("encode", frame, lines)
+                    output = b""
+                    _reset_counters(encoder)
+                    tracer = self.tracer
+                    if start < end:
+                        began = time.perf_counter() if tracer is not None else 0.0
+                        output = encoder.encode(message[1][start:end], Vector2(0, start // 2), _band_lines(message[2], start, end))
+                        if tracer is not None:
+                            tracer.span("encode band", began, time.perf_counter(), {"band": index, "changedCells": encoder.changedCells})
+                    self.__outbox__.put((index, output, _read_counters(encoder)))
+            except Exception as e:
+                # the worker keeps serving its inbox, the caller waiting on the reply re-raises the error
+                if message[0] in _REPLIES:
+                    self.__outbox__.put((index, e))
+                else:
+                    failure = e
+
+    def __collect__(self, count: int) -> List[Tuple]:
+        """Wait for the replies of count workers, raising the first error one of them hit"""
+        replies = [self.__outbox__.get() for _ in range(count)]
+        for reply in replies:
+            if isinstance(reply[1], BaseException):
+                raise reply[1]
+        return replies
+
+    def resize(self, shape: Tuple[int, int, int]):
+        """Split frames of the given (H, W, 3) shape into bands, workers repaint their whole band after it"""
+        if self.__shape__ == tuple(shape):
+            return
+        self.__shape__ = tuple(shape)
+        self.__bands__ = row_bands(shape[0], len(self.__inboxes__))
+        for inbox, (start, end) in zip(self.__inboxes__, self.__bands__):
+            inbox.put(("bands", start, end))
+
+    def shift(self, dx: int, dy: int):
+        """Follow a scroll of the terminal by dx columns and dy lines, only the exposed cells are repainted"""
+        for inbox in self.__inboxes__:
+            inbox.put(("state",))
+        states = [None] * len(self.__inboxes__)
+        for index, state in self.__collect__(len(self.__inboxes__)):
+            states[index] = state
+        # with a band state unknown the terminal content is too, every band is repainted
+        shifted = _shift_band_cells(states, dx, dy) or [(None, None)] * len(states)
+        for inbox, (top, bottom) in zip(self.__inboxes__, shifted):
+            inbox.put(("assume", top, bottom))
+
+    def encode(self, frame: np.ndarray, lines: Optional[np.ndarray] = None) -> List[bytes]:
+        """Encode the cells of a frame that changed, returns the chunks of every band in order
+
+        With lines (the mask of changed terminal lines), bands without a changed line are skipped.
+        """
+        return self.__dispatch__("encode", frame, lines)
+
+    def sync(self, frame: np.ndarray, lines: Optional[np.ndarray] = None):
+        """Take a frame as displayed without encoding it, see FrameEncoder.sync"""
+        self.__dispatch__("sync", frame, lines)
+
+    def __dispatch__(self, command: str, frame: np.ndarray, lines: Optional[np.ndarray]) -> List[bytes]:
+        if self.__shape__ != tuple(frame.shape):
+            self.resize(frame.shape)
+            lines = None
+        active = [index for index, (start, end) in enumerate(self.__bands__)
+                  if lines is None or _band_lines(lines, start, end).any()]
+        for index in active:
+            self.__inboxes__[index].put((command, frame, lines))
+        chunks = [b""] * len(self.__inboxes__)
+        _reset_counters(self)
+        for index, output, counters in self.__collect__(len(active)):
+            chunks[index] = output
+            _add_counters(self, counters)
+        return chunks
+
+    def close(self):
+        """Stop the worker threads"""
+        for inbox in self.__inboxes__:
+            inbox.put(None)
+        for thread in self.__threads__:
+            thread.join()
+        self.__inboxes__ = []
+        self.__threads__ = []
+
+def _portable_error(error: BaseException) -> BaseException:
+    # the error goes back over a pipe, one that can't be pickled is replaced by a RuntimeError naming it
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+def _band_worker(conn, bg: Color, encoderOptions: Dict[str, Any]):
+    """Worker process loop, owns the damage tracking of one row band"""
+    # Ctrl-C is handled by the parent, which stops the workers through close()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    shm = None
+    frame = None
+    encoder = FrameEncoder(bg, **encoderOptions)
+    start = end = 0
+    # an error of a command without a reply (attach, assume) is reported with the next reply
+    failure: Optional[BaseException] = None
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        command = message if isinstance(message, str) else message[0]
+        try:
+            if failure is not None and command in _REPLIES:
+                raise failure
+            if command == "sync":  # ("sync", lines)
+                if start < end:
+                    encoder.sync(frame[start:end], Vector2(0, start // 2), _band_lines(message[1], start, end))
+                conn.send_bytes(b"")
+                conn.send((0,) * len(_COUNTERS))
+            elif command == "encode":  # ("encode", lines)
+                output = b""
+                _reset_counters(encoder)
+                if start < end:
+                    # the band's first cell row is on terminal line start // 2
+                    output = encoder.encode(frame[start:end], Vector2(0, start // 2), _band_lines(message[1], start, end))
+                conn.send_bytes(output)
+                conn.send(_read_counters(encoder))
+            elif command == "state":
+                conn.send(_band_state(encoder, start, end))
+            elif command == "assume":  # ("assume", top, bottom)
+                if start < end:
+                    encoder.assume(message[1], message[2])
+            else:  # ("attach", name, shape, start, end)
+                _, name, shape, start, end = message
+                frame = None
+                if shm is not None:
+                    shm.close()
+                shm = shared_memory.SharedMemory(name=name)
+                frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+                encoder.reset()
+        except Exception as e:
+            # the errors take the place of the reply's last message, the parent re-raises them
+            if command in ("sync", "encode"):
+                conn.send_bytes(b"")
+                conn.send(_portable_error(e))
+            elif command == "state":
+                conn.send(_portable_error(e))
+            else:
+                failure = e
+    frame = None
+    if shm is not None:
+        shm.close()
+    conn.close()
+
+def _raise_replies(replies: List):
+    """Raise the first error among the replies of the band workers"""
+    for reply in replies:
+        if isinstance(reply, BaseException):
+            raise reply
+
+class ProcessBandEncoder:
+    """Encode frames in parallel on worker processes, sidestepping the GIL.
+
+    The framebuffer lives in multiprocessing.shared_memory and is split into horizontal
+    row bands, one per worker process. Every worker keeps the damage state of its band and
+    encodes it into a byte chunk, the chunks are returned in band order for the writer to
+    stitch together. Workers are started with the spawn method, so the main module of the
+    program has to be guarded by `if __name__ == "__main__":`.
+    changedCells, bytesSaved and displayError hold the counters of the last frame, summed over the bands.
+    """
+    def __init__(self, bg: Color, processCount: int, encoderOptions: Optional[Dict[str, Any]] = None):
+        context = multiprocessing.get_context("spawn")
+        _reset_counters(self)
+        self.__connections__ = []
+        self.__processes__ = []
+        for _ in range(max(1, processCount)):
+            parentConn, childConn = context.Pipe()
+            process = context.Process(target=_band_worker, args=(childConn, bg, encoderOptions or {}), daemon=True)
+            process.start()
+            childConn.close()
+            self.__connections__.append(parentConn)
+            self.__processes__.append(process)
+        self.__shm__: Optional[shared_memory.SharedMemory] = None
+        self.__frame__: Optional[np.ndarray] = None
+        self.__bands__: List[Tuple[int, int]] = []
+
+    def resize(self, shape: Tuple[int, int, int]):
+        """Allocate a shared framebuffer for frames of the given (H, W, 3) shape, workers repaint their whole band after it"""
+        if self.__frame__ is not None and self.__frame__.shape == tuple(shape):
+            return
+        previous = self.__shm__
+        self.__shm__ = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape))))
+        self.__frame__ = np.ndarray(shape, dtype=np.uint8, buffer=self.__shm__.buf)
+        self.__bands__ = row_bands(shape[0], len(self.__connections__))
+        for conn, (start, end) in zip(self.__connections__, self.__bands__):
+            conn.send(("attach", self.__shm__.name, tuple(shape), start, end))
+        if previous is not None:
+            previous.close()
+            previous.unlink()
+
+    def shift(self, dx: int, dy: int):
+        """Follow a scroll of the terminal by dx columns and dy lines, only the exposed cells are repainted"""
+        for conn in self.__connections__:
+            conn.send("state")
+        states = [conn.recv() for conn in self.__connections__]
+        _raise_replies(states)
+        # with a band state unknown the terminal content is too, every band is repainted
+        shifted = _shift_band_cells(states, dx, dy) or [(None, None)] * len(states)
+        for conn, (top, bottom) in zip(self.__connections__, shifted):
+            conn.send(("assume", top, bottom))
+
+    def encode(self, frame: np.ndarray, lines: Optional[np.ndarray] = None) -> List[bytes]:
+        """Encode the cells of a frame that changed, returns the chunks of every band in order
+
+        With lines (the mask of changed terminal lines), only the changed lines are copied to the
+        shared framebuffer (the others still hold the same pixels) and bands without one are skipped.
+        """
+        return self.__dispatch__("encode", frame, lines)
+
+    def sync(self, frame: np.ndarray, lines: Optional[np.ndarray] = None):
+        """Take a frame as displayed without encoding it, see FrameEncoder.sync"""
+        self.__dispatch__("sync", frame, lines)
+
+    def __dispatch__(self, command: str, frame: np.ndarray, lines: Optional[np.ndarray]) -> List[bytes]:
+        if self.__frame__ is None or self.__frame__.shape != tuple(frame.shape):
+            self.resize(frame.shape)
+            lines = None
+        if lines is None:
+            np.copyto(self.__frame__, frame)
+        else:
+            for line in np.flatnonzero(lines):
+                self.__frame__[2 * line:2 * line + 2] = frame[2 * line:2 * line + 2]
+        active = [index for index, (start, end) in enumerate(self.__bands__)
+                  if lines is None or _band_lines(lines, start, end).any()]
+        for index in active:
+            self.__connections__[index].send((command, lines))
+        chunks = [b""] * len(self.__connections__)
+        counters = []
+        for index in active:
+            chunks[index] = self.__connections__[index].recv_bytes()
+            counters.append(self.__connections__[index].recv())
+        # every worker replied, so the pipes are drained whatever error is raised
+        _raise_replies(counters)
+        _reset_counters(self)
+        for values in counters:
+            _add_counters(self, values)
+        return chunks
+
+    def close(self):
+        """Stop the worker processes and free the shared framebuffer"""
+        for conn in self.__connections__:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.__processes__:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        for conn in self.__connections__:
+            conn.close()
+        self.__connections__ = []
+        self.__processes__ = []
+        self.__frame__ = None
+        if self.__shm__ is not None:
+            self.__shm__.close()
+            self.__shm__.unlink()
+            self.__shm__ = None
+
+def create_band_encoder(bg: Color, count: int, strategy: _EncodeStrategy = "auto",
+                        encoderOptions: Optional[Dict[str, Any]] = None) -> Union[ThreadBandEncoder, ProcessBandEncoder]:
+    """Create the parallel band encoder for a strategy.
+
+    "auto" uses threads when the GIL is disabled (free-threaded builds) or when there is
+    a single band, and worker processes otherwise. encoderOptions are passed on to the
+    FrameEncoder of every band.
+    """
+    if strategy == "auto":
+        strategy = "threads" if count <= 1 or not gil_enabled() else "processes"
+    if strategy == "threads":
+        return ThreadBandEncoder(bg, count, encoderOptions)
+    if strategy == "processes":
+        return ProcessBandEncoder(bg, count, encoderOptions)
+    raise ValueError(f"Unsupported encode strategy: {strategy}")
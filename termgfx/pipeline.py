@@ -0,0 +1,110 @@
+import queue
+import threading
+import numpy as np
+from typing import Any, Callable, Optional, Tuple
+
+class FramePipeline:
+    """Three stage frame pipeline: the caller ticks frame N+1 while frame N is encoded and frame N-1 is written.
+
+    The encode and write stages run on their own threads and the stages hand frames off
+    through bounded queues. Frame buffers come from a fixed pool, so a tick that runs ahead
+    blocks on acquire instead of piling frames up, and the per frame latency is about the
+    slowest stage instead of the sum of all stages.
+    """
+    def __init__(self, shape: Tuple[int, int, int], encode: Callable[[np.ndarray, Any], Any],
+                 write: Callable[[Any], Any], depth: int = 1):
+        """
+        Args:
+            shape (Tuple[int, int, int]): shape of the (H, W, 3) uint8 frame buffers.
+            encode (Callable[[np.ndarray, Any], Any]): encode stage, called on the encode thread with each submitted frame
+                and the info submitted along with it.
+            write (Callable[[Any], Any]): write stage, called on the write thread with each encoded frame.
+            depth (int, optional): frames that can wait between two stages. Defaults to 1 (triple buffering).
+        """
+        self.__encode__ = encode
+        self.__write__ = write
+        self.__free__ = queue.Queue()
+        # one buffer being ticked, one being encoded and the ones waiting in between
+        for _ in range(depth + 2):
+            self.__free__.put(np.empty(shape, dtype=np.uint8))
+        self.__frames__ = queue.Queue(maxsize=depth)
+        self.__encoded__ = queue.Queue(maxsize=depth)
+        self.__threads__ = []
+        self.__error__: Optional[BaseException] = None
+
+    def start(self):
+        self.__threads__ = [
+            threading.Thread(target=self.__encodeThreadFunc__, name="encode", daemon=True),
+            threading.Thread(target=self.__writeThreadFunc__, name="write", daemon=True),
+        ]
+        for thread in self.__threads__:
+            thread.start()
+
+    def stop(self):
+        """Write the frames still in flight and stop the stage threads, re-raising the error of a failed stage"""
+        while self.__threads__ and self.__threads__[0].is_alive():
+            try:
+                self.__frames__.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        for thread in self.__threads__:
+            thread.join()
+        self.__threads__ = []
+        self.__raise_error__()
+
+    def acquire(self) -> np.ndarray:
+        """Take a free frame buffer to tick into, blocks while every buffer is in flight"""
+        while True:
+            self.__raise_error__()
+            try:
+                return self.__free__.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def release(self, frame: np.ndarray):
+        """Give back a buffer taken with acquire without submitting it, e.g. for a frame that is skipped"""
+        self.__free__.put(frame)
+
+    def submit(self, frame: np.ndarray, info: Any = None):
+        """Hand a buffer taken with acquire to the encode stage, blocks while the stage is busy.
+
+        info travels through the queue with the frame, so the encode stage always gets the two together.
+        """
+        while True:
+            self.__raise_error__()
+            try:
+                return self.__frames__.put((frame, info), timeout=0.1)
+            except queue.Full:
+                continue
+
+    def __raise_error__(self):
+        if self.__error__ is not None:
+            raise RuntimeError("frame pipeline stage failed") from self.__error__
+
+    def __encodeThreadFunc__(self):
+        try:
+            while True:
+                item = self.__frames__.get()
+                if item is None:
+                    break
+                frame, info = item
+                encoded = self.__encode__(frame, info)
+                self.__free__.put(frame)
+                self.__encoded__.put(encoded)
+        except BaseException as e:
+            self.__error__ = e
+        self.__encoded__.put(None)
+
+    def __writeThreadFunc__(self):
+        try:
+            while True:
+                encoded = self.__encoded__.get()
+                if encoded is None:
+                    return
+                self.__write__(encoded)
+        except BaseException as e:
+            self.__error__ = e
+            # keep draining so the encode stage never blocks on a dead writer
+            while self.__encoded__.get() is not None:
+                pass
@@ -1,4 +1,3 @@
-import shutil
 import sys
 import colorama
 import time
@@ -8,15 +7,92 @@ from .vectors import *
 import types
 import ctypes
 from .__console_font__ import create_console
-import threading
 import os
-from typing import List, Tuple, Optional
+import numpy as np
+from .encoder import encode_frame, FrameEncoder, pack_colors
+from .palette import _ColorMode, _DitherMode
+from .scroll import detect_shift, scroll_sequence
+from .fingerprint import line_hashes, frame_fingerprint, changed_lines
+from .framecache import EncodedFrameCache
+from .stats import RenderStats
+from .trace import FrameTracer
+from .hud import PerfHud
+from .output import FrameWriter, supports_repeat
+from .termsize import TerminalSize
+from .scheduler import FrameScheduler
+from .pipeline import FramePipeline
+from .parallel import _EncodeStrategy, ThreadBandEncoder, ProcessBandEncoder, create_band_encoder
+import inspect
+from typing import Callable, List, Literal, Tuple, Optional, get_args
+
+def _accepts_delta_time(tick) -> bool:
+    """Check if a tick callback takes a second (delta time) argument"""
+    try:
+        params = inspect.signature(tick).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    positional = [p for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+    return len(positional) >= 2 or any(p.kind == p.VAR_POSITIONAL for p in params)
 
 class ConsoleRenderer():
     def __init__(self, tick: Optional[types.FunctionType] = None, 
                  sizeChange: Optional[types.FunctionType] = None, 
                  bg: Color = Color("RGB", [0, 0, 0]),
-                 disableConsoleCursor: bool = True, threadCount: int = min(os.cpu_count(), 6)):
+                 disableConsoleCursor: bool = True, threadCount: int = min(os.cpu_count(), 6),
+                 encodeStrategy: _EncodeStrategy = "threads",
+                 syncOutput: Optional[bool] = None, repeatSequence: Optional[bool] = None,
+                 colorMode: Literal["truecolor", "256", "16"] = "truecolor",
+                 dither: Literal["none", "bayer", "diffusion"] = "none", colorThreshold: float = 0.0,
+                 optimizeGlyphs: bool = False, optimizeMoves: bool = True, detectScroll: bool = True,
+                 resizeDebounce: float = 0.15, frameCacheBytes: int = 4 * 1024 * 1024,
+                 statsCallback: Optional[Callable[[dict], None]] = None, statsWindow: int = 240,
+                 tracer: Optional[FrameTracer] = None, showHud: bool = False):
+        """
+        Args:
+            tick (types.FunctionType, optional): called every frame with the screen resolution (and the delta time if it takes a second argument), returns the frame as an Image, Texture or (H, W, 3) uint8 array. Defaults to None.
+            sizeChange (types.FunctionType, optional): called with the new resolution when the terminal is resized. Defaults to None.
+            bg (Color, optional): background color around the frame. Defaults to black.
+            disableConsoleCursor (bool, optional): disable the console's quick edit mode on Windows. Defaults to True.
+            threadCount (int, optional): number of row bands frames are split into for encoding. Defaults to min(os.cpu_count(), 6).
+            encodeStrategy (Literal["auto", "threads", "processes"], optional): encode the bands on threads, or on worker processes
+                sharing the framebuffer through shared memory ("processes" needs the main module guarded by `if __name__ == "__main__":`).
+                "auto" picks threads when the GIL is disabled (free-threaded builds) and processes otherwise. Defaults to "threads".
+            syncOutput (bool, optional): wrap every frame in synchronized update sequences (DEC mode 2026) so the terminal
+                renders it once, without tearing. Defaults to None (detected from the terminal's environment variables).
+            repeatSequence (bool, optional): compress long runs of identical cells with the REP sequence (CSI n b).
+                Defaults to None (detected from the terminal's environment variables).
+            colorMode (Literal["truecolor", "256", "16"], optional): output 24-bit colors, or quantize frames to the xterm
+                256 color palette or the 16 ANSI colors for terminals and links without true color. Defaults to "truecolor".
+            dither (Literal["none", "bayer", "diffusion"], optional): dither frames before quantizing them in the palette color
+                modes, with a 4x4 ordered (Bayer) pattern or by diffusing the error of every row into the next one. Defaults to "none".
+            colorThreshold (float, optional): lossy damage tracking, cells are only repainted once their colors moved more than
+                this perceptual distance (about one channel level per unit) from what the terminal shows. Defaults to 0 (lossless).
+            optimizeGlyphs (bool, optional): draw cells as upper or lower half blocks (colors swapped), spaces or full blocks,
+                whichever reuses the colors the terminal is set to, to send fewer SGR sequences. Defaults to False.
+            optimizeMoves (bool, optional): move the cursor between changed cells with the shortest of CUP, CUF and CR / LF,
+                or rewrite a few unchanged cells instead, rather than always jumping with CUP. Defaults to True.
+            detectScroll (bool, optional): detect frames whose content moved by whole lines or columns and scroll the
+                terminal (scroll region with SU / SD, ICH / DCH per line) so only the exposed strips are repainted.
+                scroll() hints are used either way. Defaults to True.
+            resizeDebounce (float, optional): seconds a new terminal size has to hold before run() resizes, so a drag-resize
+                repaints once at the end instead of on every intermediate size. Defaults to 0.15.
+            frameCacheBytes (int, optional): byte budget of the LRU cache of encoded frames, a transition between two frame
+                contents that was already encoded is replayed from it. 0 disables the cache, it is also off with a
+                colorThreshold (the terminal doesn't show the exact frames then). Defaults to 4 MiB.
+            statsCallback (Callable[[dict], None], optional): called with the frameStats of every written frame, on the
+                write thread, so it has to be quick. Defaults to None.
+            statsWindow (int, optional): number of recent frames the stats percentiles and fps are computed over. Defaults to 240.
+            tracer (FrameTracer, optional): records a span per stage, frame and thread (tick, sample, encode, the thread
+                band workers, write, and the waits of the tick thread) to dump as a Chrome trace. Defaults to None (off).
+            showHud (bool, optional): composite a performance overlay (fps, frame time sparkline, bytes per frame and changed
+                cells) into the top right corner of every frame, see PerfHud and the hud attribute. Defaults to False.
+        """
+        if encodeStrategy not in get_args(_EncodeStrategy):
+            raise ValueError(f"Unsupported encode strategy: {encodeStrategy}")
+        if colorMode not in get_args(_ColorMode):
+            raise ValueError(f"Unsupported color mode: {colorMode}")
+        if dither not in get_args(_DitherMode):
+            raise ValueError(f"Unsupported dither mode: {dither}")
         colorama.just_fix_windows_console()
         self.__running__ = False
 
@@ -28,96 +104,218 @@ class ConsoleRenderer():
         self.__frameStr__ = ""
         self.__frameOut__ = None
         self.threadCount = threadCount
-        self.__frameThreads__: list[threading.Thread] = []
+        self.encodeStrategy = encodeStrategy
+        self.__bandEncoder__: Optional[ThreadBandEncoder | ProcessBandEncoder] = None
+        self.__pipeline__: Optional[FramePipeline] = None
+        # (H, W, 3) shape of the frames the pipeline was started for
+        self.__frameShape__: Optional[Tuple[int, int, int]] = None
+        self.__writer__ = FrameWriter(synchronized=syncOutput)
+        self.__encoderOptions__ = {"repeat": supports_repeat() if repeatSequence is None else repeatSequence,
+                                   "colorMode": colorMode, "dither": dither, "threshold": colorThreshold,
+                                   "optimizeGlyphs": optimizeGlyphs, "optimizeMoves": optimizeMoves}
+        self.__frameStats__ = {"changedCells": 0, "bytesSaved": 0, "meanDisplayError": 0.0, "scroll": (0, 0), "cached": False,
+                               "bytesWritten": 0, "tickTime": 0.0, "sampleTime": 0.0, "encodeTime": 0.0, "writeTime": 0.0}
+        self.onStats = statsCallback
+        self.__stats__ = RenderStats(statsWindow)
+        self.tracer = tracer
+        self.hud: Optional[PerfHud] = PerfHud() if showHud else None
+        self.detectScroll = detectScroll
+        self.__pendingScroll__: Optional[Tuple[int, int]] = None
+        self.__lastPixels__: Optional[np.ndarray] = None
+        # shape of the last encoded frame, scroll hints only apply to a frame of the same shape
+        self.__lastShape__: Optional[Tuple[int, ...]] = None
+        # fingerprint of the last submitted frame (tick stage) and line hashes of the last encoded one (encode stage)
+        self.__submittedFingerprint__: Optional[int] = None
+        self.__lastLineHashes__: Optional[np.ndarray] = None
+        self.__frameCache__ = EncodedFrameCache(frameCacheBytes) if frameCacheBytes > 0 and colorThreshold <= 0 else None
+        # fingerprint of the frame the terminal shows exactly (encode stage), None when unknown
+        self.__displayedFingerprint__: Optional[int] = None
+        self.__scheduler__: Optional[FrameScheduler] = None
+        # cached terminal size, refreshed on SIGWINCH (polled where there is none)
+        self.__terminalSize__ = TerminalSize(debounce=resizeDebounce)
+        self.__tickTakesDelta__ = False
         
         self.__disable_console_cursor__ = disableConsoleCursor
-        self.__prevFrame__ = None
         self.__prevFrameStr__ = ""  # Store the previous frame as string for comparison
 
     def stop(self):
         self.__running__ = False
-    
-    
-    def __displayThreadFunc__(self, start: Vector2, end: Vector2):
-        """
-        Display a portion of the frame (from start.x to end.x, covering all y) in a separate thread.
-        This function continuously updates the assigned region until rendering stops.
-        """
-        while self.__running__:
-            # If no frame data yet, wait briefly
-            if self.__frameOut__ is None:
-                time.sleep(0.01)
-                continue
-
-            pixel_data = self.__frameOut__
-            height = len(pixel_data)
-            if height == 0:
-                time.sleep(0.01)
-                continue
-            width = len(pixel_data[0])
-
-            start_x = int(start.x)
-            end_x = int(min(end.x, width))
-
-            lines = []
-
-            for y in range(0, height, 2):
-                line_parts = []
-                prev_colors = None
-
-                for x in range(start_x, end_x):
-                    top_color = pixel_data[y][x]
-                    bottom_color = pixel_data[y + 1][x] if y + 1 < height else self.__bg__
-
-                    if prev_colors is None or prev_colors[0] != top_color:
-                        line_parts.append(f"\033[38;2;{top_color.r};{top_color.g};{top_color.b}m")
-                    if prev_colors is None or prev_colors[1] != bottom_color:
-                        line_parts.append(f"\033[48;2;{bottom_color.r};{bottom_color.g};{bottom_color.b}m")
-
-                    line_parts.append("\u2580")
-                    prev_colors = (top_color, bottom_color)
-
-                # Move cursor to correct location before writing line
-                lines.append(f"\033[{(y // 2) + 1};{start_x + 1}H" + "".join(line_parts) + "\033[0m")
-
-            # Write all lines for this thread slice
-            output = "".join(lines)
-            sys.stdout.write(output)
-            sys.stdout.flush()
-
-            # Slight delay to sync FPS loop
-            time.sleep(0.001)
 
+    def scroll(self, dx: int, dy: int):
+        """Hint that the content of the next frame is the current one moved by (dx, dy) pixels.
 
-    def __startThreads__(self):
-        threadScreenSize = int(self.screenResolution.x // self.threadCount)
-        self.__running__ = False
-        for t in self.__frameThreads__:
-            if t.is_alive():
-                t.join(timeout=0.01)
+        Vertical moves are scrolled by whole terminal lines, so dy has to be even. With an odd dy
+        only the horizontal move is scrolled and the rest is repainted from the damage tracking as usual.
+        """
+        self.__pendingScroll__ = (int(dx), int(dy))
+    
+    
+    def __encode_frame__(self, frame: np.ndarray, info: Tuple) -> Tuple[List[bytes], dict]:
+        """Encode stage of the pipeline: encode the changed cells of a frame on the band encoder, or replay them from the frame cache
 
+        info is the (scroll hint or None, line hashes, fingerprint, tick and sample seconds) submitted with the frame.
+        """
+        start = time.perf_counter()
+        hint, hashes, fingerprint, tickTime, sampleTime = info
+        times = {"tickTime": tickTime, "sampleTime": sampleTime}
+        lines = changed_lines(self.__lastLineHashes__, hashes)
+        self.__lastLineHashes__ = hashes
+        # cached outputs were encoded over the frame shown now, they are only valid without a scroll hint
+        key = (self.__displayedFingerprint__, fingerprint)
+        cacheable = self.__frameCache__ is not None and self.__displayedFingerprint__ is not None and hint is None
+        self.__displayedFingerprint__ = fingerprint if self.__frameCache__ is not None else None
+        # the packed pixels are only needed to detect scrolls
+        pixels = pack_colors(frame) if self.detectScroll else None
+        sameShape = self.__lastShape__ == frame.shape
+        self.__lastShape__ = frame.shape
+        if cacheable:
+            cached = self.__frameCache__.get(key)
+            if cached is not None:
+                self.__lastPixels__ = pixels
+                # the band encoders take the frame as displayed without encoding it
+                self.__bandEncoder__.sync(frame, lines)
+                output, stats = cached
+                end = time.perf_counter()
+                if self.tracer is not None:
+                    self.tracer.span("encode", start, end, {"cached": True})
+                return [output], dict(stats, cached=True, encodeTime=end - start, **times)
+        dx = dy = 0
+        if sameShape:
+            if hint is not None:
+                dx, dy = hint if hint[1] % 2 == 0 else (hint[0], 0)
+            elif pixels is not None and self.__lastPixels__ is not None:
+                dx, dy = detect_shift(self.__lastPixels__, pixels)
+        self.__lastPixels__ = pixels
+
+        prefix = b""
+        if dx or dy:
+            # the terminal moves the cells it shows, the band encoders follow it and repaint the exposed strips
+            prefix = scroll_sequence(dx, dy // 2, (frame.shape[0] + 1) // 2)
+            self.__bandEncoder__.shift(dx, dy // 2)
+            # the line hashes compare the frames, not the shifted screen
+            lines = None
+        chunks = self.__bandEncoder__.encode(frame, lines)
+        cells = max(1, ((frame.shape[0] + 1) // 2) * frame.shape[1])
+        stats = {"changedCells": self.__bandEncoder__.changedCells, "bytesSaved": self.__bandEncoder__.bytesSaved,
+                 "meanDisplayError": self.__bandEncoder__.displayError / cells, "scroll": (dx, dy), "cached": False}
+        if cacheable:
+            self.__frameCache__.put(key, b"".join([prefix] + chunks), stats)
+        end = time.perf_counter()
+        if self.tracer is not None:
+            self.tracer.span("encode", start, end, {"cached": False, "changedCells": stats["changedCells"], "scroll": [dx, dy]})
+        stats.update(times, encodeTime=end - start)
+        return [prefix] + chunks, stats
+
+    def __write_chunks__(self, encoded: Tuple[List[bytes], dict]) -> int:
+        """Write stage of the pipeline: push the encoded slices of a frame in a single write and record its stats"""
+        start = time.perf_counter()
+        chunks, stats = encoded
+        self.__writer__.begin()
+        for chunk in chunks:
+            self.__writer__.append(chunk)
+        stats["bytesWritten"] = self.__writer__.flush()
+        end = time.perf_counter()
+        stats["writeTime"] = end - start
+        if self.tracer is not None:
+            self.tracer.span("write", start, end, {"bytes": stats["bytesWritten"]})
+        self.__frameStats__ = stats
+        self.__stats__.record_frame(stats)
+        if self.onStats is not None:
+            self.onStats(stats)
+        return stats["bytesWritten"]
+
+    def __stopThreads__(self):
+        pipeline, self.__pipeline__ = self.__pipeline__, None
+        if pipeline is not None:
+            pipeline.stop()
+
+    def __startThreads__(self, resolution: Optional[Vector2] = None):
+        self.__stopThreads__()
         self.__running__ = True
-        self.__frameThreads__ = []
-
-        for threadNum in range(self.threadCount):
-            start = Vector2(threadScreenSize * threadNum, 0)
-            end = Vector2(threadScreenSize * (threadNum + 1), self.screenResolution.y)
-            thread = threading.Thread(target=self.__displayThreadFunc__, args=(start, end))
-            self.__frameThreads__.append(thread)
-            thread.start()
 
-    def run(self, fps: int = 60, termSettings: dict[str, str |int] = None):
+        if resolution is None:
+            resolution = self.screenResolution
+        shape = (int(resolution.y), int(resolution.x), 3)
+        # the band encoder outlives resizes, its bands just follow the new frame shape
+        if self.__bandEncoder__ is None:
+            self.__bandEncoder__ = create_band_encoder(self.__bg__, self.threadCount, self.encodeStrategy, self.__encoderOptions__)
+        if isinstance(self.__bandEncoder__, ThreadBandEncoder):
+            self.__bandEncoder__.tracer = self.tracer
+        self.__bandEncoder__.resize(shape)
+        if self.__frameCache__ is not None and shape != self.__frameShape__:
+            # fingerprints include the shape, transitions of the old size can never be replayed again
+            self.__frameCache__.clear()
+        self.__frameShape__ = shape
+        self.__lastPixels__ = None
+        self.__lastShape__ = None
+        self.__lastLineHashes__ = None
+        self.__submittedFingerprint__ = None
+        self.__displayedFingerprint__ = None
+        self.__pipeline__ = FramePipeline(shape, self.__encode_frame__, self.__write_chunks__)
+        self.__pipeline__.start()
+
+    def __submit_frame__(self, texture: Image | Texture | np.ndarray, tickTime: float = 0.0):
+        """Tick stage of the pipeline: sample the tick's result into a free buffer and hand it to the encode stage.
+
+        A frame with the same content as the last submitted one (the one the terminal shows once
+        the pipeline drained) is skipped without being encoded or written.
+        """
+        tracer = self.tracer
+        if tracer is not None:
+            acquireStart = time.perf_counter()
+        frame = self.__pipeline__.acquire()
+        start = time.perf_counter()
+        if tracer is not None:
+            # blocks while every buffer is in flight, i.e. the encode or write stage is behind
+            tracer.span("acquire", acquireStart, start)
+        frame = self.__get_pixel_display_list__(texture, frame)
+        if self.hud is not None:
+            self.hud.draw(frame, self.__stats__)
+        hashes = line_hashes(frame)
+        fingerprint = frame_fingerprint(frame, hashes)
+        end = time.perf_counter()
+        if tracer is not None:
+            tracer.span("sample", start, end)
+        if fingerprint == self.__submittedFingerprint__ and self.__pendingScroll__ is None:
+            self.__pipeline__.release(frame)
+            self.__stats__.record_skip()
+            if tracer is not None:
+                tracer.instant("skip")
+            return
+        self.__submittedFingerprint__ = fingerprint
+        info = (self.__pendingScroll__, hashes, fingerprint, tickTime, end - start)
+        self.__pendingScroll__ = None
+        self.__pipeline__.submit(frame, info)
+        if tracer is not None:
+            tracer.span("submit", end, time.perf_counter())
+
+    def __call_tick__(self, size: Vector2, deltaTime: float):
+        # ticks taking a second argument get the seconds since the previous frame
+        if self.__tickTakesDelta__:
+            return self.onTick(size, deltaTime)
+        return self.onTick(size)
+
+    def run(self, fps: int = 60, termSettings: dict[str, str |int] = None, skipFrames: bool = False):
         """run the render loop
 
+        Frames are paced on perf_counter deadlines, the time spent in a frame is taken out of
+        the wait for the next one. If onTick takes a second argument it's called with the
+        delta time (seconds since the previous frame).
+
         Args:
             fps (int, optional): frames per second. Defaults to 60.
             termSettings (dict[str, str  | int], optional, FOR WINDOWS ONLY): the console settings (font_size: int, window_name: str, font_name: str). Defaults to None.
+            skipFrames (bool, optional): drop the frames the loop fell behind on instead of catching up. Defaults to False.
         """
         stdout = sys.stdout
         if termSettings:
             stdout = create_console(**termSettings).stdout
+        self.__terminalSize__.start()
         size = self.screenResolution
         self.__running__ = True
+        self.__stats__.reset()
+        self.__tickTakesDelta__ = _accepts_delta_time(self.onTick)
+        self.__scheduler__ = FrameScheduler(fps, skipFrames)
         
         if self.__disable_console_cursor__ and sys.platform.startswith('win'):
             try:
@@ -130,24 +328,43 @@ class ConsoleRenderer():
             except Exception:
                 pass
         
-        self.__startThreads__()
+        self.__startThreads__(size)
+        self.__scheduler__.start()
         
-        while self.__running__:
-            _size = self.screenResolution
-            if size != _size:
-                size = _size
-                if self.onSizeChange:
-                    out = self.onSizeChange(size)
-                    self.__prevFrame__ = out
-                    self.__frameStr__ = self.__get_pixel_display_list__(pixels)
-                    self.__startThreads__()
-            
-            out = self.onTick(size)
-            if self.__prevFrame__ != out:
-                pixels = self.onTick(size)
-                self.__frameOut__ = self.__get_pixel_display_list__(pixels)
-            time.sleep(1/fps)
+        try:
+            while self.__running__:
+                deltaTime = self.__scheduler__.begin_frame()
+                self.__stats__.record_start(time.perf_counter())
+                # resizes are debounced, the frames keep the old size until the new one settled
+                settled = self.__terminalSize__.poll()
+                if settled is not None and Vector2(settled.columns, settled.lines * 2) != size:
+                    size = Vector2(settled.columns, settled.lines * 2)
+                    # the frame buffers and encoder bands follow the new size
+                    self.__startThreads__(size)
+                    if self.onSizeChange:
+                        out = self.onSizeChange(size)
+                        self.__submit_frame__(out)
             
+                # frame N is ticked here while the pipeline encodes frame N-1 and writes frame N-2
+                tickStart = time.perf_counter()
+                out = self.__call_tick__(size, deltaTime)
+                tickEnd = time.perf_counter()
+                if self.tracer is not None:
+                    self.tracer.span("tick", tickStart, tickEnd)
+                self.__submit_frame__(out, tickEnd - tickStart)
+                waitStart = time.perf_counter()
+                self.__scheduler__.wait()
+                if self.tracer is not None:
+                    self.tracer.span("wait", waitStart, time.perf_counter())
+                self.__stats__.droppedFrames = self.__scheduler__.skippedFrames
+        finally:
+            self.__terminalSize__.stop()
+            try:
+                self.__stopThreads__()
+            finally:
+                if self.__bandEncoder__ is not None:
+                    self.__bandEncoder__.close()
+                    self.__bandEncoder__ = None
         stdout.write("\033[?25h")
         stdout.flush()
 
@@ -156,27 +373,15 @@ class ConsoleRenderer():
         if termSettings:
             stdout = create_console(**termSettings).stdout
         size = self.screenResolution
-        pixels = self.onTick(size)
+        self.__tickTakesDelta__ = _accepts_delta_time(self.onTick)
+        pixels = self.__call_tick__(size, 0.0)
         self.__frameOut__ = self.__get_pixel_display_list__(pixels)
         self.__frameStr__ = pixels
 
-        threadScreenSize = int(self.screenResolution.x // self.threadCount)
-
-        self.__running__ = True
-        for threadNum in range(self.threadCount):
-            start = Vector2(threadScreenSize * threadNum, 0)
-            end = Vector2(threadScreenSize * (threadNum + 1), self.screenResolution.y)
-            thread = threading.Thread(target=self.__displayThreadFunc__, args=(start, end))
-            self.__frameThreads__.append(thread)
-            thread.start()
+        self.__writer__.write(FrameEncoder(self.__bg__, **self.__encoderOptions__).encode(self.__frameOut__))
 
         stdout.write("\033[?25h")
         stdout.flush()
-        
-        for t in self.__frameThreads__:
-            if t.is_alive():
-                t.join(timeout=0.01)
-        self.__running__ = False
 
     def overlayOnCanvas(self, canvas: Image | Texture, 
                        layer: Image | Texture, 
@@ -217,11 +422,11 @@ class ConsoleRenderer():
         # Ensure colors are in RGB format
         top_r, top_g, top_b = colorTop.r, colorTop.g, colorTop.b
         bottom_r, bottom_g, bottom_b = colorBottom.r, colorBottom.g, colorBottom.b
-        equalChar = colorTop == colorBottom
+        char = '\u2588' if colorTop == colorBottom else '\u2580'
         
         if pre is None:
             return f"\033[38;2;{top_r};{top_g};{top_b}m" \
-                   f"\033[48;2;{bottom_r};{bottom_g};{bottom_b}m{'\u2588' if equalChar else '\u2580'}"
+                   f"\033[48;2;{bottom_r};{bottom_g};{bottom_b}m{char}"
         
         pix = ""
         pre_top, pre_bottom = pre
@@ -232,67 +437,89 @@ class ConsoleRenderer():
         if pre_bottom != colorBottom:
             pix += f"\033[48;2;{bottom_r};{bottom_g};{bottom_b}m"
 
-        return pix + ('\u2588' if equalChar else '\u2580')
+        return pix + char
+
+    @property
+    def frameStats(self) -> dict:
+        """Counters of the last written frame: changedCells, bytesSaved (by the run compression), meanDisplayError
+        (perceptual distance per cell between the terminal and the frame, from colorThreshold), scroll (the (dx, dy)
+        pixels the terminal content was scrolled by), cached (replayed from the frame cache), bytesWritten and the
+        seconds spent in every stage: tickTime, sampleTime (__get_pixel_display_list__ and fingerprinting), encodeTime
+        and writeTime"""
+        return dict(self.__frameStats__)
+
+    @property
+    def stats(self) -> RenderStats:
+        """Rolling stats of run: percentiles of the stage times, bytes written and changed cells, fps and frame counters"""
+        return self.__stats__
+
+    @property
+    def skippedFrames(self) -> int:
+        """Frames run skipped because their content matched the frame already shown"""
+        return self.__stats__.skippedFrames
+
+    @property
+    def frameCacheStats(self) -> dict:
+        """hits, misses, hitRate, evictions, entries and bytes of the encoded frame cache, empty when it's disabled"""
+        if self.__frameCache__ is None:
+            return {}
+        return self.__frameCache__.stats
+
+    @property
+    def achievedFps(self) -> float:
+        """Frames per second measured over the recent frames of run, 0 before it started"""
+        return self.__stats__.fps
 
     @property
     def screenResolution(self) -> Vector2:
-        """Get the resolution in pixels (width, height)"""
-        size = shutil.get_terminal_size()
+        """Get the resolution in pixels (width, height), from the cached terminal size"""
+        size = self.__terminalSize__.size
         # Each character row displays 2 pixel rows
         return Vector2(size.columns, size.lines * 2)
 
-    def __get_pixel_display_list__(self, texture: Texture) -> List[List[Color]]:
-        """Convert texture to displayable pixel list"""
-        resolution = self.screenResolution
-        width, height = int(resolution.x), int(resolution.y)
+    def __get_pixel_display_list__(self, texture: Image | Texture | np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Convert the tick's result to a screen sized (H, W, 3) uint8 frame
+
+        Image, Texture and ndarray results are cropped or padded with the background color
+        using array operations, anything else indexable by Vector2 is sampled pixel by pixel.
+        If out is given the frame is drawn into it and its shape is used as the screen size.
+        """
+        if out is None:
+            resolution = self.screenResolution
+            out = np.empty((int(resolution.y), int(resolution.x), 3), dtype=np.uint8)
+        height, width = out.shape[:2]
+
+        if isinstance(texture, Texture):
+            return texture.to_array(Vector2(width, height), self.__bg__, out)
+
+        # Fill the display buffer with the background color
+        frame = out
+        frame[:, :] = [self.__bg__.r, self.__bg__.g, self.__bg__.b]
+
+        if isinstance(texture, (Image, np.ndarray)):
+            data = texture.dataArray if isinstance(texture, Image) else texture
+            max_y, max_x = min(height, data.shape[0]), min(width, data.shape[1])
+            frame[:max_y, :max_x] = data[:max_y, :max_x, :3]
+            return frame
 
-        # Create display buffer with background color
-        pixel_list = []
         for y in range(height):
-            row = []
             for x in range(width):
                 try:
                     # Sample texture at current position
                     color = texture[Vector2(x, y)]
-                    row.append(color)
+                    frame[y, x] = [color.r, color.g, color.b]
                 except (IndexError, ValueError):
-                    # Fallback to background color
-                    row.append(self.__bg__)
-            pixel_list.append(row)
-            
-        return pixel_list
+                    # Keep the background color
+                    pass
+        return frame
     
-    def __show_pixels__(self, pixel_data):
-        height = len(pixel_data)
-        if height == 0:
+    def __show_pixels__(self, pixel_data: np.ndarray):
+        if pixel_data.shape[0] == 0:
             return
-        width = len(pixel_data[0])
-
-        frame_lines = []
-
-        for y in range(0, height, 2):
-            line_parts = []  # build line in a list instead of +=
-            prev_colors = None
-
-            for x in range(width):
-                top_color = pixel_data[y][x]
-                bottom_color = pixel_data[y + 1][x] if y + 1 < height else self.__bg__
-
-                # Only append color codes if different from previous
-                if prev_colors is None or prev_colors[0] != top_color:
-                    line_parts.append(f"\033[38;2;{top_color.r};{top_color.g};{top_color.b}m")
-                if prev_colors is None or prev_colors[1] != bottom_color:
-                    line_parts.append(f"\033[48;2;{bottom_color.r};{bottom_color.g};{bottom_color.b}m")
-
-                line_parts.append("\u2580")
-                prev_colors = (top_color, bottom_color)
-
-            line_parts.append("\033[0m")  # reset at end of line
-            frame_lines.append("".join(line_parts))
 
-        frame_str = "\n".join(frame_lines)
+        frame_str = encode_frame(pixel_data, self.__bg__, colorMode=self.__encoderOptions__["colorMode"]).decode("utf-8")
 
         if frame_str != self.__prevFrameStr__:
             sys.stdout.write("\033c"+frame_str)
             sys.stdout.flush()
-            self.__prevFrameStr__ = frame_str
\ No newline at end of file
+            self.__prevFrameStr__ = frame_str
@@ -0,0 +1,56 @@
+import time
+
+class FrameScheduler:
+    """Paces a render loop on fixed frame deadlines measured with time.perf_counter.
+
+    The time spent ticking, encoding and writing a frame is taken out of the wait before
+    the next deadline, so the achieved frame rate matches the requested one as long as a
+    frame fits in its budget. When the loop falls behind it either catches up by running
+    the late frames without waiting, or with skipFrames drops the deadlines it missed.
+    """
+    def __init__(self, fps: float, skipFrames: bool = False):
+        """
+        Args:
+            fps (float): target frames per second.
+            skipFrames (bool, optional): drop missed deadlines instead of catching up. Defaults to False.
+        """
+        self.frameTime = 1 / fps
+        self.skipFrames = skipFrames
+        self.skippedFrames = 0
+        self.__deadline__ = None
+        self.__lastFrame__ = None
+
+    def start(self):
+        """Reset the deadlines, the next frame starts now"""
+        now = time.perf_counter()
+        self.__deadline__ = now
+        self.__lastFrame__ = now
+
+    def begin_frame(self) -> float:
+        """Mark the start of a frame.
+
+        Returns:
+            float: seconds since the start of the previous frame (the delta time).
+        """
+        now = time.perf_counter()
+        if self.__deadline__ is None:
+            self.__deadline__ = now
+            self.__lastFrame__ = now
+        deltaTime = now - self.__lastFrame__
+        self.__lastFrame__ = now
+        return deltaTime
+
+    def wait(self):
+        """Sleep until the deadline of the next frame"""
+        self.__deadline__ += self.frameTime
+        now = time.perf_counter()
+        remaining = self.__deadline__ - now
+        if remaining > 0:
+            time.sleep(remaining)
+            return
+
+        missed = int(-remaining // self.frameTime)
+        # a long stall (e.g. a suspended process) is never caught up with
+        if self.skipFrames or -remaining > 1.0:
+            self.skippedFrames += missed
+            self.__deadline__ += missed * self.frameTime
@@ -0,0 +1,76 @@
+import numpy as np
+from typing import Optional, Tuple
+from .vectors import *
+from .encoder import number_bytes, cursor_position
+
+def detect_shift(previous: np.ndarray, current: np.ndarray, maxLines: int = 4, maxColumns: int = 4,
+                 minMatch: float = 0.6) -> Tuple[int, int]:
+    """Find how far the content of a frame moved since the previous one.
+
+    Only shifts the terminal can scroll by are tried: whole columns, and whole lines (two pixel
+    rows) vertically. A shift is kept when the moved previous frame matches at least minMatch
+    of the current pixels, clearly more than the frames match in place.
+
+    Args:
+        previous (np.ndarray): packed (H, W) pixels of the previous frame (see encoder.pack_colors).
+        current (np.ndarray): packed (H, W) pixels of the current frame.
+        maxLines (int, optional): largest vertical shift tried, in terminal lines. Defaults to 4.
+        maxColumns (int, optional): largest horizontal shift tried, in columns. Defaults to 4.
+        minMatch (float, optional): fraction of the pixels the shifted frame has to match. Defaults to 0.6.
+
+    Returns:
+        Tuple[int, int]: (dx, dy) the content moved by in pixels, (0, 0) if it didn't move.
+    """
+    if previous.shape != current.shape or current.size == 0:
+        return 0, 0
+    inPlace = _match(previous, current, 0, 0)
+    if inPlace >= 0.9:
+        # mostly unchanged, the damage tracking is cheaper than any scroll
+        return 0, 0
+    candidates = [(0, 2 * lines) for lines in range(-maxLines, maxLines + 1) if lines]
+    candidates += [(dx, 0) for dx in range(-maxColumns, maxColumns + 1) if dx]
+    matches = {shift: _match(previous, current, *shift) for shift in candidates}
+    # diagonal moves combine the best vertical and horizontal shift
+    dy = max((shift for shift in matches if shift[0] == 0), key=matches.get, default=(0, 0))[1]
+    dx = max((shift for shift in matches if shift[1] == 0), key=matches.get, default=(0, 0))[0]
+    if dx and dy:
+        matches[(dx, dy)] = _match(previous, current, dx, dy)
+    best = max(matches, key=matches.get)
+    if matches[best] >= minMatch and matches[best] > inPlace + 0.1:
+        return best
+    return 0, 0
+
+def _match(previous: np.ndarray, current: np.ndarray, dx: int, dy: int) -> float:
+    # fraction of all pixels where current[y + dy, x + dx] == previous[y, x], exposed strips count as misses
+    height, width = current.shape
+    if abs(dy) >= height or abs(dx) >= width:
+        return 0.0
+    moved = current[max(dy, 0):height + min(dy, 0), max(dx, 0):width + min(dx, 0)]
+    source = previous[max(-dy, 0):height - max(dy, 0), max(-dx, 0):width - max(dx, 0)]
+    return np.count_nonzero(moved == source) / current.size
+
+def scroll_sequence(dx: int, lines: int, rows: int, origin: Optional[Vector2] = None) -> bytes:
+    """Escape sequences moving the content of the frame's terminal lines.
+
+    Lines scroll inside a scroll region (DECSTBM) limited to the frame with SU / SD, columns
+    move with ICH / DCH on every line. The exposed cells are left blank to be repainted.
+
+    Args:
+        dx (int): columns the content moves right (negative for left).
+        lines (int): terminal lines the content moves down (negative for up).
+        rows (int): number of terminal lines of the frame.
+        origin (Vector2, optional): terminal cell of the frame's top left corner (0 based). Defaults to (0, 0).
+    """
+    originX = int(origin.x) if origin is not None else 0
+    originY = int(origin.y) if origin is not None else 0
+    output = b""
+    if lines:
+        output += b"\033[" + number_bytes(originY + 1) + b";" + number_bytes(originY + rows) + b"r"
+        output += b"\033[" + number_bytes(abs(lines)) + (b"T" if lines > 0 else b"S")
+        # resetting the region also homes the cursor, the frame's escape stream starts with a CUP
+        output += b"\033[r"
+    if dx:
+        edit = b"\033[" + number_bytes(abs(dx)) + (b"@" if dx > 0 else b"P")
+        nextLine = b"\r\n" + (b"\033[" + number_bytes(originX) + b"C" if originX else b"")
+        output += cursor_position(originY, originX) + edit + (nextLine + edit) * (rows - 1)
+    return output
@@ -0,0 +1,115 @@
+import numpy as np
+from typing import Dict
+
+# per frame metrics kept in the rings: stage times in seconds, then sizes
+FRAME_METRICS = ("tickTime", "sampleTime", "encodeTime", "writeTime", "bytesWritten", "changedCells")
+
+class RingBuffer:
+    """Fixed-size ring of floats, appending overwrites the oldest value.
+
+    Appends are a store and an increment, safe without a lock as long as a single thread
+    appends (readers may see the newest value missing).
+    """
+    def __init__(self, capacity: int):
+        self.__data__ = np.zeros(max(1, capacity), dtype=np.float64)
+        self.__count__ = 0
+
+    def append(self, value: float):
+        self.__data__[self.__count__ % len(self.__data__)] = value
+        self.__count__ += 1
+
+    def clear(self):
+        self.__count__ = 0
+
+    def __len__(self) -> int:
+        return min(self.__count__, len(self.__data__))
+
+    def values(self) -> np.ndarray:
+        """The values in the ring, oldest first"""
+        count, capacity = self.__count__, len(self.__data__)
+        if count <= capacity:
+            return self.__data__[:count].copy()
+        start = count % capacity
+        return np.concatenate((self.__data__[start:], self.__data__[:start]))
+
+class RenderStats:
+    """Per-frame statistics of the renderer over a rolling window.
+
+    The write stage records every written frame (stage times, bytes written, changed cells) into
+    fixed-size rings, the tick stage records frame starts and frames skipped because nothing
+    changed. Recording costs a few stores per frame, the percentiles are only computed when read.
+    Totals since the last reset are kept next to the rolling window.
+    """
+    def __init__(self, window: int = 240):
+        """
+        Args:
+            window (int, optional): number of recent frames the percentiles and fps are computed over. Defaults to 240.
+        """
+        self.window = window
+        self.__rings__: Dict[str, RingBuffer] = {name: RingBuffer(window) for name in FRAME_METRICS}
+        self.__frameStarts__ = RingBuffer(window)
+        self.reset()
+
+    def reset(self):
+        """Forget every recorded frame"""
+        for ring in self.__rings__.values():
+            ring.clear()
+        self.__frameStarts__.clear()
+        self.totals = dict.fromkeys(FRAME_METRICS, 0.0)
+        self.frames = 0
+        self.skippedFrames = 0
+        self.cachedFrames = 0
+        self.droppedFrames = 0
+        self.last: dict = {}
+
+    def record_start(self, now: float):
+        """Tick stage: a frame started at perf_counter time now"""
+        self.__frameStarts__.append(now)
+
+    def record_skip(self):
+        """Tick stage: a frame was skipped because it matched the frame already shown"""
+        self.skippedFrames += 1
+
+    def record_frame(self, frame: dict):
+        """Write stage: the stats of a written frame, the FRAME_METRICS it's missing count as 0"""
+        for name, ring in self.__rings__.items():
+            value = frame.get(name, 0)
+            ring.append(value)
+            self.totals[name] += value
+        self.frames += 1
+        self.cachedFrames += bool(frame.get("cached", False))
+        self.last = frame
+
+    def values(self, metric: str) -> np.ndarray:
+        """The recent values of a metric (one of FRAME_METRICS, or frameTime between frame starts), oldest first"""
+        if metric == "frameTime":
+            return np.diff(self.__frameStarts__.values())
+        return self.__rings__[metric].values()
+
+    def percentiles(self, metric: str) -> dict:
+        """p50, p95 and p99 of a metric over the window, 0 before the first frame"""
+        values = self.values(metric)
+        if len(values) == 0:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        p50, p95, p99 = np.percentile(values, (50, 95, 99))
+        return {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+    def mean(self, metric: str) -> float:
+        """Mean of a metric over every frame since the reset"""
+        return self.totals[metric] / self.frames if self.frames else 0.0
+
+    @property
+    def fps(self) -> float:
+        """Frames per second over the recent frame starts, 0 before two frames started"""
+        starts = self.__frameStarts__.values()
+        if len(starts) < 2 or starts[-1] <= starts[0]:
+            return 0.0
+        return (len(starts) - 1) / (starts[-1] - starts[0])
+
+    def summary(self) -> dict:
+        """fps, the frame counters and the percentiles of frameTime and every FRAME_METRICS metric"""
+        summary = {"fps": self.fps, "frames": self.frames, "skippedFrames": self.skippedFrames,
+                   "cachedFrames": self.cachedFrames, "droppedFrames": self.droppedFrames}
+        for metric in ("frameTime",) + FRAME_METRICS:
+            summary[metric] = self.percentiles(metric)
+        return summary
@@ -0,0 +1,82 @@
+import os
+import shutil
+import signal
+import threading
+import time
+from typing import Optional
+
+class TerminalSize:
+    """Cached terminal size, refreshed by SIGWINCH instead of an ioctl on every read.
+
+    Where SIGWINCH isn't available (Windows, or when started outside the main thread) the
+    size is polled at most every pollInterval seconds. poll() debounces resizes: a new size
+    is only reported once it stayed the same for debounce seconds, so dragging the window
+    edge triggers a single resize at the end instead of one per intermediate size.
+    """
+    def __init__(self, debounce: float = 0.15, pollInterval: float = 0.5):
+        """
+        Args:
+            debounce (float, optional): seconds a new size has to hold before poll() reports it. Defaults to 0.15.
+            pollInterval (float, optional): seconds between size queries without SIGWINCH. Defaults to 0.5.
+        """
+        self.debounce = debounce
+        self.pollInterval = pollInterval
+        self.__size__: Optional[os.terminal_size] = None
+        self.__lastQuery__ = 0.0
+        self.__dirty__ = True
+        self.__previousHandler__ = None
+        self.__signalInstalled__ = False
+        self.__settled__: Optional[os.terminal_size] = None
+        self.__pending__: Optional[os.terminal_size] = None
+        self.__pendingSince__ = 0.0
+
+    def start(self):
+        """Install the SIGWINCH handler when possible and take the current size as the settled one"""
+        if hasattr(signal, "SIGWINCH") and threading.current_thread() is threading.main_thread() and not self.__signalInstalled__:
+            try:
+                self.__previousHandler__ = signal.signal(signal.SIGWINCH, self.__on_resize__)
+                self.__signalInstalled__ = True
+            except (ValueError, OSError):
+                pass
+        self.__dirty__ = True
+        self.__settled__ = self.size
+        self.__pending__ = None
+
+    def stop(self):
+        """Restore the previous SIGWINCH handler"""
+        if self.__signalInstalled__:
+            signal.signal(signal.SIGWINCH, self.__previousHandler__ if self.__previousHandler__ is not None else signal.SIG_DFL)
+            self.__signalInstalled__ = False
+            self.__previousHandler__ = None
+
+    def __on_resize__(self, signum, frame):
+        # only mark the size stale, the query happens on the next read
+        self.__dirty__ = True
+        if callable(self.__previousHandler__):
+            self.__previousHandler__(signum, frame)
+
+    @property
+    def size(self) -> os.terminal_size:
+        """The current terminal size, queried again only after a SIGWINCH (or the poll interval without it)"""
+        now = time.monotonic()
+        if self.__dirty__ or (not self.__signalInstalled__ and now - self.__lastQuery__ >= self.pollInterval):
+            self.__dirty__ = False
+            self.__lastQuery__ = now
+            self.__size__ = shutil.get_terminal_size()
+        return self.__size__
+
+    def poll(self) -> Optional[os.terminal_size]:
+        """Check for a resize, returns the new size once it settled and None otherwise"""
+        current = self.size
+        if current == self.__settled__:
+            self.__pending__ = None
+            return None
+        now = time.monotonic()
+        if current != self.__pending__:
+            self.__pending__ = current
+            self.__pendingSince__ = now
+        if now - self.__pendingSince__ >= self.debounce:
+            self.__settled__ = current
+            self.__pending__ = None
+            return current
+        return None
@@ -173,6 +173,40 @@ class Texture:
 
         self.__met__[y, x] = [color.r, color.g, color.b]
 
+    def to_array(self, size: Vector2, background: Color, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Sample the texture over a whole area at once, following the repeat mode like __getitem__
+
+        Args:
+            size (Vector2): the size of the sampled area in pixels.
+            background (Color): color of the pixels outside of the texture bounds.
+            out (np.ndarray, optional): (size.y, size.x, 3) uint8 array to sample into. Defaults to a new array.
+
+        Returns:
+            np.ndarray: (size.y, size.x, 3) uint8 RGB array.
+        """
+        width, height = int(size.x), int(size.y)
+        if out is None:
+            out = np.empty((height, width, 3), dtype=np.uint8)
+        out[:, :] = [background.r, background.g, background.b]
+        tex_height, tex_width = self.__met__.shape[:2]
+        if tex_width == 0 or tex_height == 0:
+            return out
+
+        if self.__repeat_mode__ == REPEAT_MODE.DISABLE:
+            max_x, max_y = min(width, tex_width), min(height, tex_height)
+            out[:max_y, :max_x] = self.__met__[:max_y, :max_x]
+            return out
+
+        if self.__repeat_mode__ == REPEAT_MODE.FINITE:
+            max_x = min(width, int(self.__size__.x * self.__repeat_vector__.x))
+            max_y = min(height, int(self.__size__.y * self.__repeat_vector__.y))
+        else:  # INFINITE mode
+            max_x, max_y = width, height
+        ys = np.arange(max_y) % tex_height
+        xs = np.arange(max_x) % tex_width
+        out[:max_y, :max_x] = self.__met__[ys[:, None], xs]
+        return out
+
     @property
     def size(self) -> Vector2:
         return self.__size__
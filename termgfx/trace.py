@@ -0,0 +1,78 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Optional, TextIO, Union
+
+class FrameTracer:
+    """Opt-in timeline of the render stages, exported as Chrome trace-event JSON.
+
+    The stages record a span (begin and end time) per frame on the thread they run on into a
+    fixed-size ring, the oldest events are dropped once it's full. dump() writes the ring in the
+    trace-event format, to open in chrome://tracing, Perfetto or speedscope. A renderer without a
+    tracer only checks for None, the stages reuse the perf_counter times they take for stats.
+    """
+    def __init__(self, capacity: int = 65536):
+        """
+        Args:
+            capacity (int, optional): number of events kept, the oldest are dropped past it. Defaults to 65536.
+        """
+        self.capacity = capacity
+        # (name, thread id, start, end or None for instants, args or None), appends are atomic
+        self.__events__ = deque(maxlen=capacity)
+        self.__threadNames__: Dict[int, str] = {}
+        self.__origin__ = time.perf_counter()
+
+    def span(self, name: str, start: float, end: float, args: Optional[dict] = None):
+        """Record that a stage ran on the calling thread from start to end
+
+        Args:
+            name (str): stage name.
+            start (float): perf_counter time the stage began.
+            end (float): perf_counter time the stage ended.
+            args (dict, optional): values shown with the event in the viewer. Defaults to None.
+        """
+        thread = threading.get_ident()
+        if thread not in self.__threadNames__:
+            self.__threadNames__[thread] = threading.current_thread().name
+        self.__events__.append((name, thread, start, end, args))
+
+    def instant(self, name: str, args: Optional[dict] = None):
+        """Record an event without a duration (e.g. a skipped frame) on the calling thread now"""
+        self.span(name, time.perf_counter(), None, args)
+
+    def clear(self):
+        self.__events__.clear()
+
+    def __len__(self) -> int:
+        return len(self.__events__)
+
+    def trace_events(self) -> List[dict]:
+        """The recorded events as trace events: thread name metadata, complete (X) and instant (i) events in microseconds"""
+        pid = os.getpid()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": thread, "args": {"name": name}}
+                  for thread, name in list(self.__threadNames__.items())]
+        for name, thread, start, end, args in list(self.__events__):
+            event = {"name": name, "cat": "termgfx", "pid": pid, "tid": thread, "ts": (start - self.__origin__) * 1e6}
+            if end is None:
+                event.update(ph="i", s="t")
+            else:
+                event.update(ph="X", dur=(end - start) * 1e6)
+            if args:
+                event["args"] = args
+            events.append(event)
+        return events
+
+    def dump(self, file: Union[str, TextIO]):
+        """Write the events as a Chrome trace-event JSON object
+
+        Args:
+            file (str | TextIO): path or text stream to write to.
+        """
+        trace = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}
+        if isinstance(file, str):
+            with open(file, "w") as stream:
+                json.dump(trace, stream)
+        else:
+            json.dump(trace, file)
@@ -0,0 +1,336 @@
+import re
+import numpy as np
+from typing import Optional, Tuple
+from .palette import PALETTE_256_FLAG, PALETTE_16_FLAG
+
+# CSI sequences (with a private marker and intermediate bytes), OSC strings and ESC sequences with
+# intermediate bytes (character sets), two byte ESC sequences, C0 control characters and runs of printed characters
+_TOKEN = re.compile(r"\033\[([<=>?]?)([0-9;]*)([ -/]*)([@-~])"
+                    r"|\033\][^\x07\033]*(?:\x07|\033\\)|\033[ -/]+[0-~]"
+                    r"|\033([0-~])"
+                    r"|([\x00-\x1f\x7f])"
+                    r"|([^\x00-\x1f\x7f\033]+)", re.S)
+
+# what a glyph shows in its (top, bottom) half, as 'fg' or 'bg'
+_GLYPH_HALVES = {
+    "▀": ("fg", "bg"),
+    "▄": ("bg", "fg"),
+    "█": ("fg", "fg"),
+    " ": ("bg", "bg"),
+}
+
+# SGR attributes without an effect on the cell colors (bold, italic, underline, blink, ... and their resets)
+_IGNORED_SGR = {1, 2, 3, 4, 5, 6, 8, 9, 21, 22, 23, 24, 25, 28, 29, 53, 55}
+
+class VirtualTerminal:
+    """Model of a terminal screen, a grid of glyph / fg / bg cells the escape stream is applied to.
+
+    It's used to check that encoded frames reproduce the framebuffer and to count what they cost
+    on the wire. Supported: printing with the deferred wrap of real terminals at the right margin
+    (autowrap can be turned off, DECAWM), CR / LF / BS / HT, cursor positioning (CUP, HVP, CHA, HPA,
+    VPA, CUU, CUD, CUF, CUB, CNL, CPL), save / restore cursor (DECSC / DECRC, CSI s / u), SGR colors
+    (24-bit, 256 and 16 color, default colors and reverse video), REP, erasing (ED, EL, ECH),
+    scroll regions (DECSTBM with SU / SD, IND, NEL, RI), line editing (ICH, DCH, IL, DL), full reset
+    (RIS) and the private modes for the cursor (25) and synchronized output (2026). Other private
+    modes, OSC strings and text attributes are ignored, any other sequence raises a ValueError so
+    unexpected output doesn't go unnoticed.
+    Blank cells left by erasing, scrolling and editing take the current background. Colors are kept
+    packed the way the encoder packs them (0xRRGGBB, or palette indices with their mode flag), -1 is
+    the default color.
+    bytesFed, printedCells and escapeSequences count what was fed since the last reset_counters().
+    """
+    def __init__(self, columns: int, lines: int):
+        self.columns = columns
+        self.lines = lines
+        self.reset()
+        self.reset_counters()
+
+    def reset(self):
+        """Full reset (RIS): blank screen in the default colors, cursor home, modes and scroll region cleared"""
+        self.chars = np.full((self.lines, self.columns), " ", dtype="<U1")
+        self.fgColors = np.full((self.lines, self.columns), -1, dtype=np.int64)
+        self.bgColors = np.full((self.lines, self.columns), -1, dtype=np.int64)
+        self.row = self.col = 0
+        self.fg = self.bg = -1
+        self.reverse = False
+        self.wrapPending = False
+        self.autoWrap = True
+        self.cursorVisible = True
+        self.synchronized = False
+        self.scrollTop = 0
+        self.scrollBottom = self.lines - 1
+        self.__saved__ = (0, 0, -1, -1, False)
+        self.__last__ = " "
+
+    def reset_counters(self):
+        self.bytesFed = 0
+        self.printedCells = 0
+        self.escapeSequences = 0
+
+    def feed(self, data: bytes):
+        """Interpret a chunk of the escape stream, sequences must not be split across chunks"""
+        self.bytesFed += len(data)
+        for match in _TOKEN.finditer(data.decode("utf-8")):
+            private, params, intermediate, final, escape, control, text = match.groups()
+            if text is not None:
+                self.__print__(text)
+            elif control is not None:
+                self.__control__(control)
+            else:
+                self.escapeSequences += 1
+                if final is not None:
+                    values = [int(p) if p else 0 for p in params.split(";")] if params else []
+                    if private:
+                        self.__private__(private, values, final)
+                    elif intermediate:
+                        raise ValueError(f"unsupported sequence CSI {params} {intermediate}{final}")
+                    else:
+                        self.__csi__(values, final)
+                elif escape is not None:
+                    self.__escape__(escape)
+
+    def text(self) -> str:
+        """The glyphs on the screen, one line of text per terminal line"""
+        return "\n".join("".join(line) for line in self.chars)
+
+    def cell_colors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The packed (top, bottom) colors shown by every cell of half block, full block or space glyphs"""
+        top = np.full((self.lines, self.columns), -1, dtype=np.int64)
+        bottom = np.full((self.lines, self.columns), -1, dtype=np.int64)
+        for glyph, (topHalf, bottomHalf) in _GLYPH_HALVES.items():
+            mask = self.chars == glyph
+            top[mask] = (self.fgColors if topHalf == "fg" else self.bgColors)[mask]
+            bottom[mask] = (self.fgColors if bottomHalf == "fg" else self.bgColors)[mask]
+        return top, bottom
+
+    def __print__(self, text: str):
+        # whole runs are written into the grid a line at a time
+        fg, bg = (self.bg, self.fg) if self.reverse else (self.fg, self.bg)
+        self.printedCells += len(text)
+        self.__last__ = text[-1]
+        start = 0
+        while start < len(text):
+            if self.wrapPending:
+                if self.autoWrap:
+                    self.col = 0
+                    self.__line_feed__()
+                self.wrapPending = False
+            count = min(len(text) - start, self.columns - self.col)
+            if not self.autoWrap and self.col == self.columns - 1:
+                # without autowrap the last column is overwritten until the cursor moves
+                start = len(text) - 1
+                count = 1
+            self.chars[self.row, self.col:self.col + count] = list(text[start:start + count])
+            self.fgColors[self.row, self.col:self.col + count] = fg
+            self.bgColors[self.row, self.col:self.col + count] = bg
+            start += count
+            if self.col + count >= self.columns:
+                self.col = self.columns - 1
+                self.wrapPending = True
+            else:
+                self.col += count
+
+    def __line_feed__(self):
+        if self.row == self.scrollBottom:
+            self.__scroll__(1)
+        elif self.row < self.lines - 1:
+            self.row += 1
+
+    def __reverse_index__(self):
+        if self.row == self.scrollTop:
+            self.__scroll__(-1)
+        elif self.row > 0:
+            self.row -= 1
+
+    def __blank__(self, rows, cols):
+        self.chars[rows, cols] = " "
+        self.fgColors[rows, cols] = self.fg
+        self.bgColors[rows, cols] = self.bg
+
+    def __scroll__(self, count: int, top: Optional[int] = None):
+        # move the lines of the scroll region (from line top) up by count, down for negative counts
+        top, bottom = self.scrollTop if top is None else top, self.scrollBottom + 1
+        count = max(-(bottom - top), min(bottom - top, count))
+        for grid in (self.chars, self.fgColors, self.bgColors):
+            if count > 0:
+                grid[top:bottom - count] = grid[top + count:bottom].copy()
+            elif count < 0:
+                grid[top - count:bottom] = grid[top:bottom + count].copy()
+        if count > 0:
+            self.__blank__(slice(bottom - count, bottom), slice(None))
+        elif count < 0:
+            self.__blank__(slice(top, top - count), slice(None))
+
+    def __edit_line__(self, count: int):
+        # insert count blanks at the cursor (delete count cells for negative counts), the line's tail shifts
+        row, col = self.row, self.col
+        count = max(-(self.columns - col), min(self.columns - col, count))
+        for grid in (self.chars, self.fgColors, self.bgColors):
+            if count > 0:
+                grid[row, col + count:] = grid[row, col:self.columns - count].copy()
+            elif count < 0:
+                grid[row, col:self.columns + count] = grid[row, col - count:].copy()
+        if count > 0:
+            self.__blank__(row, slice(col, col + count))
+        elif count < 0:
+            self.__blank__(row, slice(self.columns + count, self.columns))
+
+    def __control__(self, control: str):
+        if control == "\r":
+            self.col = 0
+        elif control == "\n" or control == "\x0b" or control == "\x0c":
+            self.__line_feed__()
+        elif control == "\b":
+            self.col = max(0, self.col - 1)
+        elif control == "\t":
+            self.col = min(self.columns - 1, (self.col // 8 + 1) * 8)
+        else:
+            # BEL, NUL, shift-in / out and the other C0 controls don't touch the screen
+            return
+        self.wrapPending = False
+
+    def __escape__(self, final: str):
+        if final == "7":
+            self.__saved__ = (self.row, self.col, self.fg, self.bg, self.reverse)
+        elif final == "8":
+            self.row, self.col, self.fg, self.bg, self.reverse = self.__saved__
+        elif final == "D":
+            self.__line_feed__()
+        elif final == "E":
+            self.col = 0
+            self.__line_feed__()
+        elif final == "M":
+            self.__reverse_index__()
+        elif final == "c":
+            self.reset()
+            return
+        elif final in "=>\\":
+            # keypad modes and a stray string terminator
+            return
+        else:
+            raise ValueError(f"unsupported sequence ESC {final}")
+        self.wrapPending = False
+
+    def __private__(self, marker: str, params: list, final: str):
+        if marker != "?" or final not in "hl":
+            # device attribute queries and the like, nothing on the screen changes
+            return
+        enabled = final == "h"
+        for mode in params:
+            if mode == 25:
+                self.cursorVisible = enabled
+            elif mode == 7:
+                self.autoWrap = enabled
+            elif mode == 2026:
+                self.synchronized = enabled
+
+    def __erase__(self, mode: int, line: bool):
+        # ED (line=False) and EL: 0 from the cursor to the end, 1 from the start to the cursor, 2 (and 3) all
+        row, col = self.row, self.col
+        if mode == 0:
+            self.__blank__(row, slice(col, None))
+            if not line:
+                self.__blank__(slice(row + 1, None), slice(None))
+        elif mode == 1:
+            self.__blank__(row, slice(0, col + 1))
+            if not line:
+                self.__blank__(slice(0, row), slice(None))
+        elif line:
+            self.__blank__(row, slice(None))
+        else:
+            self.__blank__(slice(None), slice(None))
+
+    def __csi__(self, params: list, final: str):
+        count = max(1, params[0]) if params else 1
+        if final == "m":
+            self.__sgr__(params or [0])
+            return
+        if final == "b":
+            self.__print__(self.__last__ * count)
+            return
+        if final == "r":
+            top = max(1, params[0] if params else 1)
+            bottom = min(self.lines, params[1] if len(params) > 1 and params[1] else self.lines)
+            if top < bottom:
+                self.scrollTop, self.scrollBottom = top - 1, bottom - 1
+            self.row = self.col = 0
+        elif final == "s":
+            self.__saved__ = (self.row, self.col, self.fg, self.bg, self.reverse)
+            return
+        elif final == "u":
+            self.row, self.col = self.__saved__[:2]
+        elif final == "S":
+            self.__scroll__(count)
+        elif final == "T":
+            self.__scroll__(-count)
+        elif final in "LM":
+            # IL / DL scroll the part of the region below the cursor, outside the region they do nothing
+            if self.scrollTop <= self.row <= self.scrollBottom:
+                self.__scroll__(-count if final == "L" else count, self.row)
+            self.col = 0
+        elif final == "@":
+            self.__edit_line__(count)
+        elif final == "P":
+            self.__edit_line__(-count)
+        elif final == "X":
+            self.__blank__(self.row, slice(self.col, min(self.columns, self.col + count)))
+        elif final == "J":
+            self.__erase__(params[0] if params else 0, False)
+        elif final == "K":
+            self.__erase__(params[0] if params else 0, True)
+        elif final in "Hf":
+            self.row = min(self.lines, max(1, params[0] if params else 1)) - 1
+            self.col = min(self.columns, max(1, params[1] if len(params) > 1 else 1)) - 1
+        elif final in "G`":
+            self.col = min(self.columns, count) - 1
+        elif final == "d":
+            self.row = min(self.lines, count) - 1
+        elif final == "A":
+            self.row = max(0, self.row - count)
+        elif final == "B":
+            self.row = min(self.lines - 1, self.row + count)
+        elif final == "C":
+            self.col = min(self.columns - 1, self.col + count)
+        elif final == "D":
+            self.col = max(0, self.col - count)
+        elif final == "E":
+            self.row, self.col = min(self.lines - 1, self.row + count), 0
+        elif final == "F":
+            self.row, self.col = max(0, self.row - count), 0
+        else:
+            raise ValueError(f"unsupported sequence CSI {params} {final}")
+        self.wrapPending = False
+
+    def __sgr__(self, params: list):
+        i = 0
+        while i < len(params):
+            p = params[i]
+            if p == 0:
+                self.fg = self.bg = -1
+                self.reverse = False
+            elif p in (38, 48):
+                if params[i + 1] == 2:
+                    color = (params[i + 2] << 16) | (params[i + 3] << 8) | params[i + 4]
+                    i += 4
+                else:
+                    color = PALETTE_256_FLAG | params[i + 2]
+                    i += 2
+                if p == 38:
+                    self.fg = color
+                else:
+                    self.bg = color
+            elif p == 39:
+                self.fg = -1
+            elif p == 49:
+                self.bg = -1
+            elif p == 7:
+                self.reverse = True
+            elif p == 27:
+                self.reverse = False
+            elif 30 <= p <= 37 or 90 <= p <= 97:
+                self.fg = PALETTE_16_FLAG | (p - 30 if p < 90 else p - 82)
+            elif 40 <= p <= 47 or 100 <= p <= 107:
+                self.bg = PALETTE_16_FLAG | (p - 40 if p < 100 else p - 92)
+            elif p not in _IGNORED_SGR:
+                raise ValueError(f"unsupported SGR parameter {p}")
+            i += 1
@@ -0,0 +1,166 @@
+"""
+Randomized property checks of the encoder: random frame sequences (noise, moving blocks,
+unchanged frames, scrolled content) are encoded with random options and replayed on the virtual
+terminal, which has to show every frame exactly (or within the threshold of the lossy mode).
+Covers FrameEncoder with origins and changed-line masks, the cursor moves, the thread band
+encoder, scrolling and the headless renderer end to end. Every trial runs on a fixed seed.
+"""
+
+import numpy as np
+import pytest
+from termgfx import HeadlessRenderer, Vector2, RGB_BLACK
+from termgfx.encoder import FrameEncoder, pack_cells, pack_colors, color_distance
+from termgfx.fingerprint import line_hashes, changed_lines
+from termgfx.parallel import ThreadBandEncoder, row_bands
+from termgfx.scroll import detect_shift, scroll_sequence
+from termgfx.vterm import VirtualTerminal
+
+def random_options(rng: np.random.Generator) -> dict:
+    colorMode = str(rng.choice(["truecolor", "256", "16"]))
+    return {"colorMode": colorMode, "dither": str(rng.choice(["none", "bayer", "diffusion"])) if colorMode != "truecolor" else "none",
+            "threshold": float(rng.choice([0.0, 0.0, 6.0])), "repeat": bool(rng.integers(2)),
+            "optimizeGlyphs": bool(rng.integers(2)), "optimizeMoves": bool(rng.integers(2))}
+
+def random_frames(rng: np.random.Generator, height: int, width: int, count: int):
+    """Yield (frame, (dx, dy)) with the content shift of every frame from the previous one"""
+    # few distinct colors so runs, reused SGR states and gaps show up
+    colors = rng.integers(0, 256, (int(rng.integers(2, 8)), 3), dtype=np.uint8)
+    frame = colors[rng.integers(0, len(colors), (height, width))]
+    yield frame, (0, 0)
+    for _ in range(count - 1):
+        frame = frame.copy()
+        kind = rng.integers(4)
+        shift = (0, 0)
+        if kind == 0:
+            ys, xs = rng.integers(0, height, 8), rng.integers(0, width, 8)
+            frame[ys, xs] = colors[rng.integers(0, len(colors), 8)]
+        elif kind == 1:
+            y, x = rng.integers(0, height), rng.integers(0, width)
+            frame[y:y + int(rng.integers(1, 6)), x:x + int(rng.integers(1, 12))] = colors[rng.integers(len(colors))]
+        elif kind == 2 and height > 4 and width > 2:
+            shift = (int(rng.integers(-2, 3)), 2 * int(rng.integers(-1, 2)))
+            frame = np.roll(frame, shift, axis=(1, 0))
+        yield frame, shift
+
+def check_screen(terminal: VirtualTerminal, expected, options: dict, origin=(0, 0)):
+    top, bottom = expected
+    x, y = origin
+    shownTop, shownBottom = terminal.cell_colors()
+    shownTop = shownTop[y:y + top.shape[0], x:x + top.shape[1]]
+    shownBottom = shownBottom[y:y + top.shape[0], x:x + top.shape[1]]
+    if options.get("threshold", 0) > 0:
+        assert (shownTop >= 0).all() and (shownBottom >= 0).all(), f"cells never painted with {options}"
+        mode = options["colorMode"]
+        error = np.maximum(color_distance(shownTop.astype(np.uint32), top, mode), color_distance(shownBottom.astype(np.uint32), bottom, mode))
+        assert (error <= options["threshold"] + 1e-3).all(), f"display error above the threshold with {options}"
+    else:
+        assert (shownTop == top).all() and (shownBottom == bottom).all(), f"screen differs with {options}"
+
+def expected_cells(frame: np.ndarray, options: dict, bands=None, rowOffset: int = 0):
+    """The cells the encoder means to show, band encoders pack (and diffuse) every band on its own"""
+    mode, dither = options.get("colorMode", "truecolor"), options.get("dither", "none")
+    if bands is None:
+        return pack_cells(frame, RGB_BLACK, mode, dither, rowOffset)
+    packed = [pack_cells(frame[start:end], RGB_BLACK, mode, dither, start) for start, end in bands if start < end]
+    return np.concatenate([top for top, _ in packed]), np.concatenate([bottom for _, bottom in packed])
+
+@pytest.mark.parametrize("seed", range(100))
+def test_frame_encoder(seed: int):
+    rng = np.random.default_rng(seed)
+    options = random_options(rng)
+    height, width = int(rng.integers(1, 24)), int(rng.integers(1, 40))
+    origin = (int(rng.integers(0, 4)), int(rng.integers(0, 3)))
+    encoder = FrameEncoder(RGB_BLACK, **options)
+    terminal = VirtualTerminal(width + origin[0] + 1, (height + 1) // 2 + origin[1] + 1)
+    previous = None
+    for frame, (dx, dy) in random_frames(rng, height, width, 12):
+        hashes = line_hashes(frame)
+        lines = changed_lines(previous, hashes) if rng.integers(2) else None
+        previous = hashes
+        if dx or dy:
+            terminal.feed(scroll_sequence(dx, dy // 2, (height + 1) // 2, Vector2(*origin)))
+            encoder.shift(dx, dy // 2)
+            lines = None
+        terminal.feed(encoder.encode(frame, Vector2(*origin), lines))
+        check_screen(terminal, expected_cells(frame, options, rowOffset=2 * origin[1]), options, origin)
+
+@pytest.mark.parametrize("optimizeMoves", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_cursor_moves(seed: int, optimizeMoves: bool):
+    # scattered single cell changes over a large screen, the moves between them take every path
+    rng = np.random.default_rng(seed)
+    frame = np.zeros((40, 60, 3), dtype=np.uint8)
+    encoder = FrameEncoder(RGB_BLACK, optimizeMoves=optimizeMoves, optimizeGlyphs=bool(seed % 2), repeat=bool(seed % 2))
+    terminal = VirtualTerminal(60, 20)
+    for _ in range(20):
+        frame = frame.copy()
+        ys, xs = rng.integers(0, 40, 40), rng.integers(0, 60, 40)
+        frame[ys, xs] = rng.integers(0, 256, (40, 3))
+        terminal.feed(encoder.encode(frame))
+        check_screen(terminal, pack_cells(frame, RGB_BLACK), {"optimizeMoves": optimizeMoves})
+
+@pytest.mark.parametrize("hud", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_detected_scroll(seed: int, hud: bool):
+    # a camera walking over a world, optionally under a fixed bar that breaks the whole-screen shift
+    rng = np.random.default_rng(seed)
+    colors = rng.integers(0, 256, (6, 3), dtype=np.uint8)
+    world = colors[rng.integers(0, len(colors), (120, 90))]
+    encoder = FrameEncoder(RGB_BLACK)
+    terminal = VirtualTerminal(40, 15)
+    previous = None
+    x, y = 30, 40
+    for dx, dy in [(0, 2)] * 5 + [(1, 0)] * 5 + [(-1, -2)] * 5:
+        x, y = x + dx, y + dy
+        frame = world[y:y + 30, x:x + 40].copy()
+        if hud:
+            frame[-4:] = (40, 40, 40)
+        pixels = pack_colors(frame)
+        if previous is not None:
+            shiftX, shiftY = detect_shift(previous, pixels)
+            if shiftX or shiftY:
+                terminal.feed(scroll_sequence(shiftX, shiftY // 2, 15))
+                encoder.shift(shiftX, shiftY // 2)
+        previous = pixels
+        terminal.feed(encoder.encode(frame))
+        check_screen(terminal, pack_cells(frame, RGB_BLACK), {})
+
+@pytest.mark.parametrize("seed", range(50))
+def test_band_encoder(seed: int):
+    rng = np.random.default_rng(seed)
+    options = random_options(rng)
+    height, width, count = int(rng.integers(1, 30)), int(rng.integers(1, 40)), int(rng.integers(1, 5))
+    encoder = ThreadBandEncoder(RGB_BLACK, count, options)
+    terminal = VirtualTerminal(width, (height + 1) // 2)
+    previous = None
+    try:
+        for frame, (dx, dy) in random_frames(rng, height, width, 12):
+            hashes = line_hashes(frame)
+            lines = changed_lines(previous, hashes)
+            previous = hashes
+            encoder.resize(frame.shape)
+            if dx or dy:
+                terminal.feed(scroll_sequence(dx, dy // 2, (height + 1) // 2))
+                encoder.shift(dx, dy // 2)
+                lines = None
+            terminal.feed(b"".join(encoder.encode(frame, lines)))
+            check_screen(terminal, expected_cells(frame, options, row_bands(height, count)), options)
+    finally:
+        encoder.close()
+
+@pytest.mark.parametrize("seed", range(25))
+def test_headless_renderer(seed: int):
+    rng = np.random.default_rng(seed)
+    options = random_options(rng)
+    width, height = int(rng.integers(1, 40)), int(rng.integers(1, 30))
+    frames = [frame for frame, _ in random_frames(rng, height, width, 16)]
+    # loop over the frames twice so the frame cache replays transitions
+    sequence = frames + frames
+    renderer = HeadlessRenderer(lambda size: sequence.pop(0), Vector2(width, height), threadCount=int(rng.integers(1, 4)),
+                                colorMode=options["colorMode"], dither=options["dither"], colorThreshold=options["threshold"],
+                                repeatSequence=options["repeat"], optimizeGlyphs=options["optimizeGlyphs"],
+                                optimizeMoves=options["optimizeMoves"], detectScroll=bool(rng.integers(2)))
+    renderer.run(len(sequence))
+    terminal = VirtualTerminal(width, (height + 1) // 2)
+    terminal.feed(renderer.output)
+    check_screen(terminal, expected_cells(frames[-1], options, row_bands(height, renderer.threadCount)), options)
@@ -0,0 +1,57 @@
+import numpy as np
+from termgfx import HeadlessRenderer, Vector2
+from termgfx.framecache import EncodedFrameCache
+
+def test_evicts_least_recently_used_past_the_budget():
+    cache = EncodedFrameCache(10)
+    cache.put((1, 2), b"aaaa")
+    cache.put((2, 3), b"bbbb")
+    cache.put((3, 4), b"cccc")
+    assert cache.get((1, 2)) is None
+    assert cache.get((2, 3))[0] == b"bbbb"
+    assert cache.stats["entries"] == 2 and cache.stats["bytes"] == 8 and cache.evictions == 1
+
+def test_hit_touches_the_entry():
+    cache = EncodedFrameCache(10)
+    cache.put((1, 2), b"aaaa", {"changedCells": 3})
+    cache.put((2, 3), b"bbbb")
+    assert cache.get((1, 2)) == (b"aaaa", {"changedCells": 3})
+    cache.put((3, 4), b"cccc")
+    # (2, 3) was the least recently used one
+    assert cache.get((2, 3)) is None
+    assert cache.get((1, 2)) is not None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+def test_replacing_and_oversized_outputs():
+    cache = EncodedFrameCache(10)
+    cache.put((1, 2), b"aaaa")
+    cache.put((1, 2), b"aaaaaa")
+    cache.put((2, 3), b"b" * 11)
+    assert cache.stats["bytes"] == 6 and cache.stats["entries"] == 1
+    cache.clear()
+    assert cache.stats["entries"] == 0 and cache.stats["bytes"] == 0
+
+def test_renderer_replays_and_clears_on_resize():
+    frames = []
+    def tick(size):
+        frame = np.zeros((int(size.y), int(size.x), 3), dtype=np.uint8)
+        if len(frames) % 2:
+            frame[: frame.shape[0] // 2] = 200
+        frames.append(frame)
+        return frame
+    renderer = HeadlessRenderer(tick, Vector2(8, 6), threadCount=2)
+    report = renderer.run(10)
+    # A -> B and B -> A are encoded once, the cache replays the later transitions
+    assert report["cachedFrames"] == 7
+    assert renderer.frameCacheStats["entries"] == 2
+    renderer.resolution = Vector2(10, 6)
+    frames.clear()
+    renderer.run(1)
+    assert renderer.frameCacheStats["entries"] == 0
+    renderer.run(4)
+    assert renderer.frameCacheStats["entries"] == 2
+    hits = renderer.frameCacheStats["hits"]
+    # a run at the same size keeps the entries
+    frames.clear()
+    renderer.run(3)
+    assert renderer.frameCacheStats["hits"] == hits + 2
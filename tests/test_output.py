@@ -0,0 +1,63 @@
+import io
+import os
+import threading
+import time
+import pytest
+from termgfx.output import FrameWriter, SYNC_BEGIN, SYNC_END, supports_synchronized_output
+
+def test_synchronized_frames_are_wrapped():
+    sink = io.BytesIO()
+    writer = FrameWriter(sink, synchronized=True)
+    writer.begin()
+    writer.append(b"ab")
+    writer.append(b"cd")
+    assert writer.flush() == len(SYNC_BEGIN) + 4 + len(SYNC_END)
+    assert sink.getvalue() == SYNC_BEGIN + b"abcd" + SYNC_END
+
+def test_empty_frames_are_not_written():
+    sink = io.BytesIO()
+    writer = FrameWriter(sink, synchronized=True)
+    writer.begin()
+    assert writer.flush() == 0
+    assert writer.write(b"") == 0
+    assert sink.getvalue() == b""
+
+def test_buffer_grows_past_its_capacity():
+    sink = io.BytesIO()
+    writer = FrameWriter(sink, capacity=4, synchronized=False)
+    writer.write(b"x" * 10)
+    writer.write(b"y" * 3)
+    assert sink.getvalue() == b"x" * 10 + b"y" * 3
+
+def test_synchronized_output_detection():
+    assert supports_synchronized_output({"TERM": "xterm-kitty"})
+    assert supports_synchronized_output({"WT_SESSION": "1"})
+    assert not supports_synchronized_output({"TERM": "xterm-256color"})
+
+@pytest.mark.skipif(not hasattr(os, "set_blocking"), reason="needs non-blocking pipes")
+def test_partial_writes_and_eagain_are_retried():
+    read, write = os.pipe()
+    os.set_blocking(write, False)
+    received = bytearray()
+
+    def drain():
+        # a slow reader, so the pipe fills up and the writer gets partial writes and EAGAIN
+        while True:
+            time.sleep(0.001)
+            chunk = os.read(read, 4096)
+            if not chunk:
+                return
+            received.extend(chunk)
+    reader = threading.Thread(target=drain)
+    reader.start()
+    stream = os.fdopen(write, "wb")
+    try:
+        writer = FrameWriter(stream, synchronized=False)
+        assert writer.fd == write
+        frame = bytes(range(256)) * 2048
+        assert writer.write(frame) == len(frame)
+    finally:
+        stream.close()
+        reader.join()
+        os.close(read)
+    assert bytes(received) == frame
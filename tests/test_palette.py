@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from termgfx.palette import palette_colors, quantize
+
+def gradient(width: int, height: int) -> np.ndarray:
+    x = np.linspace(0, 1, width)[None, :, None]
+    y = np.linspace(0, 1, height)[:, None, None]
+    return (np.concatenate((x + 0 * y, y + 0 * x, (1 - x) * y), axis=2) * 255).astype(np.uint8)
+
+def shaded_sphere(width: int, height: int) -> np.ndarray:
+    y, x = np.mgrid[0:height, 0:width]
+    dx, dy = (x - width / 2) / (width / 3), (y - height / 2) / (height / 3)
+    light = np.clip(1 - dx * dx - dy * dy, 0, 1) ** 0.5
+    return (light[..., None] * np.array([200, 160, 120])).astype(np.uint8)
+
+def box_error(frame: np.ndarray, shown: np.ndarray, size: int = 4) -> float:
+    """Mean absolute difference of the size x size pixel averages, the banding seen from a distance"""
+    height, width = (frame.shape[0] // size) * size, (frame.shape[1] // size) * size
+    def blocks(pixels):
+        pixels = pixels[:height, :width].astype(np.float32)
+        return pixels.reshape(height // size, size, width // size, size, 3).mean(axis=(1, 3))
+    return float(np.abs(blocks(frame) - blocks(shown)).mean())
+
+@pytest.mark.parametrize("mode", ["256", "16"])
+@pytest.mark.parametrize("scene", [gradient, shaded_sphere])
+def test_bayer_dither_reduces_banding(scene, mode: str):
+    frame = scene(160, 96)
+    plain = box_error(frame, palette_colors(mode)[quantize(frame, mode)])
+    dithered = box_error(frame, palette_colors(mode)[quantize(frame, mode, dither="bayer")])
+    assert dithered <= plain
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from termgfx import RGB_BLACK
+from termgfx.parallel import ProcessBandEncoder, ThreadBandEncoder
+
+FRAME = np.zeros((8, 6, 3), dtype=np.uint8)
+
+@pytest.mark.parametrize("bandEncoder", [ThreadBandEncoder, ProcessBandEncoder])
+def test_worker_error_raises_in_parent(bandEncoder):
+    # an unknown color mode only fails once a worker encodes its band
+    encoder = bandEncoder(RGB_BLACK, 2, {"colorMode": "88"})
+    try:
+        with pytest.raises(KeyError):
+            encoder.encode(FRAME)
+        # the workers keep serving after an error
+        with pytest.raises(KeyError):
+            encoder.encode(FRAME)
+    finally:
+        encoder.close()
+
+@pytest.mark.parametrize("bandEncoder", [ThreadBandEncoder, ProcessBandEncoder])
+def test_bands_are_stitched_in_order(bandEncoder):
+    frame = np.arange(8 * 6 * 3, dtype=np.uint8).reshape(8, 6, 3)
+    encoder = bandEncoder(RGB_BLACK, 3)
+    try:
+        chunks = encoder.encode(frame)
+        assert len(chunks) == 3 and all(chunks)
+        assert encoder.changedCells == 4 * 6
+        assert encoder.encode(frame) == [b""] * 3
+    finally:
+        encoder.close()
+
+def test_shift_with_unknown_band_repaints_everything():
+    frame = np.arange(8 * 6 * 3, dtype=np.uint8).reshape(8, 6, 3)
+    encoder = ThreadBandEncoder(RGB_BLACK, 2)
+    try:
+        encoder.encode(frame)
+        # the second band forgets what the terminal shows
+        start, end = encoder.__bands__[1]
+        encoder.__inboxes__[1].put(("bands", start, end))
+        encoder.shift(0, 1)
+        encoder.encode(frame)
+        assert encoder.changedCells == 4 * 6
+    finally:
+        encoder.close()
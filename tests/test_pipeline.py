@@ -0,0 +1,26 @@
+import pytest
+from termgfx.pipeline import FramePipeline
+
+SHAPE = (2, 2, 3)
+
+def test_info_travels_with_its_frame():
+    written = []
+    pipeline = FramePipeline(SHAPE, lambda frame, info: (int(frame[0, 0, 0]), info), written.append)
+    pipeline.start()
+    for i in range(20):
+        frame = pipeline.acquire()
+        frame[:] = i
+        pipeline.submit(frame, f"frame {i}")
+    pipeline.stop()
+    assert written == [(i, f"frame {i}") for i in range(20)]
+
+def test_stage_error_is_raised():
+    def encode(frame, info):
+        raise ValueError("encode failed")
+    pipeline = FramePipeline(SHAPE, encode, lambda encoded: None)
+    pipeline.start()
+    with pytest.raises(RuntimeError) as error:
+        for _ in range(10):
+            pipeline.submit(pipeline.acquire())
+        pipeline.stop()
+    assert isinstance(error.value.__cause__, ValueError)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from termgfx import HeadlessRenderer, Vector2, RGB_BLACK
+from termgfx.encoder import pack_cells
+from termgfx.hud import PerfHud
+from termgfx.vterm import VirtualTerminal
+
+def screen_matches(renderer: HeadlessRenderer, frame: np.ndarray) -> bool:
+    terminal = VirtualTerminal(frame.shape[1], (frame.shape[0] + 1) // 2)
+    terminal.feed(renderer.output)
+    top, bottom = pack_cells(frame, RGB_BLACK)
+    shownTop, shownBottom = terminal.cell_colors()
+    return bool((shownTop == top).all() and (shownBottom == bottom).all())
+
+def test_odd_scroll_hint_scrolls_horizontally():
+    rng = np.random.default_rng(0)
+    world = rng.integers(0, 256, (9, 20, 3), dtype=np.uint8)
+    frames = [world[:8, :12], world[1:9, 1:13]]
+    renderer = HeadlessRenderer(None, Vector2(12, 8), threadCount=2, detectScroll=False)
+
+    def tick(size):
+        if len(frames) == 1:
+            renderer.scroll(-1, -1)
+        return frames.pop(0)
+    renderer.onTick = tick
+    renderer.run(2)
+    assert renderer.frameStats["scroll"] == (-1, 0)
+    assert screen_matches(renderer, world[1:9, 1:13])
+
+def test_unsupported_options_are_rejected():
+    for options in ({"encodeStrategy": "fibers"}, {"colorMode": "88"}, {"dither": "floyd"}):
+        with pytest.raises(ValueError):
+            HeadlessRenderer(**options)
+
+@pytest.mark.parametrize("corner", ["top-right", "bottom-left"])
+def test_hud_is_composited_and_repainted(corner: str):
+    width, height = 60, 31
+    background = np.full((height, width, 3), 90, dtype=np.uint8)
+    changed = []
+    renderer = HeadlessRenderer(lambda size: background, Vector2(width, height), threadCount=2, showHud=True,
+                                statsCallback=lambda stats: changed.append(stats["changedCells"]))
+    renderer.hud = PerfHud(corner, interval=0.0)
+    renderer.run(8)
+    hudWidth, hudHeight = renderer.hud.size
+    # the overlay sits on whole terminal lines, an odd frame height leaves the last pixel row below it
+    y = 0 if corner == "top-right" else height - 1 - hudHeight
+    x = width - hudWidth if corner == "top-right" else 0
+    expected = background.copy()
+    expected[y:y + hudHeight, x:x + hudWidth] = renderer.hud.__patch__
+    assert screen_matches(renderer, expected)
+    # after the first frame only the overlay's cells change
+    assert len(changed) > 1
+    assert all(0 < cells <= hudWidth * hudHeight // 2 for cells in changed[1:])
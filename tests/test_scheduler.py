@@ -0,0 +1,83 @@
+import pytest
+from termgfx import scheduler
+from termgfx.scheduler import FrameScheduler
+
+class FakeClock:
+    """perf_counter and sleep of the scheduler module, sleeping moves the clock forward"""
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler.time, "perf_counter", clock.perf_counter)
+    monkeypatch.setattr(scheduler.time, "sleep", clock.sleep)
+    return clock
+
+def test_wait_takes_the_frame_work_out_of_the_sleep(clock):
+    pacer = FrameScheduler(10)
+    pacer.start()
+    starts = []
+    for work in (0.02, 0.05, 0.0):
+        pacer.begin_frame()
+        starts.append(clock.now)
+        clock.now += work
+        pacer.wait()
+    assert clock.sleeps == pytest.approx([0.08, 0.05, 0.1])
+    # the frames start on the deadlines whatever they spent working
+    assert starts == pytest.approx([100.0, 100.1, 100.2])
+
+def test_delta_time(clock):
+    pacer = FrameScheduler(10)
+    pacer.start()
+    assert pacer.begin_frame() == pytest.approx(0.0)
+    clock.now += 0.03
+    pacer.wait()
+    assert pacer.begin_frame() == pytest.approx(0.1)
+
+def test_late_frames_catch_up(clock):
+    pacer = FrameScheduler(10)
+    pacer.start()
+    pacer.begin_frame()
+    clock.now += 0.35
+    pacer.wait()
+    # 0.25 s behind the 100.1 deadline: the frames of 100.2 and 100.3 run without sleeping
+    for _ in range(2):
+        pacer.begin_frame()
+        pacer.wait()
+    assert clock.sleeps == []
+    pacer.begin_frame()
+    pacer.wait()
+    assert clock.sleeps == pytest.approx([0.05])
+    assert pacer.skippedFrames == 0
+
+def test_late_frames_are_skipped(clock):
+    pacer = FrameScheduler(10, skipFrames=True)
+    pacer.start()
+    pacer.begin_frame()
+    clock.now += 0.35
+    pacer.wait()
+    assert pacer.skippedFrames == 2
+    pacer.begin_frame()
+    pacer.wait()
+    # back on the deadline grid at 100.4
+    assert clock.sleeps == pytest.approx([0.05])
+
+def test_long_stall_is_never_caught_up(clock):
+    pacer = FrameScheduler(10)
+    pacer.start()
+    pacer.begin_frame()
+    clock.now += 5.0
+    pacer.wait()
+    assert pacer.skippedFrames == 49
+    pacer.begin_frame()
+    pacer.wait()
+    assert clock.sleeps == pytest.approx([0.1])
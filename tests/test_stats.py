@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from termgfx.stats import FRAME_METRICS, RenderStats, RingBuffer
+
+def test_ring_keeps_the_newest_values_in_order():
+    ring = RingBuffer(4)
+    assert len(ring) == 0 and ring.values().size == 0
+    for value in range(3):
+        ring.append(value)
+    assert ring.values().tolist() == [0, 1, 2]
+    for value in range(3, 10):
+        ring.append(value)
+    assert len(ring) == 4
+    assert ring.values().tolist() == [6, 7, 8, 9]
+    ring.clear()
+    assert len(ring) == 0
+    ring.append(1)
+    assert ring.values().tolist() == [1]
+
+def test_percentiles_and_totals_over_the_window():
+    stats = RenderStats(window=100)
+    for i in range(300):
+        stats.record_frame({"encodeTime": i / 1000, "bytesWritten": 10, "cached": i % 3 == 0})
+    # only the last 100 frames (200 to 299 ms) are in the window, the totals cover all of them
+    percentiles = stats.percentiles("encodeTime")
+    assert percentiles["p50"] == pytest.approx(0.2495)
+    assert percentiles["p99"] == pytest.approx(np.percentile(np.arange(200, 300) / 1000, 99))
+    assert stats.mean("encodeTime") == pytest.approx(0.1495)
+    assert stats.totals["bytesWritten"] == 3000
+    assert stats.frames == 300 and stats.cachedFrames == 100
+    assert stats.percentiles("tickTime") == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+def test_fps_and_frame_times_from_the_frame_starts():
+    stats = RenderStats(window=10)
+    assert stats.fps == 0.0
+    stats.record_start(5.0)
+    assert stats.fps == 0.0
+    for i in range(1, 30):
+        stats.record_start(5.0 + i * 0.02)
+    assert stats.fps == pytest.approx(50.0)
+    assert stats.values("frameTime") == pytest.approx([0.02] * 9)
+
+def test_summary_and_reset():
+    stats = RenderStats(window=10)
+    stats.record_start(0.0)
+    stats.record_start(0.5)
+    stats.record_skip()
+    stats.record_frame({"writeTime": 0.004})
+    summary = stats.summary()
+    assert summary["fps"] == pytest.approx(2.0)
+    assert summary["skippedFrames"] == 1 and summary["frames"] == 1
+    assert set(FRAME_METRICS + ("frameTime",)) <= set(summary)
+    assert summary["writeTime"]["p95"] == pytest.approx(0.004)
+    stats.reset()
+    assert stats.frames == 0 and stats.skippedFrames == 0 and stats.fps == 0.0
+    assert stats.values("writeTime").size == 0
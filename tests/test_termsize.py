@@ -0,0 +1,82 @@
+import os
+import signal
+import pytest
+from termgfx import termsize
+from termgfx.termsize import TerminalSize
+
+class FakeTerminal:
+    """get_terminal_size and monotonic of the termsize module"""
+    def __init__(self):
+        self.now = 10.0
+        self.size = os.terminal_size((80, 24))
+        self.queries = 0
+
+    def get_terminal_size(self) -> os.terminal_size:
+        self.queries += 1
+        return self.size
+
+    def monotonic(self) -> float:
+        return self.now
+
+@pytest.fixture
+def terminal(monkeypatch):
+    terminal = FakeTerminal()
+    monkeypatch.setattr(termsize.shutil, "get_terminal_size", terminal.get_terminal_size)
+    monkeypatch.setattr(termsize.time, "monotonic", terminal.monotonic)
+    return terminal
+
+def resize(terminal: FakeTerminal, tracker: TerminalSize, columns: int, lines: int):
+    terminal.size = os.terminal_size((columns, lines))
+    if hasattr(signal, "SIGWINCH"):
+        signal.raise_signal(signal.SIGWINCH)
+    else:
+        terminal.now += tracker.pollInterval
+
+def test_burst_of_resizes_settles_once(terminal):
+    tracker = TerminalSize(debounce=0.15)
+    tracker.start()
+    try:
+        settled = []
+        # a drag resize: a new size every 50 ms, polled every 10 ms
+        for step in range(6):
+            resize(terminal, tracker, 80 + step, 24 + step)
+            for _ in range(5):
+                terminal.now += 0.01
+                settled.append(tracker.poll())
+        assert [size for size in settled if size is not None] == []
+        # the last size holds for the quiet period
+        for _ in range(20):
+            terminal.now += 0.01
+            settled.append(tracker.poll())
+        assert [size for size in settled if size is not None] == [os.terminal_size((85, 29))]
+    finally:
+        tracker.stop()
+
+def test_resize_back_to_the_settled_size_is_dropped(terminal):
+    tracker = TerminalSize(debounce=0.15)
+    tracker.start()
+    try:
+        resize(terminal, tracker, 100, 30)
+        assert tracker.poll() is None
+        resize(terminal, tracker, 80, 24)
+        terminal.now += 1.0
+        assert tracker.poll() is None
+    finally:
+        tracker.stop()
+
+@pytest.mark.skipif(not hasattr(signal, "SIGWINCH"), reason="needs SIGWINCH")
+def test_size_is_only_queried_after_sigwinch(terminal):
+    tracker = TerminalSize()
+    tracker.start()
+    try:
+        queries = terminal.queries
+        terminal.now += 10.0
+        for _ in range(100):
+            tracker.size
+        assert terminal.queries == queries
+        resize(terminal, tracker, 90, 30)
+        assert tracker.size == os.terminal_size((90, 30))
+        assert terminal.queries == queries + 1
+    finally:
+        tracker.stop()
+    assert signal.getsignal(signal.SIGWINCH) in (signal.SIG_DFL, None)
@@ -0,0 +1,46 @@
+import io
+import json
+import numpy as np
+from termgfx import HeadlessRenderer, Vector2
+from termgfx.trace import FrameTracer
+
+STAGES = ("tick", "sample", "acquire", "submit", "encode", "encode band", "write")
+
+def test_dump_is_chrome_trace_json():
+    tracer = FrameTracer()
+    rng = np.random.default_rng(0)
+    renderer = HeadlessRenderer(lambda size: rng.integers(0, 256, (12, 10, 3), dtype=np.uint8), Vector2(10, 12),
+                                threadCount=2, tracer=tracer)
+    renderer.run(5)
+    stream = io.StringIO()
+    tracer.dump(stream)
+    trace = json.loads(stream.getvalue())
+    events = trace["traceEvents"]
+    threads = {event["tid"]: event["args"]["name"] for event in events if event["ph"] == "M"}
+    spans = [event for event in events if event["ph"] == "X"]
+    for event in spans:
+        assert {"name", "pid", "tid", "ts", "dur"} <= set(event)
+        assert event["dur"] >= 0 and event["tid"] in threads
+    byStage = {stage: [event for event in spans if event["name"] == stage] for stage in STAGES}
+    assert all(len(byStage[stage]) == 5 for stage in ("tick", "sample", "encode", "write"))
+    assert len(byStage["encode band"]) == 10
+    # every stage runs on its own thread
+    assert {threads[event["tid"]] for event in byStage["encode"]} == {"encode"}
+    assert {threads[event["tid"]] for event in byStage["write"]} == {"write"}
+    assert {threads[event["tid"]] for event in byStage["encode band"]} == {"band-0", "band-1"}
+
+def test_skipped_frames_are_instants():
+    tracer = FrameTracer()
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    HeadlessRenderer(lambda size: frame, Vector2(4, 4), threadCount=1, tracer=tracer).run(3)
+    instants = [event for event in tracer.trace_events() if event["ph"] == "i"]
+    assert [event["name"] for event in instants] == ["skip", "skip"]
+    assert all("dur" not in event for event in instants)
+
+def test_ring_drops_the_oldest_events():
+    tracer = FrameTracer(capacity=3)
+    for i in range(5):
+        tracer.span(f"stage {i}", i, i + 0.5)
+    assert len(tracer) == 3
+    names = [event["name"] for event in tracer.trace_events() if event["ph"] == "X"]
+    assert names == ["stage 2", "stage 3", "stage 4"]